@@ -6,11 +6,20 @@
 #   (safe defaults if missing)
 
 import configparser
+import functools
 import os
 
 BITS_FILE = os.environ.get("BITS_INI", "bits.ini")
 SETTINGS_FILE = os.environ.get("JOB_SETTINGS_INI", "job_settings.ini")
 
+# bits.ini parsers keyed by absolute path -> ((mtime_ns, size), parser)
+_BITS_CACHE = {}
+# id(parser) -> (parser, {bit name: bit_dict}) for parsers served by load_bits(). The
+# parser is held too, so its id cannot be reused while the entry exists.
+_BIT_DICTS = {}
+# Same for job_settings.ini
+_SETTINGS_CACHE = {}
+
 
 def _read_cfg(path: str) -> configparser.ConfigParser:
     cfg = configparser.ConfigParser()
@@ -27,12 +36,99 @@ def _read_cfg(path: str) -> configparser.ConfigParser:
     return cfg
 
 
+def _file_stamp(path: str):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _ini_path(name: str) -> str:
+    # The file _read_cfg(name) ends up reading: as given, else next to this module.
+    if os.path.exists(name):
+        return os.path.abspath(name)
+    here = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(here, os.path.basename(name))
+
+
+def _bits_path() -> str:
+    return _ini_path(BITS_FILE)
+
+
 def load_bits() -> configparser.ConfigParser:
-    return _read_cfg(BITS_FILE)
+    """
+    bits.ini is re-parsed only when its mtime/size changes.
+    Editors that mutate the returned parser must write it back to disk.
+    """
+    path = _bits_path()
+    stamp = _file_stamp(path)
+    if stamp is None:
+        return _read_cfg(BITS_FILE)
+
+    hit = _BITS_CACHE.get(path)
+    if hit is not None and hit[0] == stamp:
+        return hit[1]
+
+    cfg = _read_cfg(BITS_FILE)
+    if cfg.sections():
+        forget_cached_bits(path)
+        _BITS_CACHE[path] = (stamp, cfg)
+        _BIT_DICTS[id(cfg)] = (cfg, {})
+    return cfg
+
+
+def forget_cached_bits(path: str) -> None:
+    """Drop the cached parser for `path`, e.g. when it no longer matches the file."""
+    hit = _BITS_CACHE.pop(path, None)
+    if hit is not None:
+        _BIT_DICTS.pop(id(hit[1]), None)
+
+
+def invalidate_bit_dicts(bits_cfg: configparser.ConfigParser) -> None:
+    """Drop the converted bit dicts of a load_bits() parser after editing it in memory."""
+    entry = _BIT_DICTS.get(id(bits_cfg))
+    if entry is not None and entry[0] is bits_cfg:
+        entry[1].clear()
+
+
+def _copy_cfg(cfg: configparser.ConfigParser):
+    # Same raw defaults and sections in a new parser, without re-reading the file.
+    # None if a value would not pass set()'s interpolation check (e.g. a lone "%").
+    defaults = cfg.defaults()
+    data = {cfg.default_section: defaults}
+    for name in cfg.sections():
+        # items() merges in DEFAULT; keep only what the section itself sets (or overrides).
+        data[name] = {
+            k: v for k, v in cfg.items(name, raw=True) if k not in defaults or v != defaults[k]
+        }
+    out = configparser.ConfigParser()
+    try:
+        out.read_dict(data)
+    except ValueError:
+        return None
+    return out
 
 
 def load_settings() -> configparser.ConfigParser:
-    return _read_cfg(SETTINGS_FILE)
+    """
+    job_settings.ini is parsed only when its mtime/size changes. Each caller gets its
+    own copy of the parsed file, so in-memory edits never leak into later loads.
+    """
+    path = _ini_path(SETTINGS_FILE)
+    stamp = _file_stamp(path)
+    if stamp is None:
+        return _read_cfg(SETTINGS_FILE)
+
+    hit = _SETTINGS_CACHE.get(path)
+    if hit is None or hit[0] != stamp:
+        cfg = _read_cfg(SETTINGS_FILE)
+        if not cfg.sections():
+            return cfg
+        hit = _SETTINGS_CACHE[path] = (stamp, cfg)
+
+    copy = _copy_cfg(hit[1])
+    return copy if copy is not None else _read_cfg(SETTINGS_FILE)
 
 
 def save_settings(cfg: configparser.ConfigParser) -> None:
@@ -63,6 +159,19 @@ def bit_dict(bits_cfg: configparser.ConfigParser, name: str) -> dict:
     if not bits_cfg.has_section(name):
         raise KeyError(f"Bit '{name}' not found")
 
+    # Parsers served by load_bits() memoize their converted dicts; editors that change
+    # such a parser in memory call invalidate_bit_dicts().
+    entry = _BIT_DICTS.get(id(bits_cfg))
+    if entry is None or entry[0] is not bits_cfg:
+        return _bit_dict(bits_cfg, name)
+    memo = entry[1]
+    d = memo.get(name)
+    if d is None:
+        d = memo[name] = _bit_dict(bits_cfg, name)
+    return dict(d)
+
+
+def _bit_dict(bits_cfg: configparser.ConfigParser, name: str) -> dict:
     b = bits_cfg[name]
 
     return {
@@ -80,6 +189,33 @@ def bit_dict(bits_cfg: configparser.ConfigParser, name: str) -> dict:
     }
 
 
+# Bit types repeat across every bits x ops scan; both helpers are pure string functions.
+@functools.lru_cache(maxsize=256)
+def type_tag(bit_type: str) -> str:
+    """Classify a bit's free-text type as "drill", "vbit", "mill" or "unknown"."""
+    t = (bit_type or "").strip().lower()
+    if "drill" in t:
+        return "drill"
+    if "v" in t or "engrave" in t or "conic" in t:
+        return "vbit"
+    if "flat" in t or "end" in t or "mill" in t or "router" in t:
+        return "mill"
+    return "unknown"
+
+
+@functools.lru_cache(maxsize=256)
+def is_reasonable_for_op(op: str, btype: str) -> bool:
+    """Whether a bit of type `btype` is a sensible choice for operation `op`."""
+    tag = type_tag(btype)
+    if op == "drilling":
+        return tag == "drill"
+    if op in ("board_outline", "soldermask_clear"):
+        return tag == "mill"
+    if op in ("copper_isolation", "silkscreen"):
+        return tag in ("vbit", "mill")  # allow small endmills for silk if user wants
+    return True
+
+
 def choose_bit_filtered(bits: configparser.ConfigParser, current: str, op_key: str) -> str:
     """CLI helper (kept for compatibility)."""
     names = bits.sections()
@@ -1,23 +1,23 @@
 # board_outline.py
 
 import os
-import configparser
 import math
-from shapely.geometry import LineString
-from shapely.ops import substring
+from bisect import bisect_left
+
+import numpy as np
 
 from common_gerber import (
-    load_tracks,
-    load_copper,
-    normalize_to_ref,
+    JobContext,
     ensure_header,
     toolchange_sequence,
     end_sequence,
     out_nc,
+    GCODE_WRITE_BUFFER,
+    order_points_nearest_indices,
+    order_segments_nearest_indices,
+    read_cfg_values,
 )
 
-from excellon_parser import load_drills_and_slots
-
 DEFAULT_PCB_THICKNESS = 1.6
 SAFE_Z = 5.0
 DEFAULT_MILL_HOLES_OVER = 1.2
@@ -27,27 +27,32 @@ CIRCLE_SEGMENTS = 72
 DEFAULT_HOLE_MATCH_TOL = 0.05
 DEFAULT_SINGLE_DRILL_DIAM = 0.8
 
+# %-templates for the hot G-code lines (cheaper than f-strings per call).
+_G0Z = "G0 Z%.3f\n"
+_G0XY = "G0 X%.4f Y%.4f\n"
+_G1Z = "G1 Z%.4f F%s\n"
+_G1XY = "G1 X%.4f Y%.4f F%s\n"
+_G1XYZ = "G1 X%.4f Y%.4f Z%.4f F%s\n"
 
-def _read_job_cfg():
-    cfg = configparser.ConfigParser()
 
+def _job_ini_path():
     try:
         import common_gerber as cg
         root_ini = os.path.join(os.path.dirname(os.path.abspath(cg.__file__)), "job_settings.ini")
         if os.path.exists(root_ini):
-            cfg.read(root_ini)
-            return cfg
+            return root_ini
     except Exception:
         pass
 
-    cfg.read("job_settings.ini")
-    return cfg
+    return "job_settings.ini"
 
 
 def _job_getfloat(section: str, key: str, default: float) -> float:
+    v = read_cfg_values(_job_ini_path()).get((section, key))
+    if v is None:
+        return float(default)
     try:
-        cfg = _read_job_cfg()
-        return float(cfg.getfloat(section, key, fallback=default))
+        return float(v)
     except Exception:
         return float(default)
 
@@ -61,11 +66,7 @@ def load_mill_holes_over():
 
 
 def load_drill_mode():
-    cfg = _read_job_cfg()
-    try:
-        m = (cfg.get("job", "drill_mode", fallback="multi") or "").strip().lower()
-    except Exception:
-        m = "multi"
+    m = (read_cfg_values(_job_ini_path()).get(("job", "drill_mode"), "multi") or "").strip().lower()
     if m in ("single_plus_mill", "single+mill", "single_mill"):
         return "single_plus_mill"
     if m in ("single", "single_drill"):
@@ -84,100 +85,25 @@ def load_hole_match_tol():
 def _stepdown_list(full_depth, stepdown):
     stepdown = float(stepdown) if stepdown and float(stepdown) > 0 else DEFAULT_STEPDOWN
     full_depth = float(full_depth)
-    d = 0.0
-    out = []
-    while d < full_depth - 1e-9:
-        d2 = min(d + stepdown, full_depth)
-        out.append(d2)
-        d = d2
-    return out
-
-
-def _order_segments_nearest(segments, start_xy=(0.0, 0.0)):
-    """
-    Order line segments with optional reversal.
-    segments: [ [(x,y), (x,y), ...], ... ]  (each must have len>=2)
-    """
-    if not segments:
+    if full_depth <= 1e-9:
         return []
+    # k * stepdown rather than repeated adds: no drift over many passes.
+    n = max(1, math.ceil((full_depth - 1e-9) / stepdown))
+    return [min(k * stepdown, full_depth) for k in range(1, n + 1)]
 
-    rem = [list(s) for s in segments if s and len(s) >= 2]
-    out = []
-    cur = (float(start_xy[0]), float(start_xy[1]))
-
-    def d2(a, b):
-        dx = a[0] - b[0]
-        dy = a[1] - b[1]
-        return dx * dx + dy * dy
-
-    while rem:
-        best_i = 0
-        best_flip = False
-        best_d = float("inf")
-        for i, pts in enumerate(rem):
-            s = (float(pts[0][0]), float(pts[0][1]))
-            e = (float(pts[-1][0]), float(pts[-1][1]))
-            ds = d2(cur, s)
-            if ds < best_d:
-                best_d = ds
-                best_i = i
-                best_flip = False
-            de = d2(cur, e)
-            if de < best_d:
-                best_d = de
-                best_i = i
-                best_flip = True
-
-        pts = rem.pop(best_i)
-        if best_flip:
-            pts = pts[::-1]
-        out.append(pts)
-        cur = (float(pts[-1][0]), float(pts[-1][1]))
 
-    return out
-
-
-def _order_points_nearest(points, start_xy=(0.0, 0.0)):
-    """
-    FIX: previously we (incorrectly) tried to order points using _order_segments_nearest()
-    with 1-point "segments", which gets filtered out and returns nothing.
-    """
-    if not points:
-        return []
-    rem = [(float(x), float(y)) for (x, y) in points]
-    out = []
-    curx, cury = float(start_xy[0]), float(start_xy[1])
-
-    while rem:
-        best_i = 0
-        best_d2 = float("inf")
-        for i, (x, y) in enumerate(rem):
-            dx = x - curx
-            dy = y - cury
-            d2 = dx * dx + dy * dy
-            if d2 < best_d2:
-                best_d2 = d2
-                best_i = i
-        x, y = rem.pop(best_i)
-        out.append((x, y))
-        curx, cury = x, y
-
-    return out
-
-
-def _write_polyline(g, pts, z, bit, ramp_len=0.0):
+def _write_polyline(buf, pts, z, feed_xy, feed_z, ramp_len=0.0):
     """
+    Appends the G-code lines for one polyline to buf (a list of str).
     Ramp-in along first part of path if ramp_len>0.
     """
     if not pts or len(pts) < 2:
         return
 
     ramp_len = float(ramp_len or 0.0)
-    feed_xy = bit["feed_xy"]
-    feed_z = bit["feed_z"]
 
-    g.write(f"G0 Z{SAFE_Z:.3f}\n")
-    g.write(f"G0 X{pts[0][0]:.4f} Y{pts[0][1]:.4f}\n")
+    buf.append(_G0Z % SAFE_Z)
+    buf.append(_G0XY % (pts[0][0], pts[0][1]))
 
     if ramp_len > 0:
         remaining = ramp_len
@@ -203,22 +129,19 @@ def _write_polyline(g, pts, z, bit, ramp_len=0.0):
             ramp_pt = pts[1]
             ramp_index = 1
 
-        g.write(f"G1 X{ramp_pt[0]:.4f} Y{ramp_pt[1]:.4f} Z{-z:.4f} F{feed_xy}\n")
+        buf.append(_G1XYZ % (ramp_pt[0], ramp_pt[1], -z, feed_xy))
 
         # Finish that segment (if ramp_pt is mid-segment)
         end_seg = pts[ramp_index]
         if abs(end_seg[0] - ramp_pt[0]) > 1e-9 or abs(end_seg[1] - ramp_pt[1]) > 1e-9:
-            g.write(f"G1 X{end_seg[0]:.4f} Y{end_seg[1]:.4f} F{feed_xy}\n")
+            buf.append(_G1XY % (end_seg[0], end_seg[1], feed_xy))
 
-        for i in range(ramp_index + 1, len(pts)):
-            x, y = pts[i]
-            g.write(f"G1 X{x:.4f} Y{y:.4f} F{feed_xy}\n")
+        buf.extend([_G1XY % (x, y, feed_xy) for x, y in pts[ramp_index + 1 :]])
     else:
-        g.write(f"G1 Z{-z:.4f} F{feed_z}\n")
-        for x, y in pts[1:]:
-            g.write(f"G1 X{x:.4f} Y{y:.4f} F{feed_xy}\n")
+        buf.append(_G1Z % (-z, feed_z))
+        buf.extend([_G1XY % (x, y, feed_xy) for x, y in pts[1:]])
 
-    g.write(f"G0 Z{SAFE_Z:.3f}\n")
+    buf.append(_G0Z % SAFE_Z)
 
 
 def _slot_offsets(slot_w, tool_d):
@@ -230,19 +153,17 @@ def _slot_offsets(slot_w, tool_d):
     step = tool_d * 0.60
     if step <= 0:
         return [0.0]
-    offsets = []
-    r = 0.0
-    while r < off - 1e-9:
-        r = min(r + step, off)
-        offsets.append(r)
+    # Closed form of r = min(r + step, off) repeated while r < off - 1e-9.
+    n = max(0, math.ceil((off - 1e-9) / step))
     out = [0.0]
-    for r in offsets:
+    for k in range(1, n + 1):
+        r = min(k * step, off)
         out.append(+r)
         out.append(-r)
     return out
 
 
-def _mill_slot(g, p1, p2, slot_w, full_depth, bit, ramp_len=0.0):
+def _mill_slot(g, p1, p2, slot_w, depths, tool_d, feed_xy, feed_z, ramp_len=0.0):
     x1, y1 = p1
     x2, y2 = p2
     dx = x2 - x1
@@ -254,29 +175,36 @@ def _mill_slot(g, p1, p2, slot_w, full_depth, bit, ramp_len=0.0):
     nx = -dy / L
     ny = dx / L
 
-    tool_d = float(bit["diameter"])
     offsets = _slot_offsets(slot_w, tool_d)
-    depths = _stepdown_list(full_depth, bit.get("stepdown", DEFAULT_STEPDOWN))
 
+    # Offset passes are the same at every depth: build them once, all offsets at a time.
+    offs = np.asarray(offsets, dtype=float)
+    sx1 = (x1 + nx * offs).tolist()
+    sy1 = (y1 + ny * offs).tolist()
+    sx2 = (x2 + nx * offs).tolist()
+    sy2 = (y2 + ny * offs).tolist()
+    passes = [[(a, b), (c, d)] for a, b, c, d in zip(sx1, sy1, sx2, sy2)]
+
+    buf = []
     for z in depths:
-        for o in offsets:
-            sx1 = x1 + nx * o
-            sy1 = y1 + ny * o
-            sx2 = x2 + nx * o
-            sy2 = y2 + ny * o
-            _write_polyline(g, [(sx1, sy1), (sx2, sy2)], z, bit, ramp_len=ramp_len)
+        for pts in passes:
+            _write_polyline(buf, pts, z, feed_xy, feed_z, ramp_len=ramp_len)
+    g.write("".join(buf))
+
+
+# Unit-circle table shared by every ring/depth pass of _mill_hole.
+_CIRCLE_ANG = [(2.0 * math.pi) * (i / CIRCLE_SEGMENTS) for i in range(CIRCLE_SEGMENTS + 1)]
+_CIRCLE_COS = np.array([math.cos(a) for a in _CIRCLE_ANG])
+_CIRCLE_SIN = np.array([math.sin(a) for a in _CIRCLE_ANG])
 
 
 def _circle_points(cx, cy, r):
-    pts = []
-    for i in range(CIRCLE_SEGMENTS + 1):
-        a = (2.0 * math.pi) * (i / CIRCLE_SEGMENTS)
-        pts.append((cx + r * math.cos(a), cy + r * math.sin(a)))
-    return pts
+    xs = (cx + r * _CIRCLE_COS).tolist()
+    ys = (cy + r * _CIRCLE_SIN).tolist()
+    return list(zip(xs, ys))
 
 
-def _mill_hole(g, cx, cy, hole_d, full_depth, bit, ramp_len=0.0):
-    tool_d = float(bit["diameter"])
+def _mill_hole(g, cx, cy, hole_d, depths, tool_d, feed_xy, feed_z, ramp_len=0.0):
     hole_d = float(hole_d)
 
     # If hole is basically drill-size, don't try to pocket it here.
@@ -296,17 +224,69 @@ def _mill_hole(g, cx, cy, hole_d, full_depth, bit, ramp_len=0.0):
         if rr <= 0:
             break
 
-    depths = _stepdown_list(full_depth, bit.get("stepdown", DEFAULT_STEPDOWN))
+    buf = []
     for z in depths:
         for rr in rings:
             pts = _circle_points(cx, cy, rr)
-            _write_polyline(g, pts, z, bit, ramp_len=ramp_len)
+            _write_polyline(buf, pts, z, feed_xy, feed_z, ramp_len=ramp_len)
+    g.write("".join(buf))
 
 
-def run_outline(bit, combined, prefix, tabs_enabled=False):
-    copper = load_copper(prefix + "-TopLayer.gbr")
-    outline = load_tracks(prefix + "-BoardOutLine.gbr")
-    outline = normalize_to_ref(outline, copper)
+def _walk_steps(coords, dist, length, step):
+    """
+    Yields (dist, pts) for each step of the outline from dist to length, where pts
+    are the points substring(ring, dist, next_dist).coords[1:] would give: the ring
+    vertices strictly inside the step, then the interpolated step end.
+
+    One forward sweep over coords instead of a substring() call per step (each of
+    which re-walks the ring from its first vertex).
+    """
+    n = len(coords)
+    seg_len = []
+    vert_d = [0.0]
+    for (x0, y0), (x1, y1) in zip(coords, coords[1:]):
+        dx = x1 - x0
+        dy = y1 - y0
+        seg_len.append(math.sqrt(dx * dx + dy * dy))
+        vert_d.append(vert_d[-1] + seg_len[-1])
+
+    vi = 0  # next vertex candidate
+    k = 0  # segment holding the current step end
+    tot = 0.0  # ring distance at the start of segment k
+
+    while dist < length:
+        next_dist = min(dist + step, length)
+
+        pts = []
+        while vi < n - 1 and vert_d[vi] <= dist:
+            vi += 1
+        while vi < n - 1 and vert_d[vi] < next_dist:
+            pts.append(coords[vi])
+            vi += 1
+
+        while k < n - 1 and tot + seg_len[k] <= next_dist:
+            tot += seg_len[k]
+            k += 1
+        if k >= n - 1:
+            pts.append(coords[-1])
+        else:
+            (x0, y0), (x1, y1) = coords[k], coords[k + 1]
+            f = (next_dist - tot) / seg_len[k]
+            if f <= 0.0:
+                pts.append((x0, y0))
+            elif f >= 1.0:
+                pts.append((x1, y1))
+            else:
+                pts.append((x0 + f * (x1 - x0), y0 + f * (y1 - y0)))
+
+        yield dist, pts
+        dist = next_dist
+
+
+def run_outline(bit, combined, prefix, tabs_enabled=False, ctx=None):
+    if ctx is None:
+        ctx = JobContext(prefix)
+    outline = ctx.normalize(ctx.outline_raw)
 
     outline = outline.buffer(bit["diameter"] / 2.0).exterior
 
@@ -317,7 +297,15 @@ def run_outline(bit, combined, prefix, tabs_enabled=False):
     out = out_nc("all.nc") if combined else out_nc("board_outline.nc")
     ensure_header(out)
 
-    ramp_len = float(bit.get("ramp_len", _job_getfloat("job", "ramp_len", 0.0)) or 0.0)
+    # Only consult job_settings when the bit has no ramp_len of its own.
+    ramp_len = bit["ramp_len"] if "ramp_len" in bit else _job_getfloat("job", "ramp_len", 0.0)
+    ramp_len = float(ramp_len or 0.0)
+
+    # Loop-invariant tool parameters for the slot/hole/outline passes.
+    tool_d = float(bit["diameter"])
+    feed_xy = bit["feed_xy"]
+    feed_z = bit["feed_z"]
+    depths = _stepdown_list(full_depth, bit.get("stepdown", DEFAULT_STEPDOWN))
 
     length = outline.length
     tab_spacing = length * 0.20
@@ -331,86 +319,60 @@ def run_outline(bit, combined, prefix, tabs_enabled=False):
             tab_positions.append(d)
             d += tab_spacing
 
+    # tab_positions is ascending, so only the tabs either side of dist can be within reach.
     def is_in_tab(dist):
-        for t in tab_positions:
-            if abs(dist - t) <= tab_half:
+        i = bisect_left(tab_positions, dist)
+        for j in (i - 1, i):
+            if 0 <= j < len(tab_positions) and abs(dist - tab_positions[j]) <= tab_half:
                 return True
         return False
 
-    minx, miny, _, _ = copper.bounds
-    holes_raw, slots_raw = load_drills_and_slots(prefix)
+    minx, miny = ctx.origin
+    slots_raw = ctx.drills_and_slots()[1]
+    holes = ctx.holes_array()
+    diams = holes[:, 2]
 
-    slots = [((x1 - minx, y1 - miny), (x2 - minx, y2 - miny), float(w)) for ((x1, y1), (x2, y2), w) in slots_raw]
+    # Excellon hits are already floats (parser + dedupe guarantee it): no per-element casts.
+    slots = [((x1 - minx, y1 - miny), (x2 - minx, y2 - miny), w) for ((x1, y1), (x2, y2), w) in slots_raw]
 
-    mill_over = load_mill_holes_over()
-    big_holes = [(x - minx, y - miny, float(d)) for (x, y, d) in holes_raw if float(d) >= float(mill_over)]
+    mill_over = float(load_mill_holes_over())
+    big_mask = diams >= mill_over
+    big_holes = [tuple(h) for h in holes[big_mask].tolist()]
 
     extra_mill_holes = []
     drill_mode = load_drill_mode()
     if drill_mode == "single_plus_mill":
         target = float(load_single_drill_diam())
         tol = float(load_hole_match_tol())
-        for x, y, d in holes_raw:
-            d = float(d)
-            if d >= float(mill_over):
-                continue
-            if abs(d - target) <= tol:
-                continue
-            extra_mill_holes.append((x - minx, y - miny, d))
+        extra_mask = ~big_mask & (np.abs(diams - target) > tol)
+        extra_mill_holes = [tuple(h) for h in holes[extra_mask].tolist()]
 
     # ----- Step 5 ordering for slots and holes -----
 
-    # Slots: order by nearest with reversal
+    # Slots: order by nearest with reversal (indices carry the width through)
     slot_segments = [[p1, p2] for (p1, p2, _w) in slots]
-    slot_segments_ord = _order_segments_nearest(slot_segments, start_xy=(0.0, 0.0))
-
-    # Rebuild ordered slots robustly via rounded key
-    def _seg_key(a, b, nd=6):
-        return (round(a[0], nd), round(a[1], nd), round(b[0], nd), round(b[1], nd))
-
-    slot_map = {}
-    for (p1, p2, w) in slots:
-        slot_map[_seg_key(p1, p2)] = (p1, p2, w)
-        slot_map[_seg_key(p2, p1)] = (p1, p2, w)
-
     slots_ord = []
-    for pts in slot_segments_ord:
-        k = _seg_key(tuple(pts[0]), tuple(pts[1]))
-        if k in slot_map:
-            p1, p2, w = slot_map[k]
-            # Keep direction as ordered
-            if abs(p1[0] - pts[0][0]) < 1e-9 and abs(p1[1] - pts[0][1]) < 1e-9:
-                slots_ord.append((p1, p2, w))
-            else:
-                slots_ord.append((p2, p1, w))
+    for i, flipped in order_segments_nearest_indices(slot_segments, start_xy=(0.0, 0.0)):
+        p1, p2, w = slots[i]
+        slots_ord.append((p2, p1, w) if flipped else (p1, p2, w))
 
     # Holes: FIXED ordering (points, not 1-point "segments")
     hole_items = big_holes + extra_mill_holes
     hole_pts = [(x, y) for (x, y, _d) in hole_items]
 
-    hole_order = _order_points_nearest(hole_pts, start_xy=(0.0, 0.0))
-
-    # Map (x,y) -> diameter (rounded key to avoid float mismatch)
-    hole_d_map = {}
-    for x, y, d in hole_items:
-        hole_d_map[(round(float(x), 6), round(float(y), 6))] = float(d)
-
-    def _hole_d(x, y):
-        return hole_d_map.get((round(float(x), 6), round(float(y), 6)))
+    holes_ord = [hole_items[i] for i in order_points_nearest_indices(hole_pts, start_xy=(0.0, 0.0))]
 
     # ----- Write G-code -----
-    with open(out, "a") as g:
+    with open(out, "a", buffering=GCODE_WRITE_BUFFER) as g:
         toolchange_sequence(g, bit, "Through cuts: slots/holes/outline")
 
         # Mill slots
         for (p1, p2, w) in slots_ord:
-            _mill_slot(g, p1, p2, w, full_depth, bit, ramp_len=ramp_len)
+            _mill_slot(g, p1, p2, w, depths, tool_d, feed_xy, feed_z, ramp_len=ramp_len)
 
         # Mill big + extra holes
-        for (x, y) in hole_order:
-            d = _hole_d(x, y)
-            if d is not None:
-                _mill_hole(g, x, y, d, full_depth, bit, ramp_len=ramp_len)
+        for (x, y, d) in holes_ord:
+            _mill_hole(g, x, y, d, depths, tool_d, feed_xy, feed_z, ramp_len=ramp_len)
 
         # Outline with optional tabs
         step = 0.5
@@ -420,8 +382,9 @@ def run_outline(bit, combined, prefix, tabs_enabled=False):
             end_sequence(g, end_program=not combined)
             return
 
-        g.write(f"G0 Z{SAFE_Z:.3f}\n")
-        g.write(f"G0 X{coords[0][0]:.4f} Y{coords[0][1]:.4f}\n")
+        buf = []
+        buf.append(_G0Z % SAFE_Z)
+        buf.append(_G0XY % (coords[0][0], coords[0][1]))
 
         # Initial ramp along first segment if enabled
         if ramp_len > 0 and len(coords) >= 2:
@@ -453,31 +416,25 @@ def run_outline(bit, combined, prefix, tabs_enabled=False):
                 ramp_dist = math.hypot(coords[1][0] - coords[0][0], coords[1][1] - coords[0][1])
                 ramp_seg_i = 1
 
-            g.write(f"G1 X{ramp_pt[0]:.4f} Y{ramp_pt[1]:.4f} Z{-first_depth:.4f} F{bit['feed_xy']}\n")
+            buf.append(_G1XYZ % (ramp_pt[0], ramp_pt[1], -first_depth, feed_xy))
 
             # Finish the segment to its endpoint (if ramp was mid-segment)
             end_seg = coords[ramp_seg_i]
             if abs(end_seg[0] - ramp_pt[0]) > 1e-9 or abs(end_seg[1] - ramp_pt[1]) > 1e-9:
-                g.write(f"G1 X{end_seg[0]:.4f} Y{end_seg[1]:.4f} F{bit['feed_xy']}\n")
+                buf.append(_G1XY % (end_seg[0], end_seg[1], feed_xy))
 
             dist = ramp_dist
         else:
             dist = 0.0
 
-        while dist < length:
+        for dist, pts in _walk_steps(coords, dist, length, step):
             depth = tab_depth if is_in_tab(dist) else full_depth
-            g.write(f"G1 Z{-depth:.4f} F{bit['feed_z']}\n")
-
-            next_dist = min(dist + step, length)
-            seg = substring(outline, dist, next_dist)
-
-            if isinstance(seg, LineString):
-                for x, y in list(seg.coords)[1:]:
-                    g.write(f"G1 X{x:.4f} Y{y:.4f} F{bit['feed_xy']}\n")
+            buf.append(_G1Z % (-depth, feed_z))
 
-            dist = next_dist
+            buf.extend([_G1XY % (x, y, feed_xy) for x, y in pts])
 
-        g.write(f"G0 Z{SAFE_Z:.3f}\n")
+        buf.append(_G0Z % SAFE_Z)
+        g.write("".join(buf))
         end_sequence(g, end_program=not combined)
 
     if tabs_enabled:
@@ -6,6 +6,12 @@
 # - geom_utils.py
 # - gerber_parser.py
 # - gcode_writer.py
+#
+# Also home of JobContext (per-job memo of the shared input layers).
+
+from functools import cached_property
+
+import numpy as np
 
 from job_config import (
     SAFE_Z,
@@ -25,11 +31,18 @@ from job_config import (
     job_getfloat,
     job_getbool,
     job_getstr,
+    read_cfg_cached,
+    read_cfg_values,
+    clear_job_cache,
 )
 
 from geom_utils import (
     cleanup_geometry,
     order_lines_nearest,
+    order_points_nearest,
+    order_points_nearest_indices,
+    order_segments_nearest,
+    order_segments_nearest_indices,
     geom_to_ordered_lines,
     write_geom_paths,
 )
@@ -38,23 +51,97 @@ from gerber_parser import (
     GerberParseError,
     GerberFull,
     parse_gerber_full,
+    load_gerber_full,
     parse_gerber,
     pad_from_ap,
     load_copper,
     load_pads,
     load_tracks,
+    clear_gerber_cache,
 )
 
 from gcode_writer import (
+    GCODE_WRITE_BUFFER,
     write_header,
     ensure_header,
     toolchange_sequence,
     end_sequence,
 )
 
+from excellon_parser import load_drills_and_slots, load_hole_dedupe_tol
+
 from shapely.affinity import translate
 
 
 def normalize_to_ref(g, ref):
     minx, miny, _, _ = ref.bounds
     return translate(g, -minx, -miny)
+
+
+class JobContext:
+    """
+    Per-job memo of the inputs every op needs (copper, its origin, outline, pads, drills).
+    Each artifact is loaded on first use and shared by the run_* functions it is passed to.
+    Paths are relative to prefix, like the ops themselves (cwd = Gerber folder).
+    """
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        self._drills = {}
+        self._holes = {}
+
+    @cached_property
+    def copper_raw(self):
+        return load_copper(self.prefix + "-TopLayer.gbr")
+
+    @cached_property
+    def origin(self):
+        minx, miny, _, _ = self.copper_raw.bounds
+        return minx, miny
+
+    @cached_property
+    def copper_ref(self):
+        return self.normalize(self.copper_raw)
+
+    @cached_property
+    def pads_raw(self):
+        return load_pads(self.prefix + "-TopLayer.gbr")
+
+    @cached_property
+    def outline_raw(self):
+        return load_tracks(self.prefix + "-BoardOutLine.gbr")
+
+    def normalize(self, g):
+        """Same as normalize_to_ref(g, self.copper_raw), reusing the cached bounds."""
+        minx, miny = self.origin
+        return translate(g, -minx, -miny)
+
+    def drills_and_slots(self, tol_xy=None):
+        """load_drills_and_slots(prefix, tol_xy), memoized per tolerance. Returns fresh lists."""
+        if tol_xy is None:
+            tol_xy = load_hole_dedupe_tol()
+        key = float(tol_xy)
+        hit = self._drills.get(key)
+        if hit is None:
+            hit = load_drills_and_slots(self.prefix, tol_xy=key)
+            self._drills[key] = hit
+        return list(hit[0]), list(hit[1])
+
+    def holes_array(self, tol_xy=None):
+        """
+        Deduped holes as a read-only (N, 3) float array [x, y, d], translated to the copper origin.
+        Outline and drill select their subsets from it with diameter masks.
+        """
+        if tol_xy is None:
+            tol_xy = load_hole_dedupe_tol()
+        key = float(tol_xy)
+        arr = self._holes.get(key)
+        if arr is None:
+            holes, _slots = self.drills_and_slots(key)
+            arr = np.array(holes, dtype=np.float64).reshape(-1, 3)
+            minx, miny = self.origin
+            arr[:, 0] -= minx
+            arr[:, 1] -= miny
+            arr.flags.writeable = False
+            self._holes[key] = arr
+        return arr
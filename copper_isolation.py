@@ -1,18 +1,17 @@
 # copper_isolation.py
 
 import math
-import configparser
 
 from shapely.ops import unary_union
 
 from common_gerber import (
-    load_copper,
-    normalize_to_ref,
+    JobContext,
     ensure_header,
     toolchange_sequence,
     write_geom_paths,
     end_sequence,
     out_nc,
+    read_cfg_values,
     cleanup_geometry,
 )
 
@@ -21,10 +20,9 @@ EXTRA_CLEARANCE = 0.01            # mm
 
 
 def load_copper_thickness():
-    cfg = configparser.ConfigParser()
-    cfg.read("job_settings.ini")
+    v = read_cfg_values("job_settings.ini").get(("job", "copper_thickness"))
     try:
-        return cfg.getfloat("job", "copper_thickness")
+        return float(v)
     except Exception:
         return DEFAULT_COPPER_THICKNESS
 
@@ -38,9 +36,10 @@ def compute_isolation_depth(bit, copper_thickness):
     return copper_thickness + EXTRA_CLEARANCE
 
 
-def run_copper(bit, combined, prefix, passes=1):
-    copper_raw = load_copper(prefix + "-TopLayer.gbr")
-    copper_ref = normalize_to_ref(copper_raw, copper_raw)
+def run_copper(bit, combined, prefix, passes=1, ctx=None):
+    if ctx is None:
+        ctx = JobContext(prefix)
+    copper_ref = ctx.copper_ref
 
     tool_r = bit["diameter"] / 2.0
     copper_thickness = load_copper_thickness()
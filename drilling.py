@@ -1,20 +1,22 @@
 # drilling.py
 
 import os
-import configparser
 import math
+from bisect import bisect_right
 
 from common_gerber import (
-    load_copper,
+    JobContext,
     ensure_header,
     toolchange_sequence,
     end_sequence,
     out_nc,
+    GCODE_WRITE_BUFFER,
+    order_points_nearest,
+    read_cfg_values,
 )
 
 from excellon_parser import (
-    load_drills_and_slots,
-    parse_excellon_file,
+    load_excellon_hits,
     dedupe_holes_by_xy,
     load_hole_dedupe_tol,
 )
@@ -24,63 +26,57 @@ SAFE_Z = 5.0
 DEFAULT_MILL_HOLES_OVER = 1.2  # mm
 DEFAULT_HOLE_MATCH_TOL = 0.05  # mm
 
+# %-templates for the hot G-code lines (cheaper than f-strings per call).
+_G0Z = "G0 Z%.3f\n"
+_G1Z = "G1 Z%.4f F%s\n"
 
-def _read_job_cfg():
-    cfg = configparser.ConfigParser()
 
+def _job_ini_path():
     try:
         import common_gerber as cg
         root_ini = os.path.join(os.path.dirname(os.path.abspath(cg.__file__)), "job_settings.ini")
         if os.path.exists(root_ini):
-            cfg.read(root_ini)
-            return cfg
+            return root_ini
     except Exception:
         pass
 
-    cfg.read("job_settings.ini")
-    return cfg
+    return "job_settings.ini"
 
 
-def load_pcb_thickness():
-    cfg = _read_job_cfg()
+def _job_getfloat(section: str, key: str, default: float) -> float:
+    v = read_cfg_values(_job_ini_path()).get((section, key))
+    if v is None:
+        return float(default)
     try:
-        return cfg.getfloat("job", "pcb_thickness")
+        return float(v)
     except Exception:
-        return DEFAULT_PCB_THICKNESS
+        return float(default)
+
+
+def load_pcb_thickness():
+    return _job_getfloat("job", "pcb_thickness", DEFAULT_PCB_THICKNESS)
 
 
 def load_mill_holes_over():
-    cfg = _read_job_cfg()
-    try:
-        return cfg.getfloat("job", "mill_holes_over")
-    except Exception:
-        return DEFAULT_MILL_HOLES_OVER
+    return _job_getfloat("job", "mill_holes_over", DEFAULT_MILL_HOLES_OVER)
 
 
 def load_hole_match_tol():
-    cfg = _read_job_cfg()
-    try:
-        return cfg.getfloat("job", "hole_match_tol")
-    except Exception:
-        return DEFAULT_HOLE_MATCH_TOL
+    return _job_getfloat("job", "hole_match_tol", DEFAULT_HOLE_MATCH_TOL)
 
 
 def _fallback_load_any_drl(tol_xy=None):
     holes = []
     slots = []
 
-    candidates = []
-    for f in os.listdir():
-        low = f.lower()
-        if low.endswith(".drl") or low.endswith(".txt"):
-            candidates.append(f)
-    candidates.sort()
+    with os.scandir(".") as it:
+        candidates = sorted(e.name for e in it if e.name.lower().endswith((".drl", ".txt")) and e.is_file())
 
     for fn in candidates:
         try:
-            ex = parse_excellon_file(fn)
-            holes.extend(ex.all_holes())
-            slots.extend(ex.all_slots())
+            ex_holes, ex_slots = load_excellon_hits(fn)
+            holes.extend(ex_holes)
+            slots.extend(ex_slots)
         except Exception:
             continue
 
@@ -90,6 +86,16 @@ def _fallback_load_any_drl(tol_xy=None):
     return holes, slots
 
 
+def _drill_block(pts, depth, feed_z):
+    """
+    G-code for plunging every point in pts, as one string (single write per tool).
+    """
+    safe = _G0Z % SAFE_Z
+    # One template per hole; the depth/feed parts are constant for the block.
+    hole = "%sG0 X%%.4f Y%%.4f\n%s%s" % (safe, _G1Z % (-depth, feed_z), safe)
+    return "".join([hole % xy for xy in pts])
+
+
 def _assign_holes_to_drills(holes, drill_bits, tol):
     """
     holes: [(x,y,diam)]
@@ -113,14 +119,11 @@ def _assign_holes_to_drills(holes, drill_bits, tol):
 
     for x, y, hd in holes:
         limit = float(hd) + tol
-        pick = None
-        for i, d in enumerate(ds):
-            if d <= limit + 1e-9:
-                pick = drills[i]
-            else:
-                break
-        if pick is None:
+        # ds is ascending: the largest drill <= limit sits just left of the bisection point.
+        i = bisect_right(ds, limit + 1e-9) - 1
+        if i < 0:
             return None, f"Impossible: no drill <= {hd:.3f}+{tol:.3f}mm"
+        pick = drills[i]
         assigned[id(pick)].append((x, y))
         used.add(id(pick))
 
@@ -131,36 +134,7 @@ def _assign_holes_to_drills(holes, drill_bits, tol):
     return ordered, None
 
 
-def _order_points_nearest(points, start_xy=(0.0, 0.0)):
-    """
-    Step 5: order drill hits to minimize travel (nearest neighbor).
-    points: [(x,y),...]
-    """
-    if not points:
-        return []
-
-    rem = [(float(x), float(y)) for (x, y) in points]
-    out = []
-    curx, cury = float(start_xy[0]), float(start_xy[1])
-
-    while rem:
-        best_i = 0
-        best_d2 = float("inf")
-        for i, (x, y) in enumerate(rem):
-            dx = x - curx
-            dy = y - cury
-            d2 = dx * dx + dy * dy
-            if d2 < best_d2:
-                best_d2 = d2
-                best_i = i
-        x, y = rem.pop(best_i)
-        out.append((x, y))
-        curx, cury = x, y
-
-    return out
-
-
-def run_drill(bit, combined, prefix, drill_bits=None, tol=None):
+def run_drill(bit, combined, prefix, drill_bits=None, tol=None, ctx=None):
     """
     If drill_bits is provided (list of bit dicts), uses planned drilling:
       - largest drill that fits each hole (<= hole_d + tol)
@@ -168,35 +142,40 @@ def run_drill(bit, combined, prefix, drill_bits=None, tol=None):
       - Step 5: orders holes per tool to reduce travel
     Else legacy fallback (multi by DRL tool diameters, using single 'bit') with ordering.
     """
-    copper = load_copper(prefix + "-TopLayer.gbr")
-    minx, miny, _, _ = copper.bounds
+    if ctx is None:
+        ctx = JobContext(prefix)
+    minx, miny = ctx.origin
 
     tol_xy = load_hole_dedupe_tol()
 
     holes_raw = []
     slots_raw = []
     try:
-        holes_raw, slots_raw = load_drills_and_slots(prefix, tol_xy=tol_xy)
+        holes_raw, slots_raw = ctx.drills_and_slots(tol_xy)
     except Exception:
         holes_raw, slots_raw = [], []
 
-    if not holes_raw and not slots_raw:
+    from_prefix = bool(holes_raw or slots_raw)
+    if not from_prefix:
         holes_raw, slots_raw = _fallback_load_any_drl(tol_xy=tol_xy)
 
     if not holes_raw:
         print("[DRILL] No round drill hits found, skipping")
         return
 
-    mill_over = load_mill_holes_over()
-    small_holes_raw = [(x, y, float(d)) for (x, y, d) in holes_raw if float(d) < float(mill_over)]
-    small_holes_raw = dedupe_holes_by_xy(small_holes_raw, float(tol_xy))
+    mill_over = float(load_mill_holes_over())
+    if from_prefix:
+        # Shared with run_outline via ctx: already translated to the copper origin.
+        arr = ctx.holes_array(tol_xy)
+        small = [tuple(h) for h in arr[arr[:, 2] < mill_over].tolist()]
+    else:
+        small = [(x - minx, y - miny, d) for (x, y, d) in holes_raw if d < mill_over]
+    holes = dedupe_holes_by_xy(small, float(tol_xy))
 
-    if not small_holes_raw:
+    if not holes:
         print("[DRILL] All holes are marked for milling, skipping drill phase")
         return
 
-    holes = [(x - minx, y - miny, d) for (x, y, d) in small_holes_raw]
-
     pcb_thickness = load_pcb_thickness()
     depth = pcb_thickness
 
@@ -212,10 +191,10 @@ def run_drill(bit, combined, prefix, drill_bits=None, tol=None):
 
         total = sum(len(pts) for (_b, pts) in plan)
 
-        with open(out, "a") as g:
+        with open(out, "a", buffering=GCODE_WRITE_BUFFER) as g:
             cur = (0.0, 0.0)
             for b, pts in plan:
-                pts = _order_points_nearest(pts, start_xy=cur)
+                pts = order_points_nearest(pts, start_xy=cur)
                 if pts:
                     cur = pts[-1]
 
@@ -224,11 +203,7 @@ def run_drill(bit, combined, prefix, drill_bits=None, tol=None):
                     b,
                     f"Drill: {b['name']} ({float(b['diameter']):.3f}mm) | {len(pts)} holes",
                 )
-                for x, y in pts:
-                    g.write(f"G0 Z{SAFE_Z:.3f}\n")
-                    g.write(f"G0 X{x:.4f} Y{y:.4f}\n")
-                    g.write(f"G1 Z{-depth:.4f} F{b['feed_z']}\n")
-                    g.write(f"G0 Z{SAFE_Z:.3f}\n")
+                g.write(_drill_block(pts, depth, b["feed_z"]))
 
             end_sequence(g, end_program=not combined)
 
@@ -241,21 +216,17 @@ def run_drill(bit, combined, prefix, drill_bits=None, tol=None):
         by_diam.setdefault(key, []).append((x, y))
 
     total = 0
-    with open(out, "a") as g:
+    with open(out, "a", buffering=GCODE_WRITE_BUFFER) as g:
         cur = (0.0, 0.0)
         for diam in sorted(by_diam.keys(), reverse=True):
-            holes_xy = _order_points_nearest(by_diam[diam], start_xy=cur)
+            holes_xy = order_points_nearest(by_diam[diam], start_xy=cur)
             if holes_xy:
                 cur = holes_xy[-1]
 
             total += len(holes_xy)
 
             toolchange_sequence(g, bit, f"Change drill to {diam:.3f}mm")
-            for x, y in holes_xy:
-                g.write(f"G0 Z{SAFE_Z:.3f}\n")
-                g.write(f"G0 X{x:.4f} Y{y:.4f}\n")
-                g.write(f"G1 Z{-depth:.4f} F{bit['feed_z']}\n")
-                g.write(f"G0 Z{SAFE_Z:.3f}\n")
+            g.write(_drill_block(holes_xy, depth, bit["feed_z"]))
 
         end_sequence(g, end_program=not combined)
 
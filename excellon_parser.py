@@ -20,14 +20,55 @@
 
 import os
 import re
-import configparser
+import math
 import logging
+import functools
+import itertools
+
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # optional: hole dedupe falls back to the pure-Python grid
+    cKDTree = None
+
+from job_config import read_cfg_values
 
 
 DEFAULT_HOLE_DEDUPE_TOL = 0.10  # mm
 _MAX_REASONABLE_MM = 2000.0
 _MIN_REASONABLE_MM = 0.01
 
+# Below this many holes the grid pass alone beats building a KD-tree (measured).
+DEDUPE_KDTREE_MIN_HOLES = 16
+
+# Dedupe grid cells are packed into one int key: ix * stride + iy (cheaper to hash than a tuple).
+# Keys of far-apart cells can alias, which only adds candidates that fail the distance test.
+_CELL_STRIDE = 1 << 21
+# The 3x3 neighbourhood as key offsets, in the dx-major order the first-match scan relies on.
+_NEIGHBOR_KEYS = tuple(dx * _CELL_STRIDE + dy for dx in (-1, 0, 1) for dy in (-1, 0, 1))
+
+_HOLE_RE = re.compile(r"X(-?[\d\.]+)Y(-?[\d\.]+)")
+_FILE_FMT_RE = re.compile(r"FILE_FORMAT\s*=\s*(\d+)\s*:\s*(\d+)", re.IGNORECASE)
+
+# G85 slots (EasyEDA style)
+_G85_RE = re.compile(r"X(-?[\d\.]+)Y(-?[\d\.]+)G85X(-?[\d\.]+)Y(-?[\d\.]+)", re.IGNORECASE)
+
+# The common line shapes in one anchored pattern, dispatched on m.lastgroup:
+#   tooldef  T01C0.800 or T01D0.031 (some exporters)
+#   toolsel  T01
+#   hit      X..Y.. (hole / route point) or X..Y..G85X..Y.. (EasyEDA slot)
+#   units    header units like METRIC,LZ or INCH,TZ
+# Anything else (M-codes, bare METRIC/INCH, lower-case or trailing text) goes through the legacy checks.
+_LINE_RE = re.compile(
+    r"(?P<tooldef>T(?P<tid>\d+)[CD](?P<diam>[\d\.]+))$"
+    r"|(?P<toolsel>T\d+)$"
+    r"|(?P<hit>X(?P<x>-?[\d\.]+)Y(?P<y>-?[\d\.]+)(?:G85X(?P<x2>-?[\d\.]+)Y(?P<y2>-?[\d\.]+))?)$"
+    r"|(?P<units>(?P<u>(?i:METRIC|INCH))\s*,\s*(?P<zs>(?i:LZ|TZ))\s*)$"
+)
+# The "hit" alternative of _LINE_RE without the G85 tail: the bulk of any drill file.
+_PLAIN_HIT_RE = re.compile(r"X(-?[\d\.]+)Y(-?[\d\.]+)$")
+
 _LOGGER_NAME = "cnc_pcb.excellon"
 _default_logger = logging.getLogger(_LOGGER_NAME)
 
@@ -46,26 +87,23 @@ def _warn(logger: logging.Logger, msg: str, *, strict: bool) -> None:
         raise ExcellonParseError(msg)
 
 
-def _read_job_cfg():
-    cfg = configparser.ConfigParser()
-
+def _job_ini_path():
     try:
         import common_gerber as cg
         root_ini = os.path.join(os.path.dirname(os.path.abspath(cg.__file__)), "job_settings.ini")
         if os.path.exists(root_ini):
-            cfg.read(root_ini)
-            return cfg
+            return root_ini
     except Exception:
         pass
 
-    cfg.read("job_settings.ini")
-    return cfg
+    return "job_settings.ini"
 
 
 def load_hole_dedupe_tol():
-    cfg = _read_job_cfg()
+    v = read_cfg_values(_job_ini_path()).get(("job", "hole_dedupe_tol"))
+    if v is None:
+        return DEFAULT_HOLE_DEDUPE_TOL
     try:
-        v = cfg.getfloat("job", "hole_dedupe_tol")
         return max(0.0, float(v))
     except Exception:
         return DEFAULT_HOLE_DEDUPE_TOL
@@ -73,7 +111,7 @@ def load_hole_dedupe_tol():
 
 def dedupe_holes_by_xy(holes, tol_xy: float):
     """
-    holes: [(x, y, d_mm)]
+    holes: [(x, y, d_mm)] or an (N, 3) float array
     tol_xy: mm
 
     If two holes are within tol_xy (euclidean), they are the same location
@@ -81,10 +119,20 @@ def dedupe_holes_by_xy(holes, tol_xy: float):
 
     IMPORTANT: center (x,y) is taken from the largest-diameter hole.
     """
-    if not holes:
+    if isinstance(holes, np.ndarray):
+        arr = holes.reshape(-1, 3)
+        n = len(arr)
+    else:
+        arr = None
+        n = len(holes) if holes else 0
+    if not n:
         return []
 
     tol_xy = float(tol_xy)
+    use_tree = tol_xy > 0 and cKDTree is not None and n >= DEDUPE_KDTREE_MIN_HOLES
+    if arr is not None and not use_tree:
+        holes = arr.tolist()
+
     if tol_xy <= 0:
         best = {}
         for x, y, d in holes:
@@ -95,73 +143,135 @@ def dedupe_holes_by_xy(holes, tol_xy: float):
                 best[key] = (float(x), float(y), d)
         return list(best.values())
 
+    if not use_tree:
+        # No pair can merge when the hits are spread out along either axis; that check is a
+        # sort in C, so the Python grid pass is skipped for such inputs.
+        if n >= DEDUPE_KDTREE_MIN_HOLES and _axis_separated(holes if arr is None else arr, tol_xy):
+            return [(float(x), float(y), float(d)) for x, y, d in holes]
+        out, _src = _dedupe_grid(holes, tol_xy)
+        return out
+
+    # Only holes with a neighbour within tol can merge; the tree finds them in C and the
+    # grid pass (exact comparisons, first-seen order) runs on that subset alone.
+    if arr is None:
+        arr = np.asarray(holes, dtype=np.float64).reshape(-1, 3)
+    pairs = cKDTree(arr[:, :2]).query_pairs(tol_xy * (1.0 + 1e-9), output_type="ndarray")
+    rows = arr.tolist()
+    if not len(pairs):
+        return [tuple(r) for r in rows]
+
+    near = np.zeros(len(rows), dtype=bool)
+    near[pairs.ravel()] = True
+    near_idx = np.flatnonzero(near)
+    merged, src = _dedupe_grid([rows[i] for i in near_idx.tolist()], tol_xy)
+
+    # Reassemble in the order each surviving hole was first seen.
+    keep = [tuple(r) for r in rows]
+    for i in near_idx.tolist():
+        keep[i] = None
+    for h, i in zip(merged, near_idx[src].tolist()):
+        keep[i] = h
+    return [h for h in keep if h is not None]
+
+
+def _axis_separated(holes, tol_xy):
+    """True if the sorted x (or y) coordinates are all more than tol_xy apart."""
+    arr = np.asarray(holes, dtype=np.float64).reshape(-1, 3)
+    lim = tol_xy * (1.0 + 1e-9)
+    for col in (0, 1):
+        if (np.diff(np.sort(arr[:, col])) > lim).all():
+            return True
+    return False
+
+
+def _dedupe_grid(holes, tol_xy):
+    """
+    Sequential grid pass behind dedupe_holes_by_xy (tol_xy > 0).
+    Returns (out, src): src[k] is the index in holes of the hit that created out[k].
+    """
     inv = 1.0 / tol_xy
     r2 = tol_xy * tol_xy
 
-    grid = {}  # (ix,iy) -> list of indices into out
+    grid = {}  # packed cell key -> list of indices into out
+    grid_get = grid.get
     out = []
+    src = []
+    out_append = out.append
+    src_append = src.append
 
-    def cell(x, y):
-        # round-based binning is OK as long as we also check neighboring bins
-        return int(round(x * inv)), int(round(y * inv))
-
-    for x, y, d in holes:
+    for k, (x, y, d) in enumerate(holes):
         x = float(x)
         y = float(y)
         d = float(d)
 
-        ix, iy = cell(x, y)
+        # round-based binning is OK as long as we also check neighboring bins
+        key = int(round(x * inv)) * _CELL_STRIDE + int(round(y * inv))
 
         found = None
-        for dx in (-1, 0, 1):
-            for dy in (-1, 0, 1):
-                lst = grid.get((ix + dx, iy + dy))
-                if not lst:
-                    continue
-                for idx in lst:
-                    x2, y2, d2 = out[idx]
-                    ddx = x - x2
-                    ddy = y - y2
-                    if (ddx * ddx + ddy * ddy) <= r2:
-                        found = idx
-                        break
-                if found is not None:
+        for off in _NEIGHBOR_KEYS:
+            lst = grid_get(key + off)
+            if not lst:
+                continue
+            for idx in lst:
+                x2, y2, d2 = out[idx]
+                ddx = x - x2
+                ddy = y - y2
+                if (ddx * ddx + ddy * ddy) <= r2:
+                    found = idx
                     break
             if found is not None:
                 break
 
         if found is None:
-            out.append((x, y, d))
-            idx = len(out) - 1
-            grid.setdefault((ix, iy), []).append(idx)
+            idx = len(out)
+            out_append((x, y, d))
+            src_append(k)
+            lst = grid_get(key)
+            if lst is None:
+                grid[key] = [idx]
+            else:
+                lst.append(idx)
         else:
             x2, y2, d2 = out[found]
             # If the new hit is larger, replace BOTH diameter and center with the larger hole's center.
             if d > d2:
                 out[found] = (x, y, d)
 
-    return out
+    return out, src
 
 
 class ExcellonTool:
+    __slots__ = ("id", "diameter", "xs", "ys")
+
     def __init__(self, tool_id, diameter):
         self.id = tool_id
         self.diameter = diameter
-        self.holes = []  # (x, y)
+        # Hit coordinates as parallel columns: no tuple per hit while parsing.
+        self.xs = []
+        self.ys = []
+
+    @property
+    def holes(self):
+        """[(x, y)] of the hits (built on demand)."""
+        return list(zip(self.xs, self.ys))
 
 
 class ExcellonFile:
+    __slots__ = ("tools", "units", "zero_suppression", "format", "_total", "_div", "_slots")
+
     def __init__(self):
         self.tools = {}
         self.units = "mm"
         self.zero_suppression = "leading"  # 'leading' or 'trailing'
         self.format = (3, 3)  # (int_digits, dec_digits)
-        self._scale = 0.001
+        self._total = 6
+        self._div = 1000
         self._slots = []  # ((x1,y1),(x2,y2), slot_width)
 
     def set_format(self, int_digits, dec_digits):
         self.format = (int_digits, dec_digits)
-        self._scale = 10 ** (-int(dec_digits))
+        self._total = int_digits + dec_digits
+        self._div = 10 ** dec_digits if dec_digits > 0 else 1
 
     def set_zero_suppression(self, z: str):
         z = (z or "").lower()
@@ -174,8 +284,10 @@ class ExcellonFile:
         self.tools[tool_id] = ExcellonTool(tool_id, diameter)
 
     def add_hole(self, tool_id, x, y):
-        if tool_id in self.tools:
-            self.tools[tool_id].holes.append((x, y))
+        t = self.tools.get(tool_id)
+        if t is not None:
+            t.xs.append(x)
+            t.ys.append(y)
 
     def add_slot(self, tool_id, x1, y1, x2, y2):
         if tool_id in self.tools:
@@ -185,10 +297,22 @@ class ExcellonFile:
     def all_holes(self):
         out = []
         for t in self.tools.values():
-            for x, y in t.holes:
-                out.append((x, y, t.diameter))
+            out.extend(zip(t.xs, t.ys, itertools.repeat(t.diameter)))
         return out
 
+    def holes_array(self):
+        """all_holes() as an (N, 3) float array [x, y, d], filled column-wise from the tools."""
+        tools = list(self.tools.values())
+        arr = np.empty((sum(len(t.xs) for t in tools), 3), dtype=np.float64)
+        i = 0
+        for t in tools:
+            j = i + len(t.xs)
+            arr[i:j, 0] = t.xs
+            arr[i:j, 1] = t.ys
+            arr[i:j, 2] = t.diameter
+            i = j
+        return arr
+
     def all_slots(self):
         return list(self._slots)
 
@@ -204,19 +328,18 @@ class ExcellonFile:
         if "." in token:
             return float(token)
 
-        neg = token.startswith("-")
+        neg = token[0] == "-"
         s = token[1:] if neg else token
 
         int_d, dec_d = self.format
-        total = int_d + dec_d
+        total = self._total
         if total <= 0:
             total = max(1, len(s))
 
         if len(s) > total:
             # Wrong format is likely; keep rightmost digits defensively
             s = s[-total:]
-
-        if len(s) < total:
+        elif len(s) < total:
             if self.zero_suppression == "leading":
                 s = s.rjust(total, "0")
             else:
@@ -225,17 +348,46 @@ class ExcellonFile:
         if dec_d <= 0:
             v = float(int(s))
         else:
-            ip = s[:int_d] if int_d > 0 else "0"
-            fp = s[int_d:] if int_d > 0 else s
-            if ip == "":
-                ip = "0"
-            v = float(f"{int(ip)}.{fp}")
+            # int / int rounds once, so this is the same float as parsing "ip.fp".
+            v = int(s) / (self._div if int_d > 0 else 10 ** len(s))
 
         return -v if neg else v
 
     def parse_xy(self, token: str) -> float:
         return self._parse_fixed(token)
 
+    def parse_xy_many(self, tokens):
+        """
+        [parse_xy(t) for t in tokens] for regex-matched hit tokens, batched by token style.
+        Returns None when the batch needs per-token handling (mixed styles, padded or odd formats);
+        raises ValueError on a malformed decimal token.
+        """
+        joined = "".join(tokens)
+        n_dots = joined.count(".")
+        if n_dots == len(tokens):
+            # float() accepts at most one "." per token, so if it succeeds every token had exactly one.
+            return [float(t) for t in tokens]
+        if n_dots:
+            return None
+
+        int_d, dec_d = self.format
+        total = self._total
+        if int_d <= 0 or total <= 0:
+            return None
+        if "-" in joined:
+            if not all(len(t) == total + (t[0] == "-") for t in tokens):
+                return None
+        elif not all(len(t) == total for t in tokens):
+            return None
+
+        # Full-width digits: no padding or truncation, and int / div rounds once as in _parse_fixed.
+        div = self._div
+        vals = [int(t) / div for t in tokens]
+        if "-" in joined:
+            # int("-000") loses the sign that _parse_fixed keeps on zero.
+            vals = [-0.0 if (v == 0.0 and t[0] == "-") else v for v, t in zip(vals, tokens)]
+        return vals
+
 
 def parse_excellon_file(filename, *, strict: bool = False, logger: logging.Logger | None = None):
     lg = _get_logger(logger)
@@ -249,22 +401,17 @@ def parse_excellon_file(filename, *, strict: bool = False, logger: logging.Logge
         return ex
 
     current_tool = None
+    tool = None  # ex.tools[current_tool] once it is defined; hits go straight to it
     unit_scale = 1.0  # to mm
 
-    # Tool def: T01C0.800 or T01D0.031 (some exporters)
-    tool_def_re = re.compile(r"^T(\d+)[CD]([\d\.]+)$")
-    tool_sel_re = re.compile(r"^T\d+$")
-
-    hole_re = re.compile(r"X(-?[\d\.]+)Y(-?[\d\.]+)")
-    file_fmt_re = re.compile(r"FILE_FORMAT\s*=\s*(\d+)\s*:\s*(\d+)", re.IGNORECASE)
-
-    # G85 slots (EasyEDA style)
-    g85_re = re.compile(
-        r"X(-?[\d\.]+)Y(-?[\d\.]+)G85X(-?[\d\.]+)Y(-?[\d\.]+)", re.IGNORECASE
-    )
-
-    # Header units like: METRIC,LZ  or  INCH,TZ
-    unit_hdr_re = re.compile(r"^(METRIC|INCH)\s*,\s*(LZ|TZ)\s*$", re.IGNORECASE)
+    # Module-level patterns bound to locals for the per-line loop.
+    line_re = _LINE_RE
+    plain_hit_re = _PLAIN_HIT_RE
+    hole_re = _HOLE_RE
+    file_fmt_re = _FILE_FMT_RE
+    g85_re = _G85_RE
+    parse_xy = ex.parse_xy
+    slots_append = ex._slots.append
 
     route_mode = False
     last_route_xy = None
@@ -272,45 +419,138 @@ def parse_excellon_file(filename, *, strict: bool = False, logger: logging.Logge
     saw_units = False
     saw_any_tool_def = False
 
-    holes_for_bounds = []
-
+    # Running extents of every hit, for the sanity warnings at the end.
+    min_x = min_y = math.inf
+    max_x = max_y = -math.inf
+
+    # Plain drill hits are collected as raw tokens and converted a run at a time.
+    # A run ends at the next line of any other kind, before that line is handled, so
+    # tool, units and format are still the ones the run was read under.
+    run_x = []
+    run_y = []
+    run_no = []
+
+    def flush_run():
+        nonlocal min_x, max_x, min_y, max_y
+        try:
+            xs = ex.parse_xy_many(run_x)
+            ys = ex.parse_xy_many(run_y) if xs is not None else None
+        except ValueError:
+            ys = None
+
+        if ys is None:
+            # Per-token path: keeps the bad-XY diagnostics and their line numbers.
+            xs = []
+            ys = []
+            for tx, ty, no in zip(run_x, run_y, run_no):
+                try:
+                    x = parse_xy(tx) * unit_scale
+                    y = parse_xy(ty) * unit_scale
+                except Exception:
+                    _warn(lg, f"{os.path.basename(filename)}:{no}: bad XY: {lines[no - 1].strip()}", strict=strict)
+                    continue
+                xs.append(x)
+                ys.append(y)
+        elif unit_scale != 1.0:
+            xs = [v * unit_scale for v in xs]
+            ys = [v * unit_scale for v in ys]
+
+        if xs:
+            min_x = min(min_x, min(xs))
+            max_x = max(max_x, max(xs))
+            min_y = min(min_y, min(ys))
+            max_y = max(max_y, max(ys))
+            tool.xs.extend(xs)
+            tool.ys.extend(ys)
+        run_x.clear()
+        run_y.clear()
+        run_no.clear()
+
+    # Text mode already folds \r\n / \r into \n, so split("\n") yields the same lines as iterating f.
     with open(filename, "r", errors="ignore") as f:
-        line_no = 0
-        for raw in f:
-            line_no += 1
-            line = raw.strip()
-            if not line:
+        data = f.read()
+
+    lines = data.split("\n")
+    for line_no, raw in enumerate(lines, 1):
+        line = raw.strip()
+        if not line:
+            continue
+
+        if line[0] == "X" and tool is not None and not route_mode:
+            m = plain_hit_re.match(line)
+            if m is not None:
+                tx, ty = m.groups()
+                run_x.append(tx)
+                run_y.append(ty)
+                run_no.append(line_no)
                 continue
 
-            # Comments / format hints
-            if line.startswith(";"):
-                mfmt = file_fmt_re.search(line)
-                if mfmt:
-                    try:
-                        ex.set_format(int(mfmt.group(1)), int(mfmt.group(2)))
-                    except Exception:
-                        _warn(
-                            lg,
-                            f"{os.path.basename(filename)}:{line_no}: bad FILE_FORMAT comment: {line}",
-                            strict=strict,
-                        )
+        if run_no:
+            flush_run()
+
+        # Comments / format hints
+        if line[0] == ";":
+            # A FILE_FORMAT hint always has "_" and "=" (no case variants); most comments have neither.
+            mfmt = file_fmt_re.search(line) if ("_" in line and "=" in line) else None
+            if mfmt:
+                try:
+                    ex.set_format(int(mfmt.group(1)), int(mfmt.group(2)))
+                except Exception:
+                    _warn(
+                        lg,
+                        f"{os.path.basename(filename)}:{line_no}: bad FILE_FORMAT comment: {line}",
+                        strict=strict,
+                    )
+            continue
+
+        m = line_re.match(line)
+        kind = m.lastgroup if m is not None else None
+
+        if kind == "hit":
+            # Hole, or EasyEDA slot (G85) when the second XY is present
+            if not current_tool:
                 continue
+            tx, ty, tx2, ty2 = m.group("x", "y", "x2", "y2")
+
+        elif kind == "tooldef":
+            tid = "T" + m.group("tid")
+            try:
+                diam = float(m.group("diam")) * unit_scale
+            except Exception:
+                _warn(lg, f"{os.path.basename(filename)}:{line_no}: invalid tool diameter: {line}", strict=strict)
+                continue
+            ex.add_tool(tid, diam)
+            if tid == current_tool:
+                # (Re)defined while selected: later hits go to the new tool, as before.
+                tool = ex.tools[tid]
+            saw_any_tool_def = True
+            continue
+
+        elif kind == "toolsel":
+            current_tool = line
+            tool = ex.tools.get(current_tool)
+            last_route_xy = None
+            if tool is None:
+                _warn(
+                    lg,
+                    f"{os.path.basename(filename)}:{line_no}: selected {current_tool} before/without definition.",
+                    strict=False,
+                )
+            continue
 
+        elif kind == "units":
             # Header unit line
-            m_u = unit_hdr_re.match(line)
-            if m_u:
-                u = m_u.group(1).upper()
-                z = m_u.group(2).upper()
-                if u == "METRIC":
-                    ex.units = "mm"
-                    unit_scale = 1.0
-                else:
-                    ex.units = "inch"
-                    unit_scale = 25.4
-                ex.set_zero_suppression("leading" if z == "LZ" else "trailing")
-                saw_units = True
-                continue
+            if m.group("u").upper() == "METRIC":
+                ex.units = "mm"
+                unit_scale = 1.0
+            else:
+                ex.units = "inch"
+                unit_scale = 25.4
+            ex.set_zero_suppression("leading" if m.group("zs").upper() == "LZ" else "trailing")
+            saw_units = True
+            continue
 
+        else:
             # Units (legacy)
             if "METRIC" in line or line.startswith("M71"):
                 ex.units = "mm"
@@ -332,79 +572,77 @@ def parse_excellon_file(filename, *, strict: bool = False, logger: logging.Logge
                 last_route_xy = None
                 continue
 
-            # Tool definition
-            m = tool_def_re.match(line)
-            if m:
-                tid = "T" + m.group(1)
-                try:
-                    diam = float(m.group(2)) * unit_scale
-                except Exception:
-                    _warn(lg, f"{os.path.basename(filename)}:{line_no}: invalid tool diameter: {line}", strict=strict)
-                    continue
-                ex.add_tool(tid, diam)
-                saw_any_tool_def = True
-                continue
-
-            # Tool select
-            if tool_sel_re.match(line):
-                current_tool = line
-                last_route_xy = None
-                if current_tool not in ex.tools:
-                    _warn(
-                        lg,
-                        f"{os.path.basename(filename)}:{line_no}: selected {current_tool} before/without definition.",
-                        strict=False,
-                    )
+            if not current_tool:
                 continue
 
             # EasyEDA slot (G85)
-            if current_tool:
-                m = g85_re.search(line)
-                if m:
-                    try:
-                        x1 = ex.parse_xy(m.group(1)) * unit_scale
-                        y1 = ex.parse_xy(m.group(2)) * unit_scale
-                        x2 = ex.parse_xy(m.group(3)) * unit_scale
-                        y2 = ex.parse_xy(m.group(4)) * unit_scale
-                    except Exception:
-                        _warn(lg, f"{os.path.basename(filename)}:{line_no}: bad G85 slot: {line}", strict=strict)
-                        continue
-                    ex.add_slot(current_tool, x1, y1, x2, y2)
-                    holes_for_bounds.extend([(x1, y1), (x2, y2)])
-                    continue
-
-            # Coordinate line (hole or route segment endpoint)
-            if current_tool and "X" in line and "Y" in line:
+            m = g85_re.search(line)
+            if m:
+                tx, ty, tx2, ty2 = m.groups()
+            elif "X" in line and "Y" in line:
                 m = hole_re.search(line)
                 if not m:
                     continue
+                tx, ty = m.groups()
+                tx2 = None
+            else:
+                continue
 
-                try:
-                    x = ex.parse_xy(m.group(1)) * unit_scale
-                    y = ex.parse_xy(m.group(2)) * unit_scale
-                except Exception:
-                    _warn(lg, f"{os.path.basename(filename)}:{line_no}: bad XY: {line}", strict=strict)
-                    continue
-
-                if current_tool not in ex.tools:
-                    _warn(
-                        lg,
-                        f"{os.path.basename(filename)}:{line_no}: XY uses undefined tool {current_tool}; dropping hit.",
-                        strict=False,
-                    )
-                    continue
+        if tx2 is not None:
+            try:
+                x1 = parse_xy(tx) * unit_scale
+                y1 = parse_xy(ty) * unit_scale
+                x2 = parse_xy(tx2) * unit_scale
+                y2 = parse_xy(ty2) * unit_scale
+            except Exception:
+                _warn(lg, f"{os.path.basename(filename)}:{line_no}: bad G85 slot: {line}", strict=strict)
+                continue
+            if tool is not None:
+                slots_append(((x1, y1), (x2, y2), tool.diameter))
+            min_x = min(min_x, x1, x2)
+            max_x = max(max_x, x1, x2)
+            min_y = min(min_y, y1, y2)
+            max_y = max(max_y, y1, y2)
+            continue
+
+        # Coordinate line (hole or route segment endpoint)
+        try:
+            x = parse_xy(tx) * unit_scale
+            y = parse_xy(ty) * unit_scale
+        except Exception:
+            _warn(lg, f"{os.path.basename(filename)}:{line_no}: bad XY: {line}", strict=strict)
+            continue
+
+        if tool is None:
+            _warn(
+                lg,
+                f"{os.path.basename(filename)}:{line_no}: XY uses undefined tool {current_tool}; dropping hit.",
+                strict=False,
+            )
+            continue
+
+        if route_mode:
+            if last_route_xy is None:
+                last_route_xy = (x, y)
+            else:
+                x1, y1 = last_route_xy
+                slots_append(((x1, y1), (x, y), tool.diameter))
+                last_route_xy = (x, y)
+        else:
+            tool.xs.append(x)
+            tool.ys.append(y)
 
-                if route_mode:
-                    if last_route_xy is None:
-                        last_route_xy = (x, y)
-                    else:
-                        x1, y1 = last_route_xy
-                        ex.add_slot(current_tool, x1, y1, x, y)
-                        last_route_xy = (x, y)
-                else:
-                    ex.add_hole(current_tool, x, y)
+        if x < min_x:
+            min_x = x
+        if x > max_x:
+            max_x = x
+        if y < min_y:
+            min_y = y
+        if y > max_y:
+            max_y = y
 
-                holes_for_bounds.append((x, y))
+    if run_no:
+        flush_run()
 
     if not saw_units:
         _warn(lg, f"{os.path.basename(filename)}: no explicit units; defaulted to mm.", strict=False)
@@ -413,11 +651,9 @@ def parse_excellon_file(filename, *, strict: bool = False, logger: logging.Logge
 
     # Sanity extents
     try:
-        if holes_for_bounds:
-            xs = [p[0] for p in holes_for_bounds]
-            ys = [p[1] for p in holes_for_bounds]
-            w = max(xs) - min(xs)
-            h = max(ys) - min(ys)
+        if max_x >= min_x:
+            w = max_x - min_x
+            h = max_y - min_y
             if (w > _MAX_REASONABLE_MM) or (h > _MAX_REASONABLE_MM):
                 _warn(
                     lg,
@@ -436,6 +672,50 @@ def parse_excellon_file(filename, *, strict: bool = False, logger: logging.Logge
     return ex
 
 
+# ---- Parse cache ----
+# Outline and drill ops both read the same -PTH/-NPTH files in one job.
+# Keyed by (abspath, mtime_ns, size); holes are kept as a read-only (N, 3) array and slots
+# as a tuple so callers can't mutate them.
+
+
+def _file_stamp(fn):
+    try:
+        st = os.stat(fn)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=16)
+def _excellon_hits_cached(path, stamp, strict):
+    ex = parse_excellon_file(path, strict=strict)
+    arr = ex.holes_array()
+    arr.flags.writeable = False
+    return arr, tuple(ex.all_slots())
+
+
+def _load_excellon_arrays(fn, strict, logger):
+    """(holes (N, 3) array, slots) of one Excellon file; the array may be the cached read-only one."""
+    stamp = _file_stamp(fn) if (fn and logger is None) else None
+    if stamp is None:
+        ex = parse_excellon_file(fn, strict=strict, logger=logger)
+        return ex.holes_array(), ex.all_slots()
+    return _excellon_hits_cached(os.path.abspath(fn), stamp, bool(strict))
+
+
+def load_excellon_hits(fn, *, strict: bool = False, logger: logging.Logger | None = None):
+    """
+    (holes, slots) of one Excellon file, served from the parse cache when possible.
+    An explicit logger bypasses the cache so the caller sees the parse diagnostics.
+    """
+    arr, slots = _load_excellon_arrays(fn, strict, logger)
+    return [tuple(h) for h in arr.tolist()], list(slots)
+
+
+def clear_excellon_cache() -> None:
+    _excellon_hits_cached.cache_clear()
+
+
 def load_drills(prefix, tol_xy=None):
     holes, _slots = load_drills_and_slots(prefix, tol_xy=tol_xy)
     return holes
@@ -444,21 +724,21 @@ def load_drills(prefix, tol_xy=None):
 def load_drills_and_slots(prefix, tol_xy=None, *, strict: bool = False, logger: logging.Logger | None = None):
     lg = _get_logger(logger)
 
-    holes = []
+    parts = []
     slots = []
 
     if not prefix:
         _warn(lg, "Excellon: empty prefix passed to load_drills_and_slots().", strict=strict)
-        return holes, slots
+        return [], slots
 
     found_any = False
     for suffix in ("-PTH.drl", "-NPTH.drl"):
         fn = prefix + suffix
         if os.path.exists(fn):
             found_any = True
-        ex = parse_excellon_file(fn, strict=strict, logger=lg)
-        holes.extend(ex.all_holes())
-        slots.extend(ex.all_slots())
+        ex_holes, ex_slots = _load_excellon_arrays(fn, strict, logger)
+        parts.append(ex_holes)
+        slots.extend(ex_slots)
 
     if not found_any:
         _warn(lg, f"Excellon: no drill files found for prefix '{prefix}' (-PTH.drl / -NPTH.drl).", strict=False)
@@ -466,5 +746,5 @@ def load_drills_and_slots(prefix, tol_xy=None, *, strict: bool = False, logger:
     if tol_xy is None:
         tol_xy = load_hole_dedupe_tol()
 
-    holes = dedupe_holes_by_xy(holes, tol_xy=float(tol_xy))
+    holes = dedupe_holes_by_xy(np.concatenate(parts), tol_xy=float(tol_xy))
     return holes, slots
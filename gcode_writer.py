@@ -14,6 +14,9 @@ from job_config import (
     get_probe_gcode,
 )
 
+# File buffer for .nc output; toolpath writers batch lines and flush per operation.
+GCODE_WRITE_BUFFER = 1 << 20
+
 
 def write_header(
     o,
@@ -9,6 +9,18 @@
 import math
 from typing import Dict, Tuple, List, Any, Iterable
 
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # optional: nearest-neighbour ordering falls back to a NumPy scan
+    cKDTree = None
+try:
+    import numba
+except ImportError:  # optional: compiled scan kernel for nearest-neighbour ordering
+    numba = None
+
+import shapely
 from shapely.geometry import (
     LineString,
     Polygon,
@@ -25,6 +37,17 @@ from job_config import (
     get_park_xy,
 )
 
+# %-templates for path G-code (cheaper than f-strings per coordinate).
+_G0Z = "G0 Z%.3f\n"
+_G0XY = "G0 X%.4f Y%.4f\n"
+_G1Z = "G1 Z%.4f F%s\n"
+_G1XYZ = "G1 X%.4f Y%.4f Z%.4f F%s\n"
+
+# Below this many candidates the vectorised NumPy scan is faster than the tree walk (measured).
+KDTREE_MIN_POINTS = 8000
+# With numba installed the compiled scan is used below this size, or at any size without scipy.
+NUMBA_MAX_POINTS = 15000
+
 
 def _iter_geoms(g):
     if g is None or g.is_empty:
@@ -73,36 +96,44 @@ def cleanup_geometry(
     if geom is None or geom.is_empty:
         return geom
 
+    noded = True
     try:
         u = unary_union(geom)
     except Exception:
         u = geom
+        noded = False
+
+    # An already-noded set of plain lines comes back unchanged (same part order and start
+    # points) from another union, so the overlay passes below are skipped for it.
+    lines_only = noded and all(type(gg) is LineString for gg in getattr(u, "geoms", (u,)))
 
     if _is_polygonal(u):
         u = _safe_buffer0_polygonal(u)
-    else:
-        if isinstance(u, (GeometryCollection,)) or hasattr(u, "geoms"):
-            fixed_parts = []
-            for gg in u.geoms:
-                fixed_parts.append(_safe_buffer0_polygonal(gg) if _is_polygonal(gg) else gg)
-            try:
-                u = unary_union(fixed_parts)
-            except Exception:
-                u = u
+    elif hasattr(u, "geoms") and not lines_only:
+        fixed_parts = [_safe_buffer0_polygonal(gg) if _is_polygonal(gg) else gg for gg in u.geoms]
+        try:
+            u = unary_union(fixed_parts)
+        except Exception:
+            pass
 
+    simplified = False
     if simplify_tol and simplify_tol > 0:
         try:
             u = u.simplify(float(simplify_tol), preserve_topology=True)
+            simplified = True
         except Exception:
             pass
 
+    min_area = float(min_area)
+    min_length = float(min_length)
+    parts = list(_iter_geoms(u))
     kept = []
-    for g in _iter_geoms(u):
+    for g in parts:
         if isinstance(g, Polygon):
-            if float(g.area) >= float(min_area):
+            if float(g.area) >= min_area:
                 kept.append(g)
         elif isinstance(g, LineString):
-            if float(g.length) >= float(min_length):
+            if float(g.length) >= min_length:
                 kept.append(g)
         else:
             kept.append(g)
@@ -110,16 +141,20 @@ def cleanup_geometry(
     if not kept:
         return unary_union([])
 
+    if lines_only and not simplified and len(kept) == len(parts):
+        return u
+
     try:
         return unary_union(kept)
     except Exception:
         return kept[0]
 
 
-def _dist2(a: Tuple[float, float], b: Tuple[float, float]) -> float:
-    dx = a[0] - b[0]
-    dy = a[1] - b[1]
-    return dx * dx + dy * dy
+def _line_endpoints(lines, counts):
+    """(starts, ends) as (N, 2) float arrays, read in one pass over the packed coordinates."""
+    coords = shapely.get_coordinates(lines)
+    last = np.cumsum(counts) - 1
+    return coords[last - (counts - 1)], coords[last]
 
 
 def order_lines_nearest(
@@ -131,45 +166,241 @@ def order_lines_nearest(
     if not lines:
         return []
 
-    remaining = [ls for ls in lines if ls is not None and not ls.is_empty and len(ls.coords) >= 2]
-    if not remaining:
+    # Coordinate counts come back in one vectorised call; empty lines count 0 and drop out too.
+    remaining = np.array([ls for ls in lines if ls is not None], dtype=object)
+    counts = shapely.get_num_coordinates(remaining)
+    keep = counts >= 2
+    remaining = remaining[keep]
+    if not len(remaining):
         return []
 
-    ordered: List[LineString] = []
-    cur = start_xy
+    starts, ends = _line_endpoints(remaining, counts[keep])
+    order, flip = _order_paths(starts, ends, start_xy, allow_reverse)
+    picks = remaining[order]
+    if flip.any():
+        picks[flip] = shapely.reverse(picks[flip])
+    return picks.tolist()
+
+
+def _order_paths(starts, ends, start_xy, allow_reverse):
+    """
+    Greedy path order from (N, 2) start / end arrays: (order, flip), flip[k] meaning
+    order[k] is entered at its end and run backwards.
+    """
+    if allow_reverse:
+        # Same kernel as order_segments_nearest: candidates 2i / 2i+1 are the start / end of path i.
+        cand = np.empty((2 * len(starts), 2), dtype=np.float64)
+        cand[0::2] = starts
+        cand[1::2] = ends
+        order = np.asarray(_nearest_order(cand[:, 0], cand[:, 1], start_xy, paired=True), dtype=np.int64)
+        return order >> 1, (order & 1).astype(bool)
+
+    # Starts only; the walk continues from the end of each picked path.
+    visited = np.zeros(len(starts), dtype=bool)
+    curx, cury = float(start_xy[0]), float(start_xy[1])
+    order = []
+    for _ in range(len(starts)):
+        dx = starts[:, 0] - curx
+        dy = starts[:, 1] - cury
+        d2 = dx * dx + dy * dy
+        d2[visited] = np.inf
+        i = int(d2.argmin())
+        visited[i] = True
+        order.append(i)
+        curx, cury = float(ends[i, 0]), float(ends[i, 1])
+    return np.asarray(order, dtype=np.int64), np.zeros(len(order), dtype=bool)
+
+
+def _nearest_order_scan(xs, ys, start_xy, paired):
+    n = len(xs)
+    visited = np.zeros(n, dtype=bool)
+    curx, cury = float(start_xy[0]), float(start_xy[1])
+
+    order = []
+    for _ in range(n // 2 if paired else n):
+        dx = xs - curx
+        dy = ys - cury
+        d2 = dx * dx + dy * dy
+        d2[visited] = np.inf
+        i = int(d2.argmin())
+        order.append(i)
+        if paired:
+            visited[i] = visited[i ^ 1] = True
+            i ^= 1
+        else:
+            visited[i] = True
+        curx, cury = float(xs[i]), float(ys[i])
+
+    return order
+
+
+def _nearest_order_scan_py(xs, ys, startx, starty, paired):
+    # Plain-loop form of _nearest_order_scan, compiled with numba when it is installed.
+    # Strict '<' keeps the first index on ties, like argmin; no fastmath so d2 rounds identically.
+    n = xs.shape[0]
+    visited = np.zeros(n, dtype=np.bool_)
+    m = n // 2 if paired else n
+    order = np.empty(m, dtype=np.int64)
+    curx = startx
+    cury = starty
+    for s in range(m):
+        best = -1
+        best_d2 = np.inf
+        for j in range(n):
+            if visited[j]:
+                continue
+            dx = xs[j] - curx
+            dy = ys[j] - cury
+            d2 = dx * dx + dy * dy
+            if best < 0 or d2 < best_d2:
+                best = j
+                best_d2 = d2
+        order[s] = best
+        visited[best] = True
+        if paired:
+            best ^= 1
+            visited[best] = True
+        curx = xs[best]
+        cury = ys[best]
+    return order
+
+
+_nearest_order_scan_jit = numba.njit(cache=True)(_nearest_order_scan_py) if numba is not None else None
+
+
+def _nearest_order_kdtree(xs, ys, start_xy, paired):
+    n = len(xs)
+    pts = np.column_stack((xs, ys))
+    visited = np.zeros(n, dtype=bool)
+    curx, cury = float(start_xy[0]), float(start_xy[1])
+
+    # Tree over the still-alive candidates; rebuilt once half of it is visited.
+    ids = np.arange(n)
+    tree = cKDTree(pts)
+    dead = 0
+
+    order = []
+    for _ in range(n // 2 if paired else n):
+        k = 8
+        while True:
+            kk = min(k, len(ids))
+            dist, local = tree.query((curx, cury), k=kk)
+            dist = np.atleast_1d(dist)
+            local = np.atleast_1d(local)
+            alive = ~visited[ids[local]]
+            if alive.any() or kk == len(ids):
+                break
+            k *= 2
+
+        # Exact tie-break identical to the scan: smallest d2, then lowest index.
+        cand = ids[local[alive]]
+        dx = xs[cand] - curx
+        dy = ys[cand] - cury
+        d2 = dx * dx + dy * dy
+        best_d2 = d2.min()
+        limit = math.sqrt(best_d2) * (1.0 + 1e-9) + 1e-12
+        if kk < len(ids) and dist[-1] <= limit:
+            # Equally-near points may lie beyond the k returned; widen to all of them.
+            near = ids[tree.query_ball_point((curx, cury), limit)]
+            cand = near[~visited[near]]
+            dx = xs[cand] - curx
+            dy = ys[cand] - cury
+            d2 = dx * dx + dy * dy
+            best_d2 = d2.min()
+        i = int(cand[d2 == best_d2].min())
+
+        order.append(i)
+        if paired:
+            visited[i] = visited[i ^ 1] = True
+            dead += 2
+            i ^= 1
+        else:
+            visited[i] = True
+            dead += 1
+        curx, cury = float(xs[i]), float(ys[i])
+
+        if dead * 2 > len(ids) and n - len(order) * (2 if paired else 1) > KDTREE_MIN_POINTS:
+            ids = np.flatnonzero(~visited)
+            tree = cKDTree(pts[ids])
+            dead = 0
+
+    return order
+
+
+def _nearest_order(xs, ys, start_xy, *, paired=False):
+    """
+    Greedy nearest-neighbour visiting order over candidate points; returns candidate indices.
+    paired=True: candidates 2i / 2i+1 are the two ends of item i; entering at one end
+    retires both and continues from the opposite end.
+    """
+    if _nearest_order_scan_jit is not None and (len(xs) < NUMBA_MAX_POINTS or cKDTree is None):
+        xs = np.ascontiguousarray(xs, dtype=np.float64)
+        ys = np.ascontiguousarray(ys, dtype=np.float64)
+        return _nearest_order_scan_jit(xs, ys, float(start_xy[0]), float(start_xy[1]), bool(paired)).tolist()
+    if cKDTree is not None and len(xs) >= KDTREE_MIN_POINTS:
+        return _nearest_order_kdtree(xs, ys, start_xy, paired)
+    return _nearest_order_scan(xs, ys, start_xy, paired)
+
+
+def order_points_nearest_indices(
+    points: List[Tuple[float, float]],
+    start_xy: Tuple[float, float] = (0.0, 0.0),
+) -> List[int]:
+    """
+    Same ordering as order_points_nearest, as indices into points.
+    Lets callers carry per-point data (e.g. diameters) through without a lookup map.
+    """
+    if not points:
+        return []
+
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    return [int(i) for i in _nearest_order(pts[:, 0], pts[:, 1], start_xy)]
+
 
-    while remaining:
-        best_i = 0
-        best_flip = False
-        best_d2 = float("inf")
+def order_points_nearest(
+    points: List[Tuple[float, float]],
+    start_xy: Tuple[float, float] = (0.0, 0.0),
+) -> List[Tuple[float, float]]:
+    """
+    Greedy nearest-neighbour visiting order for drill hits / hole centers.
+    Ties resolve to the earliest input point.
+    """
+    if not points:
+        return []
 
-        for i, ls in enumerate(remaining):
-            coords = list(ls.coords)
-            s = (float(coords[0][0]), float(coords[0][1]))
-            e = (float(coords[-1][0]), float(coords[-1][1]))
+    pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    order = _nearest_order(pts[:, 0], pts[:, 1], start_xy)
+    return [(float(pts[i, 0]), float(pts[i, 1])) for i in order]
 
-            d2s = _dist2(cur, s)
-            if d2s < best_d2:
-                best_d2 = d2s
-                best_i = i
-                best_flip = False
 
-            if allow_reverse:
-                d2e = _dist2(cur, e)
-                if d2e < best_d2:
-                    best_d2 = d2e
-                    best_i = i
-                    best_flip = True
+def order_segments_nearest_indices(segments, start_xy=(0.0, 0.0)) -> List[Tuple[int, bool]]:
+    """
+    Same ordering as order_segments_nearest, as (index into segments, reversed) pairs.
+    Segments with fewer than 2 points are skipped.
+    """
+    idx = [i for i, s in enumerate(segments or []) if s and len(s) >= 2]
+    if not idx:
+        return []
+
+    ends = np.empty((2 * len(idx), 2), dtype=np.float64)
+    for j, i in enumerate(idx):
+        pts = segments[i]
+        ends[2 * j] = (float(pts[0][0]), float(pts[0][1]))
+        ends[2 * j + 1] = (float(pts[-1][0]), float(pts[-1][1]))
 
-        pick = remaining.pop(best_i)
-        if best_flip:
-            pick = LineString(list(pick.coords)[::-1])
+    return [(idx[k >> 1], bool(k & 1)) for k in _nearest_order(ends[:, 0], ends[:, 1], start_xy, paired=True)]
 
-        ordered.append(pick)
-        end = list(pick.coords)[-1]
-        cur = (float(end[0]), float(end[1]))
 
-    return ordered
+def order_segments_nearest(segments, start_xy=(0.0, 0.0)):
+    """
+    Order polylines by nearest endpoint, reversing them when entering from the end.
+    segments: [ [(x,y), (x,y), ...], ... ]  (each must have len>=2)
+    """
+    out = []
+    for i, flipped in order_segments_nearest_indices(segments, start_xy):
+        pts = list(segments[i])
+        out.append(pts[::-1] if flipped else pts)
+    return out
 
 
 def _default_cleanup_params():
@@ -206,17 +437,60 @@ def geom_to_ordered_lines(geom, *, start_xy=(0.0, 0.0)) -> List[LineString]:
     return lines
 
 
-def _write_line_as_gcode(o, ls: LineString, *, depth: float, bit: Dict[str, Any], ramp_len: float):
-    coords = list(ls.coords)
-    if len(coords) < 2:
+def geom_to_polyline_arrays(geom, *, start_xy=(0.0, 0.0)) -> List[np.ndarray]:
+    """
+    Same paths as geom_to_ordered_lines, as (M, 2) float arrays.
+    Coordinates are read from shapely in one call; reversed paths are array views,
+    so no LineString is rebuilt for rings or flipped paths.
+    """
+    simplify_tol, min_area, min_length = _default_cleanup_params()
+    cleaned = cleanup_geometry(geom, simplify_tol=simplify_tol, min_area=min_area, min_length=min_length)
+
+    parts = []
+    for g in _iter_geoms(cleaned):
+        if isinstance(g, Polygon):
+            if g.exterior is not None:
+                parts.append(g.exterior)
+            parts.extend(g.interiors)
+        else:
+            parts.append(g)
+    if not parts:
+        return []
+
+    # Paths under 2 coordinates produce no G-code; dropped here as order_lines_nearest does.
+    counts = shapely.get_num_coordinates(parts)
+    coords = shapely.get_coordinates(parts)
+    stops = np.cumsum(counts)
+    keep = np.flatnonzero(counts >= 2)
+    paths = [coords[a:b] for a, b in zip((stops - counts)[keep].tolist(), stops[keep].tolist())]
+    if not paths or not _default_ordering_enabled():
+        return paths
+
+    starts = coords[(stops - counts)[keep]]
+    ends = coords[stops[keep] - 1]
+    order, flip = _order_paths(starts, ends, start_xy, True)
+    return [paths[i][::-1] if f else paths[i] for i, f in zip(order.tolist(), flip.tolist())]
+
+
+def _line_gcode(buf: List[str], flat: List[float], *, depth: float, bit: Dict[str, Any], ramp_len: float, safe_z: float):
+    """
+    Append the G-code for one path, given as flat [x0, y0, x1, y1, ...], to buf (caller joins and writes).
+    Straight runs are formatted with one repeated template and a single % call.
+    """
+    n = len(flat) >> 1
+    if n < 2:
         return
 
     feed_xy = bit["feed_xy"]
     feed_z = bit["feed_z"]
+    append = buf.append
 
-    x0, y0 = coords[0]
-    o.write(f"G0 Z{get_safe_z():.3f}\n")
-    o.write(f"G0 X{x0:.4f} Y{y0:.4f}\n")
+    # Feed (and Z, where constant) baked into the templates once per path.
+    g1xy = "G1 X%%.4f Y%%.4f F%s\n" % (feed_xy,)
+    safe = _G0Z % safe_z
+
+    append(safe)
+    append(_G0XY % (flat[0], flat[1]))
 
     ramp_len = float(ramp_len or 0.0)
     if ramp_len > 0:
@@ -224,9 +498,9 @@ def _write_line_as_gcode(o, ls: LineString, *, depth: float, bit: Dict[str, Any]
         ramp_pt = None
         seg_end_index = 1
 
-        p0 = coords[0]
-        for i in range(1, len(coords)):
-            p1 = coords[i]
+        p0 = (flat[0], flat[1])
+        for i in range(1, n):
+            p1 = (flat[2 * i], flat[2 * i + 1])
             seg_len = math.hypot(p1[0] - p0[0], p1[1] - p0[1])
             if seg_len <= 1e-12:
                 p0 = p1
@@ -242,33 +516,38 @@ def _write_line_as_gcode(o, ls: LineString, *, depth: float, bit: Dict[str, Any]
             p0 = p1
 
         if ramp_pt is None:
-            ramp_pt = coords[1]
+            ramp_pt = (flat[2], flat[3])
             seg_end_index = 1
 
-        o.write(f"G1 X{ramp_pt[0]:.4f} Y{ramp_pt[1]:.4f} Z{-depth:.4f} F{feed_xy}\n")
-
-        end_seg = coords[seg_end_index]
-        if abs(end_seg[0] - ramp_pt[0]) > 1e-9 or abs(end_seg[1] - ramp_pt[1]) > 1e-9:
-            o.write(f"G1 X{end_seg[0]:.4f} Y{end_seg[1]:.4f} F{feed_xy}\n")
+        append(_G1XYZ % (ramp_pt[0], ramp_pt[1], -depth, feed_xy))
 
-        for p in coords[seg_end_index + 1 :]:
-            o.write(f"G1 X{p[0]:.4f} Y{p[1]:.4f} F{feed_xy}\n")
+        ex = flat[2 * seg_end_index]
+        ey = flat[2 * seg_end_index + 1]
+        if abs(ex - ramp_pt[0]) > 1e-9 or abs(ey - ramp_pt[1]) > 1e-9:
+            append(g1xy % (ex, ey))
 
+        k = seg_end_index + 1
     else:
-        o.write(f"G1 Z{-depth:.4f} F{feed_z}\n")
-        for x, y in coords[1:]:
-            o.write(f"G1 X{x:.4f} Y{y:.4f} F{feed_xy}\n")
+        append(_G1Z % (-depth, feed_z))
+        k = 1
 
-    o.write(f"G0 Z{get_safe_z():.3f}\n")
+    append((g1xy * (n - k)) % tuple(flat[2 * k :]))
+
+    append(safe)
 
 
 def write_geom_paths(o, geom, depth, bit):
     if geom is None or geom.is_empty:
         return
 
-    ramp_len = _default_ramp_len(bit)
+    ramp_len = float(_default_ramp_len(bit))
     start_xy = get_park_xy()
-    lines = geom_to_ordered_lines(geom, start_xy=start_xy)
-
-    for ls in lines:
-        _write_line_as_gcode(o, ls, depth=float(depth), bit=bit, ramp_len=float(ramp_len))
+    paths = geom_to_polyline_arrays(geom, start_xy=start_xy)
+
+    # All paths go out in one write; safe Z is read once for the whole batch.
+    safe_z = get_safe_z()
+    depth = float(depth)
+    buf: List[str] = []
+    for xy in paths:
+        _line_gcode(buf, xy.ravel().tolist(), depth=depth, bit=bit, ramp_len=ramp_len, safe_z=safe_z)
+    o.write("".join(buf))
@@ -6,9 +6,12 @@
 import os
 import re
 import logging
+import functools
 from dataclasses import dataclass
-from typing import Dict, Tuple, List, Optional, Any
+from typing import Dict, Tuple, List, Optional, Any, Iterator
 
+import numpy as np
+import shapely
 from shapely.geometry import (
     Point,
     LineString,
@@ -56,6 +59,17 @@ _ADD_MACRO_RE = re.compile(
     r"%ADD(\d+)([A-Za-z][A-Za-z0-9_]*)\s*,?\s*([0-9\.\+\-]+)(?:X([0-9\.\+\-]+))?(?:X([0-9\.\+\-]+))?.*\*%?"
 )
 
+_DCODE_RE = re.compile(r"D(\d+)\*")
+_X_RE = re.compile(r"X(-?[\d\.]+)")
+_Y_RE = re.compile(r"Y(-?[\d\.]+)")
+# Both coordinates in one search; only used when nothing precedes the match (see the main loop).
+_XY_RE = re.compile(r"X(-?[\d\.]+)Y(-?[\d\.]+)")
+
+_LINE_RE = re.compile(
+    r"(?:(?P<xy>X(?P<x>-?[\d\.]+)Y(?P<y>-?[\d\.]+)D0[123])"
+    r"|(?P<dsel>D(?P<dn>\d+)))\*"
+)
+
 _AM_START_RE = re.compile(r"%AM([A-Za-z][A-Za-z0-9_]*)\*")
 _AM_END_RE = re.compile(r"\*%\s*$")
 
@@ -75,47 +89,28 @@ def _parse_fs_full(line: str):
     return m.group(1), m.group(2), int(m.group(3)), int(m.group(4)), int(m.group(5)), int(m.group(6))
 
 
-def _parse_macro_defs(lines: List[str]) -> Dict[str, Dict[str, Any]]:
-    macros: Dict[str, Dict[str, Any]] = {}
-
-    i = 0
-    while i < len(lines):
-        l = lines[i].strip()
-        m = _AM_START_RE.match(l)
-        if not m:
-            i += 1
-            continue
-
-        name = m.group(1)
-        body_parts = [l]
-
-        if not _AM_END_RE.search(l):
-            j = i + 1
-            while j < len(lines):
-                body_parts.append(lines[j].strip())
-                if _AM_END_RE.search(lines[j]):
-                    break
-                j += 1
-            i = j
-
-        body = "".join(body_parts)
+def _macro_def(body_parts: List[str]) -> Optional[Dict[str, Any]]:
+    """Macro entry for one %AM block (its stripped lines), or None if the macro is not supported."""
+    body = "".join(body_parts)
 
-        try:
-            inside = body.split("*", 1)[1]
-            inside = inside.rsplit("*%", 1)[0]
-        except Exception:
-            inside = ""
+    try:
+        inside = body.split("*", 1)[1]
+        inside = inside.rsplit("*%", 1)[0]
+    except Exception:
+        inside = ""
 
-        inside = inside.strip()
+    inside = inside.strip()
 
-        # Tiny macro support used by some CAD exports:
-        # center rectangle primitive: "21,1,$1,$2,..."
-        if inside.startswith("21,") and "$1" in inside and "$2" in inside:
-            macros[name] = {"type": "center_rect_21"}
+    # Tiny macro support used by some CAD exports:
+    # center rectangle primitive: "21,1,$1,$2,..."
+    if inside.startswith("21,") and "$1" in inside and "$2" in inside:
+        return {"type": "center_rect_21"}
+    return None
 
-        i += 1
 
-    return macros
+def _iter_lines(fn: str) -> Iterator[str]:
+    with open(fn, "r", errors="ignore") as f:
+        yield from f
 
 
 def _parse_rs274x_coord(tok: str, *, int_d: int, dec_d: int, zero_mode: str) -> float:
@@ -126,35 +121,37 @@ def _parse_rs274x_coord(tok: str, *, int_d: int, dec_d: int, zero_mode: str) ->
     if not tok:
         return 0.0
 
-    if "." in tok:
-        return float(tok)
+    return _rs274x_coord_parser(int_d, dec_d, zero_mode)(tok)
 
-    neg = tok.startswith("-")
-    tok_digits = tok[1:] if neg else tok
 
+def _rs274x_coord_parser(int_d: int, dec_d: int, zero_mode: str):
+    """
+    _parse_rs274x_coord with the format bound once, for non-empty stripped tokens.
+    The main loop rebuilds it only when an FS line changes the format.
+    """
     total = int_d + dec_d
-    if total <= 0:
-        total = max(1, len(tok_digits))
+    leading = zero_mode.upper() == "L"
+    # int / int true division is correctly rounded: the same float as float("<ip>.<fp>").
+    div = 10**dec_d if dec_d > 0 else 0
 
-    if len(tok_digits) > total:
-        tok_digits = tok_digits[-total:]
+    def parse(tok: str) -> float:
+        if "." in tok:
+            return float(tok)
 
-    if len(tok_digits) < total:
-        if zero_mode.upper() == "L":
-            tok_digits = tok_digits.rjust(total, "0")
-        else:
-            tok_digits = tok_digits.ljust(total, "0")
+        neg = tok[0] == "-"
+        digits = tok[1:] if neg else tok
 
-    if dec_d <= 0:
-        val = float(int(tok_digits))
-    else:
-        ip = tok_digits[:int_d] if int_d > 0 else "0"
-        fp = tok_digits[int_d:] if int_d > 0 else tok_digits
-        if ip == "":
-            ip = "0"
-        val = float(f"{int(ip)}.{fp}")
+        n = total if total > 0 else max(1, len(digits))
+        if len(digits) > n:
+            digits = digits[-n:]
+        elif len(digits) < n and not leading:
+            # Leading-zero padding doesn't change the integer; trailing padding scales it.
+            digits = digits.ljust(n, "0")
 
-    return -val if neg else val
+        val = int(digits) / div if div else float(int(digits))
+        return -val if neg else val
+
+    return parse
 
 
 @dataclass
@@ -162,8 +159,12 @@ class GerberFull:
     aps: Dict[int, Any]
     macros: Dict[str, Dict[str, Any]]
 
-    flashes: List[Tuple[int, float, float]]
-    tracks: List[Tuple[int, Tuple[float, float], Tuple[float, float]]]
+    # Flashes and draws as parallel arrays: aperture ids (int64) and (N, 2) float coordinates.
+    flash_ap: np.ndarray
+    flash_xy: np.ndarray
+    track_ap: np.ndarray
+    track_p1: np.ndarray
+    track_p2: np.ndarray
 
     dark_geoms: List[Any]
     clear_geoms: List[Any]
@@ -174,6 +175,27 @@ class GerberFull:
     fs_x: Tuple[int, int]
     fs_y: Tuple[int, int]
 
+    @functools.cached_property
+    def flashes(self) -> List[Tuple[int, float, float]]:
+        """[(ap_id, x, y)] view of the flash arrays."""
+        return [(a, x, y) for a, (x, y) in zip(self.flash_ap.tolist(), self.flash_xy.tolist())]
+
+    @functools.cached_property
+    def tracks(self) -> List[Tuple[int, Tuple[float, float], Tuple[float, float]]]:
+        """[(ap_id, (x1, y1), (x2, y2))] view of the draw arrays."""
+        return list(
+            zip(
+                self.track_ap.tolist(),
+                map(tuple, self.track_p1.tolist()),
+                map(tuple, self.track_p2.tolist()),
+            )
+        )
+
+    @functools.cached_property
+    def composed(self):
+        """Dark minus clear, unioned once per parse and shared by the copper/pads/tracks loaders."""
+        return _compose_dark_clear(self.dark_geoms, self.clear_geoms)
+
 
 def pad_from_ap(ap_def, x: float, y: float, macros: Dict[str, Dict[str, Any]]):
     if not ap_def:
@@ -231,24 +253,109 @@ def pad_from_ap(ap_def, x: float, y: float, macros: Dict[str, Dict[str, Any]]):
     return None
 
 
+def _pads_from_aps(items, macros: Dict[str, Dict[str, Any]]) -> List[Any]:
+    """
+    pad_from_ap over [(ap_def, x, y)], aligned with items (None where there is no pad).
+    Circles and rectangles, nearly all pads, are built in one vectorised call per shape.
+    """
+    out: List[Any] = [None] * len(items)
+    circ = []
+    rect = []
+    for i, (ap_def, x, y) in enumerate(items):
+        if not ap_def:
+            continue
+        if ap_def[0] == "C":
+            circ.append(i)
+        elif ap_def[0] == "R":
+            rect.append(i)
+        else:
+            out[i] = pad_from_ap(ap_def, x, y, macros)
+
+    # quad_segs=16 is what the .buffer() method uses; shapely.buffer itself defaults to 8.
+    if circ:
+        xs = np.array([items[i][1] for i in circ], dtype=np.float64)
+        ys = np.array([items[i][2] for i in circ], dtype=np.float64)
+        r = np.array([float(items[i][0][1]) for i in circ], dtype=np.float64) / 2.0
+        for i, g in zip(circ, shapely.buffer(shapely.points(xs, ys), r, quad_segs=16).tolist()):
+            out[i] = g
+
+    if rect:
+        xs = np.array([items[i][1] for i in rect], dtype=np.float64)
+        ys = np.array([items[i][2] for i in rect], dtype=np.float64)
+        ha = np.array([float(items[i][0][1]) for i in rect], dtype=np.float64) / 2.0
+        hb = np.array([float(items[i][0][2]) for i in rect], dtype=np.float64) / 2.0
+        ring = np.empty((len(rect), 4, 2), dtype=np.float64)
+        ring[:, 0, 0] = xs - ha
+        ring[:, 0, 1] = ys - hb
+        ring[:, 1, 0] = xs + ha
+        ring[:, 1, 1] = ys - hb
+        ring[:, 2, 0] = xs + ha
+        ring[:, 2, 1] = ys + hb
+        ring[:, 3, 0] = xs - ha
+        ring[:, 3, 1] = ys + hb
+        for i, g in zip(rect, shapely.polygons(ring).tolist()):
+            out[i] = g
+
+    return out
+
+
+def _buffered_segments(p1, p2, r) -> List[Any]:
+    """LineString([p1[i], p2[i]]).buffer(r[i]) for (N, 2) / (N,) arrays, in one vectorised call."""
+    if not len(r):
+        return []
+    pts = np.stack([p1, p2], axis=1)
+    return shapely.buffer(shapely.linestrings(pts), r, quad_segs=16).tolist()
+
+
+def _region_polygons(contours) -> List[Any]:
+    """
+    Polygon(pts) of each closed contour, keeping the non-empty, valid ones with area.
+    Built and checked in vectorised calls; raises if GEOS rejects any ring.
+    """
+    if not contours:
+        return []
+    coords = np.array([p for pts in contours for p in pts], dtype=np.float64)
+    ids = np.repeat(np.arange(len(contours)), [len(pts) for pts in contours])
+    polys = shapely.polygons(shapely.linearrings(coords, indices=ids))
+    keep = ~shapely.is_empty(polys) & shapely.is_valid(polys) & (shapely.area(polys) > 0)
+    return polys[keep].tolist()
+
+
+def _xy_array(pts) -> np.ndarray:
+    return np.array(pts, dtype=np.float64).reshape(-1, 2)
+
+
 def parse_gerber_full(fn: str, *, strict: bool = False, logger: Optional[logging.Logger] = None) -> GerberFull:
     lg = _get_logger(logger)
 
     if not fn or not os.path.exists(fn):
         raise FileNotFoundError(fn)
 
-    with open(fn, "r", errors="ignore") as f:
-        lines = [ln.rstrip("\n") for ln in f]
-
-    macros = _parse_macro_defs(lines)
+    # Streamed in one pass: %AM blocks are collected as they are met, so an AD must come
+    # after its macro (as the format requires) for the undefined-macro check to pass.
+    macros: Dict[str, Dict[str, Any]] = {}
+    am_name: Optional[str] = None
+    am_parts: List[str] = []
 
     aps: Dict[int, Any] = {}
-    flashes: List[Tuple[int, float, float]] = []
-    tracks: List[Tuple[int, Tuple[float, float], Tuple[float, float]]] = []
+    flash_ap: List[int] = []
+    flash_xy: List[Tuple[float, float]] = []
+    track_ap: List[int] = []
+    track_p1: List[Tuple[float, float]] = []
+    track_p2: List[Tuple[float, float]] = []
 
     dark_geoms: List[Any] = []
     clear_geoms: List[Any] = []
 
+    # Pad and draw geometry is built in batches after the loop; each gets a slot in
+    # dark_geoms/clear_geoms now so the list order stays the file order.
+    pad_items = []
+    pad_slots = []
+    seg_p1 = []
+    seg_p2 = []
+    seg_r = []
+    seg_slots = []
+
     cur: Optional[int] = None
     prev: Optional[Tuple[float, float]] = None
 
@@ -261,6 +368,8 @@ def parse_gerber_full(fn: str, *, strict: bool = False, logger: Optional[logging
     x_int, x_dec = 3, 6
     y_int, y_dec = 3, 6
     saw_fs = False
+    parse_x = _rs274x_coord_parser(x_int, x_dec, fs_zero_mode)
+    parse_y = _rs274x_coord_parser(y_int, y_dec, fs_zero_mode)
 
     polarity = "D"  # D=dark, C=clear
 
@@ -270,122 +379,170 @@ def parse_gerber_full(fn: str, *, strict: bool = False, logger: Optional[logging
 
     line_no = 0
 
-    for raw in lines:
+    for raw in _iter_lines(fn):
         line_no += 1
         l = raw.strip()
+
+        # Macro body lines still run through the checks below, as they always have.
+        if am_parts:
+            am_parts.append(l)
+            if _AM_END_RE.search(raw):
+                mdef = _macro_def(am_parts)
+                if mdef is not None:
+                    macros[am_name] = mdef
+                am_parts = []
+        elif l.startswith("%AM"):
+            am = _AM_START_RE.match(l)
+            if am:
+                if _AM_END_RE.search(l):
+                    mdef = _macro_def([l])
+                    if mdef is not None:
+                        macros[am.group(1)] = mdef
+                else:
+                    am_name, am_parts = am.group(1), [l]
+
         if not l:
             continue
 
         if l.startswith("G04") or l.startswith(";"):
             continue
 
-        u = _parse_units(l)
-        if u:
-            units = u
-            unit_scale = 25.4 if units == "inch" else 1.0
-            saw_units = True
+        # Plain coordinate and aperture-select lines (the bulk of a file) are recognised by one
+        # anchored match; none of the header/polarity/region checks below can hit such a line.
+        m = _LINE_RE.fullmatch(l)
+        if m is not None and m.lastgroup == "dsel":
+            cur = int(m.group("dn"))
             continue
+        if m is not None:
+            x_tok, y_tok = m.group("x", "y")
+        else:
+            u = _parse_units(l)
+            if u:
+                units = u
+                unit_scale = 25.4 if units == "inch" else 1.0
+                saw_units = True
+                continue
 
-        fs = _parse_fs_full(l)
-        if fs:
-            fs_zero_mode, fs_coord_mode, x_int, x_dec, y_int, y_dec = fs
-            saw_fs = True
-            continue
+            fs = _parse_fs_full(l)
+            if fs:
+                fs_zero_mode, fs_coord_mode, x_int, x_dec, y_int, y_dec = fs
+                parse_x = _rs274x_coord_parser(x_int, x_dec, fs_zero_mode)
+                parse_y = _rs274x_coord_parser(y_int, y_dec, fs_zero_mode)
+                saw_fs = True
+                continue
 
-        if _LP_DARK_RE.search(l):
-            polarity = "D"
-            continue
-        if _LP_CLEAR_RE.search(l):
-            polarity = "C"
-            continue
+            if _LP_DARK_RE.search(l):
+                polarity = "D"
+                continue
+            if _LP_CLEAR_RE.search(l):
+                polarity = "C"
+                continue
 
-        if l.startswith("G36"):
-            in_region = True
-            region_contours = []
-            region_current = None
-            prev = None
-            continue
+            if l.startswith("G36"):
+                in_region = True
+                region_contours = []
+                region_current = None
+                prev = None
+                continue
 
-        if l.startswith("G37"):
-            if region_current and len(region_current) >= 3:
-                region_contours.append(region_current)
+            if l.startswith("G37"):
+                if region_current and len(region_current) >= 3:
+                    region_contours.append(region_current)
+
+                contours = []
+                for pts in region_contours:
+                    if len(pts) < 3:
+                        continue
+                    if pts[0] != pts[-1]:
+                        pts = pts + [pts[0]]
+                    contours.append(pts)
 
-            polys = []
-            for pts in region_contours:
-                if len(pts) < 3:
-                    continue
-                if pts[0] != pts[-1]:
-                    pts = pts + [pts[0]]
                 try:
-                    poly = Polygon(pts)
-                    if not poly.is_empty and poly.is_valid and poly.area > 0:
-                        polys.append(poly)
+                    polys = _region_polygons(contours)
                 except Exception:
-                    _warn(lg, f"{os.path.basename(fn)}:{line_no}: failed building region polygon.", strict=strict)
-
-            if polys:
-                rg = unary_union(polys)
-                if polarity == "D":
-                    dark_geoms.append(rg)
-                else:
-                    clear_geoms.append(rg)
-
-            in_region = False
-            region_contours = []
-            region_current = None
-            prev = None
-            continue
+                    # Some ring was rejected: redo one by one so each failure gets its warning.
+                    polys = []
+                    for pts in contours:
+                        try:
+                            poly = Polygon(pts)
+                            if not poly.is_empty and poly.is_valid and poly.area > 0:
+                                polys.append(poly)
+                        except Exception:
+                            _warn(lg, f"{os.path.basename(fn)}:{line_no}: failed building region polygon.", strict=strict)
+
+                if polys:
+                    rg = unary_union(polys)
+                    if polarity == "D":
+                        dark_geoms.append(rg)
+                    else:
+                        clear_geoms.append(rg)
+
+                in_region = False
+                region_contours = []
+                region_current = None
+                prev = None
+                continue
 
-        m = _ADD_STD_RE.match(l)
-        if m:
-            ap_id = int(m.group(1))
-            shape = m.group(2)
-            try:
-                a = float(m.group(3)) * unit_scale
-                b = float(m.group(4) if m.group(4) is not None else m.group(3)) * unit_scale
-            except Exception:
-                _warn(lg, f"{os.path.basename(fn)}:{line_no}: invalid ADD params: {l}", strict=strict)
+            m = _ADD_STD_RE.match(l)
+            if m:
+                ap_id = int(m.group(1))
+                shape = m.group(2)
+                try:
+                    a = float(m.group(3)) * unit_scale
+                    b = float(m.group(4) if m.group(4) is not None else m.group(3)) * unit_scale
+                except Exception:
+                    _warn(lg, f"{os.path.basename(fn)}:{line_no}: invalid ADD params: {l}", strict=strict)
+                    continue
+                aps[ap_id] = (shape, a, b)
                 continue
-            aps[ap_id] = (shape, a, b)
-            continue
 
-        m = _ADD_MACRO_RE.match(l)
-        if m:
-            ap_id = int(m.group(1))
-            name = m.group(2)
-            try:
-                p1 = float(m.group(3)) * unit_scale
-                p2 = float(m.group(4)) * unit_scale if m.group(4) is not None else None
-                p3 = float(m.group(5)) if m.group(5) is not None else None
-            except Exception:
-                _warn(lg, f"{os.path.basename(fn)}:{line_no}: invalid macro ADD params: {l}", strict=strict)
+            m = _ADD_MACRO_RE.match(l)
+            if m:
+                ap_id = int(m.group(1))
+                name = m.group(2)
+                try:
+                    p1 = float(m.group(3)) * unit_scale
+                    p2 = float(m.group(4)) * unit_scale if m.group(4) is not None else None
+                    p3 = float(m.group(5)) if m.group(5) is not None else None
+                except Exception:
+                    _warn(lg, f"{os.path.basename(fn)}:{line_no}: invalid macro ADD params: {l}", strict=strict)
+                    continue
+                params = [p for p in (p1, p2, p3) if p is not None]
+                aps[ap_id] = ("MACRO", name, params)
+                if name not in macros:
+                    _warn(
+                        lg,
+                        f"{os.path.basename(fn)}:{line_no}: macro aperture uses undefined macro '{name}' (aperture D{ap_id}).",
+                        strict=strict,
+                    )
                 continue
-            params = [p for p in (p1, p2, p3) if p is not None]
-            aps[ap_id] = ("MACRO", name, params)
-            if name not in macros:
-                _warn(
-                    lg,
-                    f"{os.path.basename(fn)}:{line_no}: macro aperture uses undefined macro '{name}' (aperture D{ap_id}).",
-                    strict=strict,
-                )
-            continue
 
-        mm = re.fullmatch(r"D(\d+)\*", l)
-        if mm:
-            try:
-                cur = int(mm.group(1))
-            except Exception:
-                cur = None
-            continue
+            mm = _DCODE_RE.fullmatch(l)
+            if mm:
+                try:
+                    cur = int(mm.group(1))
+                except Exception:
+                    cur = None
+                continue
 
-        xm = re.search(r"X(-?[\d\.]+)", l)
-        ym = re.search(r"Y(-?[\d\.]+)", l)
-        if not xm or not ym:
-            continue
+            # The fused match gives the same tokens as the two separate searches as long as no
+            # X or Y comes before it on the line; otherwise fall back to searching each axis.
+            xym = _XY_RE.search(l)
+            if xym is not None and ("X" in l[: xym.start()] or "Y" in l[: xym.start()]):
+                xym = None
+            if xym is not None:
+                x_tok, y_tok = xym.groups()
+            else:
+                xm = _X_RE.search(l)
+                ym = _Y_RE.search(l)
+                if not xm or not ym:
+                    continue
+                x_tok = xm.group(1)
+                y_tok = ym.group(1)
 
         try:
-            x = _parse_rs274x_coord(xm.group(1), int_d=x_int, dec_d=x_dec, zero_mode=fs_zero_mode) * unit_scale
-            y = _parse_rs274x_coord(ym.group(1), int_d=y_int, dec_d=y_dec, zero_mode=fs_zero_mode) * unit_scale
+            x = parse_x(x_tok) * unit_scale
+            y = parse_y(y_tok) * unit_scale
         except Exception:
             _warn(lg, f"{os.path.basename(fn)}:{line_no}: invalid coordinate line: {l}", strict=strict)
             continue
@@ -416,32 +573,56 @@ def parse_gerber_full(fn: str, *, strict: bool = False, logger: Optional[logging
         if l.endswith("D03*") and cur is not None:
             if cur not in aps:
                 _warn(lg, f"{os.path.basename(fn)}:{line_no}: flash uses undefined aperture D{cur}.", strict=strict)
-            flashes.append((cur, x, y))
+            flash_ap.append(cur)
+            flash_xy.append((x, y))
             ap_def = aps.get(int(cur))
-            g = pad_from_ap(ap_def, x, y, macros) if ap_def else None
-            if g is not None and not g.is_empty:
-                (dark_geoms if polarity == "D" else clear_geoms).append(g)
+            if ap_def:
+                target = dark_geoms if polarity == "D" else clear_geoms
+                pad_items.append((ap_def, x, y))
+                pad_slots.append((target, len(target)))
+                target.append(None)
             prev = (x, y)
 
         elif l.endswith("D01*") and prev is not None and cur is not None:
             if cur not in aps:
                 _warn(lg, f"{os.path.basename(fn)}:{line_no}: draw uses undefined aperture D{cur}.", strict=strict)
-            tracks.append((cur, prev, (x, y)))
+            track_ap.append(cur)
+            track_p1.append(prev)
+            track_p2.append((x, y))
 
             ap_def = aps.get(int(cur))
             if ap_def and ap_def[0] != "MACRO":
                 shape, a, b = ap_def
                 width = float(a) if shape == "C" else min(float(a), float(b))
                 if width > 0:
-                    gg = LineString([prev, (x, y)]).buffer(width / 2.0)
-                    if gg is not None and not gg.is_empty:
-                        (dark_geoms if polarity == "D" else clear_geoms).append(gg)
+                    target = dark_geoms if polarity == "D" else clear_geoms
+                    seg_p1.append(prev)
+                    seg_p2.append((x, y))
+                    seg_r.append(width / 2.0)
+                    seg_slots.append((target, len(target)))
+                    target.append(None)
 
             prev = (x, y)
 
         elif l.endswith("D02*"):
             prev = (x, y)
 
+    # A %AM block still open at end of file counts up to its last line.
+    if am_parts:
+        mdef = _macro_def(am_parts)
+        if mdef is not None:
+            macros[am_name] = mdef
+
+    if pad_items or seg_r:
+        for slots, geoms in (
+            (pad_slots, _pads_from_aps(pad_items, macros)),
+            (seg_slots, _buffered_segments(_xy_array(seg_p1), _xy_array(seg_p2), np.array(seg_r, dtype=np.float64))),
+        ):
+            for (target, i), g in zip(slots, geoms):
+                target[i] = g
+        dark_geoms = [g for g in dark_geoms if g is not None and not g.is_empty]
+        clear_geoms = [g for g in clear_geoms if g is not None and not g.is_empty]
+
     if not saw_units:
         _warn(lg, f"{os.path.basename(fn)}: no explicit units (MOMM/MOIN) found; defaulted to mm.", strict=False)
     if not saw_fs:
@@ -450,14 +631,13 @@ def parse_gerber_full(fn: str, *, strict: bool = False, logger: Optional[logging
         _warn(lg, f"{os.path.basename(fn)}: no aperture definitions found.", strict=False)
 
     try:
-        allg = []
-        if dark_geoms:
-            allg.append(unary_union(dark_geoms))
-        if clear_geoms:
-            allg.append(unary_union(clear_geoms))
-        if allg:
-            bb = unary_union(allg).bounds
-            minx, miny, maxx, maxy = bb
+        # Extents of the union without building it: the envelope of the parts with area
+        # (a polygonal union keeps every extreme vertex and drops zero-area parts).
+        allg = dark_geoms + clear_geoms
+        bb = shapely.bounds(allg)[shapely.area(allg) > 0] if allg else None
+        if bb is not None and len(bb):
+            minx, miny = bb[:, :2].min(axis=0).tolist()
+            maxx, maxy = bb[:, 2:].max(axis=0).tolist()
             w = maxx - minx
             h = maxy - miny
             if (w > _MAX_REASONABLE_MM) or (h > _MAX_REASONABLE_MM):
@@ -477,7 +657,7 @@ def parse_gerber_full(fn: str, *, strict: bool = False, logger: Optional[logging
 
     _debug(
         lg,
-        f"Parsed {os.path.basename(fn)}: aps={len(aps)} flashes={len(flashes)} tracks={len(tracks)} "
+        f"Parsed {os.path.basename(fn)}: aps={len(aps)} flashes={len(flash_ap)} tracks={len(track_ap)} "
         f"dark={len(dark_geoms)} clear={len(clear_geoms)} units={units} FS={fs_zero_mode}{fs_coord_mode} "
         f"X{x_int}.{x_dec} Y{y_int}.{y_dec}",
     )
@@ -485,8 +665,11 @@ def parse_gerber_full(fn: str, *, strict: bool = False, logger: Optional[logging
     return GerberFull(
         aps=aps,
         macros=macros,
-        flashes=flashes,
-        tracks=tracks,
+        flash_ap=np.array(flash_ap, dtype=np.int64),
+        flash_xy=_xy_array(flash_xy),
+        track_ap=np.array(track_ap, dtype=np.int64),
+        track_p1=_xy_array(track_p1),
+        track_p2=_xy_array(track_p2),
         dark_geoms=dark_geoms,
         clear_geoms=clear_geoms,
         units=units,
@@ -513,48 +696,102 @@ def _compose_dark_clear(dark_geoms: List[Any], clear_geoms: List[Any]):
         return dark_u
 
 
-def load_copper(fn: str, *, strict: bool = False, logger: Optional[logging.Logger] = None):
-    gf = parse_gerber_full(fn, strict=strict, logger=logger)
-    return _compose_dark_clear(gf.dark_geoms, gf.clear_geoms)
+def _copper_from(gf: GerberFull):
+    return gf.composed
 
 
-def load_pads(fn: str, *, strict: bool = False, logger: Optional[logging.Logger] = None):
-    gf = parse_gerber_full(fn, strict=strict, logger=logger)
-
-    pads_u = []
-    for ap_id, x, y in gf.flashes:
-        ap_def = gf.aps.get(int(ap_id))
-        g = pad_from_ap(ap_def, x, y, gf.macros) if ap_def else None
-        if g is not None and not g.is_empty:
-            pads_u.append(g)
+def _pads_from(gf: GerberFull):
+    aps = gf.aps
+    items = [(aps.get(a), x, y) for a, (x, y) in zip(gf.flash_ap.tolist(), gf.flash_xy.tolist())]
+    pads_u = [g for g in _pads_from_aps(items, gf.macros) if g is not None and not g.is_empty]
     pads_u = unary_union(pads_u) if pads_u else unary_union([])
 
-    composed = _compose_dark_clear(gf.dark_geoms, gf.clear_geoms)
     try:
-        return composed.intersection(pads_u)
+        return gf.composed.intersection(pads_u)
     except Exception:
         return pads_u
 
 
-def load_tracks(fn: str, *, strict: bool = False, logger: Optional[logging.Logger] = None):
-    gf = parse_gerber_full(fn, strict=strict, logger=logger)
-
-    track_geoms = []
-    for ap_id, p1, p2 in gf.tracks:
-        ap_def = gf.aps.get(int(ap_id))
-        if not ap_def or ap_def[0] == "MACRO":
-            continue
-        shape, a, b = ap_def
-        width = float(a) if shape == "C" else min(float(a), float(b))
-        if width <= 0:
-            continue
-        g = LineString([p1, p2]).buffer(width / 2.0)
-        if g is not None and not g.is_empty:
-            track_geoms.append(g)
+def _tracks_from(gf: GerberFull):
+    # Buffer radius per aperture, looked up once per id; 0 = no geometry (macro/undefined/zero width).
+    radius = {}
+    for ap_id in set(gf.track_ap.tolist()):
+        ap_def = gf.aps.get(ap_id)
+        r = 0.0
+        if ap_def and ap_def[0] != "MACRO":
+            shape, a, b = ap_def
+            width = float(a) if shape == "C" else min(float(a), float(b))
+            if width > 0:
+                r = width / 2.0
+        radius[ap_id] = r
+
+    r = np.array([radius[a] for a in gf.track_ap.tolist()], dtype=np.float64)
+    keep = r > 0
+    segs = _buffered_segments(gf.track_p1[keep], gf.track_p2[keep], r[keep])
+    track_geoms = [g for g in segs if g is not None and not g.is_empty]
 
     tracks_u = unary_union(track_geoms) if track_geoms else unary_union([])
-    composed = _compose_dark_clear(gf.dark_geoms, gf.clear_geoms)
     try:
-        return composed.intersection(tracks_u)
+        return gf.composed.intersection(tracks_u)
     except Exception:
         return tracks_u
+
+
+_LOADERS = {"copper": _copper_from, "pads": _pads_from, "tracks": _tracks_from}
+
+
+# ---- Parse cache ----
+# The ops (copper/drill/outline/mask) and the preview each load the same layers.
+# Results are keyed by (abspath, mtime_ns, size) so an edited/re-exported file reparses.
+# Shapely geometries are immutable; the cached GerberFull must be treated as read-only.
+
+
+def _file_stamp(fn: str):
+    try:
+        st = os.stat(fn)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=16)
+def _parse_cached(path: str, stamp, strict: bool) -> GerberFull:
+    return parse_gerber_full(path, strict=strict)
+
+
+@functools.lru_cache(maxsize=32)
+def _load_cached(kind: str, path: str, stamp, strict: bool):
+    return _LOADERS[kind](_parse_cached(path, stamp, strict))
+
+
+def _load(kind: str, fn: str, strict: bool, logger: Optional[logging.Logger]):
+    # An explicit logger means the caller wants the parse diagnostics: don't serve from cache.
+    stamp = _file_stamp(fn) if (fn and logger is None) else None
+    if stamp is None:
+        return _LOADERS[kind](parse_gerber_full(fn, strict=strict, logger=logger))
+    return _load_cached(kind, os.path.abspath(fn), stamp, bool(strict))
+
+
+def load_gerber_full(fn: str, *, strict: bool = False, logger: Optional[logging.Logger] = None) -> GerberFull:
+    """parse_gerber_full served from the parse cache (shared, read-only) unless a logger is given."""
+    stamp = _file_stamp(fn) if (fn and logger is None) else None
+    if stamp is None:
+        return parse_gerber_full(fn, strict=strict, logger=logger)
+    return _parse_cached(os.path.abspath(fn), stamp, bool(strict))
+
+
+def clear_gerber_cache() -> None:
+    _parse_cached.cache_clear()
+    _load_cached.cache_clear()
+
+
+def load_copper(fn: str, *, strict: bool = False, logger: Optional[logging.Logger] = None):
+    return _load("copper", fn, strict, logger)
+
+
+def load_pads(fn: str, *, strict: bool = False, logger: Optional[logging.Logger] = None):
+    return _load("pads", fn, strict, logger)
+
+
+def load_tracks(fn: str, *, strict: bool = False, logger: Optional[logging.Logger] = None):
+    return _load("tracks", fn, strict, logger)
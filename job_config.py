@@ -4,8 +4,10 @@
 # Single responsibility: read job_settings.ini and expose normalized values.
 
 import os
+import re
 import configparser
-from typing import Tuple
+import functools
+from typing import Dict, Tuple
 
 # Defaults (can be overridden in job_settings.ini [job])
 SAFE_Z = 5.0
@@ -15,15 +17,15 @@ PARK_X = 0.0
 PARK_Y = 0.0
 
 
+# Everything except str.isalnum() characters, "_" and "-" (\w is exactly isalnum() plus "_").
+_PREFIX_DROP_RE = re.compile(r"[^\w-]")
+
+
 def _normalize_file_prefix(p: str) -> str:
     p = (p or "").strip()
     if not p:
         return ""
-    safe = []
-    for ch in p:
-        if ch.isalnum() or ch in ("-", "_"):
-            safe.append(ch)
-    p = "".join(safe)
+    p = _PREFIX_DROP_RE.sub("", p)
     if not p:
         return ""
     if not (p.endswith("_") or p.endswith("-")):
@@ -31,10 +33,74 @@ def _normalize_file_prefix(p: str) -> str:
     return p
 
 
+# Parsed ini files keyed by absolute path -> ((mtime_ns, size), parser, flat values)
+_CFG_CACHE: Dict[str, Tuple[Tuple[int, int], configparser.ConfigParser, Dict[Tuple[str, str], str]]] = {}
+
+
+def _cfg_cache_entry(path: str):
+    path = os.path.abspath(path)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    stamp = (st.st_mtime_ns, st.st_size)
+
+    hit = _CFG_CACHE.get(path)
+    if hit is not None and hit[0] == stamp:
+        return hit
+
+    cfg = configparser.ConfigParser()
+    try:
+        cfg.read(path)
+    except Exception:
+        pass
+
+    flat = {}
+    for section in cfg.sections():
+        for key in cfg.options(section):
+            try:
+                flat[(section, key)] = cfg.get(section, key)
+            except Exception:
+                continue
+
+    entry = (stamp, cfg, flat)
+    _CFG_CACHE[path] = entry
+    return entry
+
+
+def read_cfg_cached(path: str) -> configparser.ConfigParser:
+    """
+    Parse an ini file once and reuse the parser until the file's mtime/size changes.
+    The returned parser is shared: treat it as read-only.
+    """
+    entry = _cfg_cache_entry(path)
+    if entry is None:
+        return configparser.ConfigParser()
+    return entry[1]
+
+
+def read_cfg_values(path: str) -> Dict[Tuple[str, str], str]:
+    """Flat {(section, key): raw string} view of read_cfg_cached(path)."""
+    entry = _cfg_cache_entry(path)
+    if entry is None:
+        return {}
+    return entry[2]
+
+
+def clear_job_cache() -> None:
+    _CFG_CACHE.clear()
+
+
 def _job_settings_paths():
+    # Every job_get* call lands here: only the inputs are read per call, the
+    # abspath/dedupe work is memoized on them.
+    return _settings_paths_for(os.environ.get("JOB_SETTINGS_INI", "").strip(), os.getcwd())
+
+
+@functools.lru_cache(maxsize=32)
+def _settings_paths_for(env: str, cwd: str):
     paths = []
 
-    env = os.environ.get("JOB_SETTINGS_INI", "").strip()
     if env:
         paths.append(env)
 
@@ -44,7 +110,7 @@ def _job_settings_paths():
     except Exception:
         pass
 
-    paths.append(os.path.join(os.getcwd(), "job_settings.ini"))
+    paths.append(os.path.join(cwd, "job_settings.ini"))
 
     out = []
     seen = set()
@@ -53,53 +119,45 @@ def _job_settings_paths():
         if p not in seen:
             seen.add(p)
             out.append(p)
-    return out
+    return tuple(out)
 
 
-def _job_cfg() -> configparser.ConfigParser:
-    cfg = configparser.ConfigParser()
+def _job_values() -> Dict[Tuple[str, str], str]:
+    """
+    Flat {(section, key): value} of the first job_settings.ini (in search order) with any sections.
+    Served from the mtime cache, so the job_get* helpers never touch ConfigParser after the first read.
+    """
     for p in _job_settings_paths():
-        try:
-            if os.path.exists(p):
-                cfg.read(p)
-                if cfg.sections():
-                    break
-        except Exception:
-            continue
-    return cfg
+        entry = _cfg_cache_entry(p)
+        if entry is not None and entry[1].sections():
+            return entry[2]
+    return {}
 
 
 def job_getfloat(section: str, key: str, default: float) -> float:
+    v = _job_values().get((section, key.lower()))
+    if v is None:
+        return float(default)
     try:
-        cfg = _job_cfg()
-        return float(cfg.getfloat(section, key, fallback=default))
+        return float(v)
     except Exception:
         return float(default)
 
 
 def job_getbool(section: str, key: str, default: bool) -> bool:
-    try:
-        cfg = _job_cfg()
-        return cfg.getboolean(section, key, fallback=default)
-    except Exception:
+    v = _job_values().get((section, key.lower()))
+    if v is None:
         return bool(default)
+    return configparser.ConfigParser.BOOLEAN_STATES.get(v.lower(), bool(default))
 
 
 def job_getstr(section: str, key: str, default: str = "") -> str:
-    try:
-        cfg = _job_cfg()
-        v = cfg.get(section, key, fallback=default)
-        return (v or default).strip()
-    except Exception:
-        return (default or "").strip()
+    v = _job_values().get((section, key.lower()), default)
+    return (v or default or "").strip()
 
 
 def job_file_prefix() -> str:
-    try:
-        cfg = _job_cfg()
-        return _normalize_file_prefix(cfg.get("job", "file_prefix", fallback=""))
-    except Exception:
-        return ""
+    return _normalize_file_prefix(_job_values().get(("job", "file_prefix"), ""))
 
 
 def out_nc(name: str) -> str:
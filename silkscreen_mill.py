@@ -11,12 +11,14 @@ from shapely.geometry import LineString, MultiLineString
 from shapely.affinity import translate
 
 from common_gerber import (
-    parse_gerber_full,
-    load_copper,
+    JobContext,
+    load_gerber_full,
     ensure_header,
     toolchange_sequence,
     end_sequence,
     out_nc,
+    GCODE_WRITE_BUFFER,
+    order_lines_nearest,
     cleanup_geometry,
     get_safe_z,
 )
@@ -24,53 +26,28 @@ from common_gerber import (
 DEFAULT_DEPTH = 0.05
 MIN_SEGMENT = 0.001
 
+# %-templates for the hot G-code lines (cheaper than f-strings per call).
+_G0Z = "G0 Z%.3f\n"
+_G0XY = "G0 X%.4f Y%.4f\n"
+_G1Z = "G1 Z%.4f F%s\n"
+
 
 def _order_lines(lines, start_xy=(0.0, 0.0)):
+    """
+    Step 5: nearest-neighbor ordering with reversal.
+    Same greedy walk (start before end, first line wins ties) on the shared
+    KD-tree / compiled kernel, instead of rescanning every remaining line per pick.
+    """
     if not lines:
         return []
+    return order_lines_nearest(lines, start_xy=start_xy, allow_reverse=True)
+
 
-    rem = [ls for ls in lines if ls is not None and not ls.is_empty and len(ls.coords) >= 2]
-    out = []
-    cur = (float(start_xy[0]), float(start_xy[1]))
-
-    def d2(a, b):
-        dx = a[0] - b[0]
-        dy = a[1] - b[1]
-        return dx * dx + dy * dy
-
-    while rem:
-        best_i = 0
-        best_flip = False
-        best_d = float("inf")
-        for i, ls in enumerate(rem):
-            c = list(ls.coords)
-            s = (float(c[0][0]), float(c[0][1]))
-            e = (float(c[-1][0]), float(c[-1][1]))
-            ds = d2(cur, s)
-            if ds < best_d:
-                best_d = ds
-                best_i = i
-                best_flip = False
-            de = d2(cur, e)
-            if de < best_d:
-                best_d = de
-                best_i = i
-                best_flip = True
-
-        ls = rem.pop(best_i)
-        if best_flip:
-            ls = LineString(list(ls.coords)[::-1])
-
-        out.append(ls)
-        end = list(ls.coords)[-1]
-        cur = (float(end[0]), float(end[1]))
-
-    return out
-
-
-def run_silk(bit, combined, prefix):
+def run_silk(bit, combined, prefix, ctx=None):
+    if ctx is None:
+        ctx = JobContext(prefix)
     # Use copper only as a reference for normalization (0,0 shift)
-    copper = load_copper(prefix + "-TopLayer.gbr")
+    copper = ctx.copper_raw
     if copper is None or copper.is_empty:
         print("[SILK] Copper layer missing/empty; cannot normalize")
         return
@@ -78,12 +55,12 @@ def run_silk(bit, combined, prefix):
     silk_fn = prefix + "-TopSilkLayer.gbr"
 
     # Parse raw draw segments (centerlines)
-    gf = parse_gerber_full(silk_fn, strict=False, logger=None)
+    gf = load_gerber_full(silk_fn, strict=False, logger=None)
     if not gf.tracks:
         print("[SILK] No silkscreen draw segments found")
         return
 
-    minx, miny, _, _ = copper.bounds
+    minx, miny = ctx.origin
 
     segs = []
     for _ap, p1, p2 in gf.tracks:
@@ -131,20 +108,28 @@ def run_silk(bit, combined, prefix):
     if depth <= 0:
         depth = DEFAULT_DEPTH
 
-    with open(out, "a") as g:
+    with open(out, "a", buffering=GCODE_WRITE_BUFFER) as g:
         toolchange_sequence(g, bit, "Silkscreen engraving")
+
+        # Constant parts (safe Z, plunge, feeds) are formatted once for the whole layer.
+        safe = _G0Z % safe_z
+        plunge = _G1Z % (-depth, bit["feed_z"])
+        g1xy = "G1 X%%.4f Y%%.4f F%s\n" % (bit["feed_xy"],)
+
+        # All paths are collected and written in one call.
+        buf = []
+        append = buf.append
         for ls in lines:
             coords = list(ls.coords)
             if len(coords) < 2:
                 continue
 
-            x0, y0 = coords[0]
-            g.write(f"G0 Z{safe_z:.3f}\n")
-            g.write(f"G0 X{x0:.4f} Y{y0:.4f}\n")
-            g.write(f"G1 Z{-depth:.4f} F{bit['feed_z']}\n")
-            for (x1, y1) in coords[1:]:
-                g.write(f"G1 X{x1:.4f} Y{y1:.4f} F{bit['feed_xy']}\n")
-            g.write(f"G0 Z{safe_z:.3f}\n")
+            append(safe)
+            append(_G0XY % coords[0])
+            append(plunge)
+            buf.extend([g1xy % p for p in coords[1:]])
+            append(safe)
+        g.write("".join(buf))
 
         end_sequence(g, end_program=not combined)
 
@@ -1,17 +1,17 @@
 # soldermask_clear.py
 
-import configparser
 from shapely.geometry import LineString
 from shapely.ops import unary_union
 
 from common_gerber import (
-    load_pads,
-    load_copper,
-    normalize_to_ref,
+    JobContext,
     ensure_header,
     toolchange_sequence,
     end_sequence,
     out_nc,
+    GCODE_WRITE_BUFFER,
+    order_lines_nearest,
+    read_cfg_values,
 )
 
 SAFE_Z = 5.0
@@ -19,12 +19,15 @@ DEFAULT_CLEAR_DEPTH = 0.01
 MAX_OUTSIDE = 0.10
 STEPOVER_RATIO = 0.45
 
+# %-templates for the hot G-code lines (cheaper than f-strings per call).
+_G0Z = "G0 Z%.3f\n"
+_G1Z = "G1 Z%.4f F%s\n"
+
 
 def load_clear_depth():
-    cfg = configparser.ConfigParser()
-    cfg.read("job_settings.ini")
+    v = read_cfg_values("job_settings.ini").get(("job", "soldermask_depth"))
     try:
-        return cfg.getfloat("job", "soldermask_depth")
+        return float(v)
     except Exception:
         return DEFAULT_CLEAR_DEPTH
 
@@ -32,47 +35,12 @@ def load_clear_depth():
 def _order_lines(lines, start_xy=(0.0, 0.0)):
     """
     Step 5: nearest-neighbor ordering with reversal.
+    Same greedy walk (start before end, first line wins ties) on the shared
+    KD-tree / compiled kernel, instead of rescanning every remaining line per pick.
     """
     if not lines:
         return []
-
-    rem = [ls for ls in lines if ls is not None and not ls.is_empty and len(ls.coords) >= 2]
-    out = []
-    cur = (float(start_xy[0]), float(start_xy[1]))
-
-    def d2(a, b):
-        dx = a[0] - b[0]
-        dy = a[1] - b[1]
-        return dx * dx + dy * dy
-
-    while rem:
-        best_i = 0
-        best_flip = False
-        best_d = float("inf")
-        for i, ls in enumerate(rem):
-            c = list(ls.coords)
-            s = (float(c[0][0]), float(c[0][1]))
-            e = (float(c[-1][0]), float(c[-1][1]))
-            ds = d2(cur, s)
-            if ds < best_d:
-                best_d = ds
-                best_i = i
-                best_flip = False
-            de = d2(cur, e)
-            if de < best_d:
-                best_d = de
-                best_i = i
-                best_flip = True
-
-        ls = rem.pop(best_i)
-        if best_flip:
-            ls = LineString(list(ls.coords)[::-1])
-
-        out.append(ls)
-        end = list(ls.coords)[-1]
-        cur = (float(end[0]), float(end[1]))
-
-    return out
+    return order_lines_nearest(lines, start_xy=start_xy, allow_reverse=True)
 
 
 def clear_pad(poly, bit_d):
@@ -105,15 +73,16 @@ def clear_pad(poly, bit_d):
     return paths
 
 
-def run_mask(bit, combined, prefix):
-    copper = load_copper(prefix + "-TopLayer.gbr")
-    pads = load_pads(prefix + "-TopLayer.gbr")
+def run_mask(bit, combined, prefix, ctx=None):
+    if ctx is None:
+        ctx = JobContext(prefix)
+    pads = ctx.pads_raw
 
     if pads is None or pads.is_empty:
         print("[MASK] No pads found")
         return
 
-    pads = normalize_to_ref(pads, copper)
+    pads = ctx.normalize(pads)
 
     bit_d = bit["diameter"]
     depth = load_clear_depth()
@@ -136,15 +105,26 @@ def run_mask(bit, combined, prefix):
     out = out_nc("all.nc") if combined else out_nc("soldermask_clear.nc")
     ensure_header(out)
 
-    with open(out, "a") as g:
+    with open(out, "a", buffering=GCODE_WRITE_BUFFER) as g:
         toolchange_sequence(g, bit, "Soldermask clearing")
+
+        # One template per pass; safe Z, plunge depth and feeds are constant for the layer.
+        safe = _G0Z % SAFE_Z
+        clear = "%sG0 X%%.4f Y%%.4f\n%sG1 X%%.4f Y%%.4f F%s\n%s" % (
+            safe,
+            _G1Z % (-depth, bit["feed_z"]),
+            bit["feed_xy"],
+            safe,
+        )
+
+        # All passes are collected and written in one call.
+        buf = []
+        append = buf.append
         for ls in ordered:
             (x0, y0), (x1, y1) = list(ls.coords)
-            g.write(f"G0 Z{SAFE_Z:.3f}\n")
-            g.write(f"G0 X{x0:.4f} Y{y0:.4f}\n")
-            g.write(f"G1 Z{-depth:.4f} F{bit['feed_z']}\n")
-            g.write(f"G1 X{x1:.4f} Y{y1:.4f} F{bit['feed_xy']}\n")
-            g.write(f"G0 Z{SAFE_Z:.3f}\n")
+            append(clear % (x0, y0, x1, y1))
+        g.write("".join(buf))
+
         end_sequence(g, end_program=not combined)
 
     print(f"[MASK] Cleared {len(geoms)} pads (Z=0 → Z=-{depth:.3f} mm)")
@@ -7,10 +7,11 @@
 #   only ran on optionsChanged/bitsChanged. Now previewRequested triggers BOTH.
 
 import os
-import glob
+import bisect
 import shutil
 import time
 import traceback
+import itertools
 from collections import Counter
 
 from PySide6.QtWidgets import (
@@ -21,9 +22,10 @@ from PySide6.QtWidgets import (
     QTabWidget,
     QMessageBox,
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer, Slot, Signal, QObject, QRunnable, QThreadPool, QSignalBlocker
 
-from shapely.geometry import MultiLineString, LineString
+import numpy as np
+import shapely
 from shapely.affinity import translate
 
 from ui.ui_state import UIState
@@ -33,7 +35,7 @@ from ui.tabs.bits_tab import BitsTab
 from ui.tabs.job_options_tab import JobOptionsTab
 from ui.tabs.bit_editor_tab import BitEditorTab
 
-from bitlib import bit_dict, save_settings
+from bitlib import bit_dict, save_settings, type_tag, is_reasonable_for_op
 from copper_isolation import run_copper
 from soldermask_clear import run_mask
 from drilling import run_drill
@@ -41,13 +43,14 @@ from board_outline import run_outline
 from silkscreen_mill import run_silk
 
 from common_gerber import (
+    JobContext,
     load_copper,
     load_pads,
     load_tracks,
     normalize_to_ref,
     write_header,
     out_nc,
-    parse_gerber_full,
+    load_gerber_full,
 )
 
 from excellon_parser import load_drills_and_slots
@@ -60,30 +63,36 @@ OPS = [
     ("board_outline", run_outline),
     ("silkscreen", run_silk),
 ]
+OPS_DICT = dict(OPS)
 
 DEFAULT_MILL_HOLES_OVER = 1.2  # mm
 
+# Preflight + preview run once this long after the last change in a burst (spinbox typing, layer toggles).
+REFRESH_DEBOUNCE_MS = 150
 
-def _type_tag(bit_type: str) -> str:
-    t = (bit_type or "").strip().lower()
-    if "drill" in t:
-        return "drill"
-    if "v" in t or "engrave" in t or "conic" in t:
-        return "vbit"
-    if "flat" in t or "end" in t or "mill" in t or "router" in t:
-        return "mill"
-    return "unknown"
 
+class _PreflightSignals(QObject):
+    # (generation, cache key, result tuple or None, exception or None)
+    finished = Signal(int, object, object, object)
 
-def _is_reasonable_for_op(op: str, btype: str) -> bool:
-    tag = _type_tag(btype)
-    if op == "drilling":
-        return tag == "drill"
-    if op in ("board_outline", "soldermask_clear"):
-        return tag == "mill"
-    if op in ("copper_isolation", "silkscreen"):
-        return tag in ("vbit", "mill")
-    return True
+
+class _PreflightWorker(QRunnable):
+    """Runs MainWindow._preflight_run off the UI thread; the result comes back through signals."""
+
+    def __init__(self, run, inputs, generation, key):
+        super().__init__()
+        self.run_fn = run
+        self.inputs = inputs
+        self.generation = generation
+        self.key = key
+        self.signals = _PreflightSignals()
+
+    def run(self):
+        try:
+            result, error = self.run_fn(self.inputs), None
+        except Exception as e:
+            result, error = None, e
+        self.signals.finished.emit(self.generation, self.key, result, error)
 
 
 class MainWindow(QMainWindow):
@@ -95,6 +104,27 @@ class MainWindow(QMainWindow):
         self.state = UIState()
         self.preview = PreviewWidget()
 
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(REFRESH_DEBOUNCE_MS)
+        self._refresh_timer.timeout.connect(self._do_refresh)
+
+        # _preflight_compute results by _preflight_key(); cleared when the bits file changes.
+        self._preflight_cache = {}
+        # Bumped per refresh (and when bits change); worker results from an older one are dropped.
+        self._preflight_generation = 0
+        self._preflight_workers = set()
+        # Derived preview geometry (offset rings, silkscreen lines) by source file stamp + parameters.
+        # The layer loaders keep their own parse cache; this skips the work done on top of it.
+        self._preview_cache = {}
+        # _available_drill_bits() result; dropped whenever bits or bit settings change.
+        self._drill_bits_cache = None
+        # op_key -> (bit name or None, is_fallback) for _get_bit_safe, including "no bit" misses.
+        self._resolved_bit_cache = {}
+        # True once every op's [op] bit names an existing bit; only a bits-file reload can undo that
+        # (the Bits tab only ever selects existing bits).
+        self._bits_healthy = False
+
         self.tabs = QTabWidget()
 
         self.files_tab = FilesTab(self.state)
@@ -133,48 +163,102 @@ class MainWindow(QMainWindow):
     # ----------------------------
     # NEW: Files changed handler
     # ----------------------------
+    def _invalidate_bit_caches(self):
+        self._drill_bits_cache = None
+        self._resolved_bit_cache.clear()
+
+    @Slot()
     def _on_files_changed(self):
         # When a new board is loaded or layer toggles change, update BOTH:
         # - preflight text
         # - preview graphics
-        self._refresh_preflight_ui()
-        if self.state.prefix and self.state.gerber_dir:
-            self.update_preview()
+        self._schedule_refresh()
 
+    @Slot()
     def _on_bits_file_changed(self):
-        self.bits_tab.refresh_bits_list()
+        self._bits_healthy = False
+        self._preflight_cache.clear()
+        self._preflight_generation += 1
+        self._invalidate_bit_caches()
+        self._refresh_bits_list()
         self._on_bits_or_settings_changed()
 
+    @Slot()
     def _on_bits_or_settings_changed(self):
+        self._invalidate_bit_caches()
         self._heal_missing_bits_in_settings(save=False)
-        self._refresh_preflight_ui()
-        if self.state.prefix and self.state.gerber_dir:
-            self.update_preview()
+        self._schedule_refresh()
 
+    @Slot()
     def _on_options_changed(self):
-        self.bits_tab.refresh_bits_list()
+        self._invalidate_bit_caches()
+        self._refresh_bits_list()
         self._heal_missing_bits_in_settings(save=False)
-        self._refresh_preflight_ui()
+        self._schedule_refresh()
+
+    def _refresh_bits_list(self):
+        # The tab already blocks its child widgets while repopulating; blocking the tab itself
+        # keeps any bitsChanged from re-entering the handlers that asked for the refresh.
+        with QSignalBlocker(self.bits_tab):
+            self.bits_tab.refresh_bits_list()
+
+    def _schedule_refresh(self):
+        # (Re)start the single-shot timer: a burst of changes costs one preflight + preview.
+        self._refresh_timer.start()
+
+    @Slot()
+    def _do_refresh(self):
+        self._refresh_preflight_ui(background=True)
         if self.state.prefix and self.state.gerber_dir:
             self.update_preview()
 
-    def _refresh_preflight_ui(self):
+    def _refresh_preflight_ui(self, background: bool = False):
+        self._preflight_generation += 1
+
         if not (self.state.prefix and self.state.gerber_dir):
             self.job_options_tab.update_status("info", "")
             self.bits_tab.set_drill_auto_plan([])
             return
 
-        cwd = os.getcwd()
-        os.chdir(self.state.gerber_dir)
+        if background:
+            key = self._preflight_key()
+            hit = self._preflight_cache.get(key)
+            if hit is None:
+                try:
+                    inputs = self._preflight_inputs()
+                except Exception as e:
+                    self._apply_preflight("warn", f"Preflight error: {e}", [])
+                    return
+                worker = _PreflightWorker(self._preflight_run, inputs, self._preflight_generation, key)
+                worker.signals.finished.connect(self._on_preflight_finished)
+                self._preflight_workers.add(worker)
+                QThreadPool.globalInstance().start(worker)
+                return
+            level, text, planned = hit
+            self._apply_preflight(level, text, list(planned))
+            return
+
         try:
             level, text, planned = self._preflight_compute()
         except Exception as e:
             level = "warn"
             text = f"Preflight error: {e}"
             planned = []
-        finally:
-            os.chdir(cwd)
+        self._apply_preflight(level, text, planned)
 
+    @Slot(int, object, object, object)
+    def _on_preflight_finished(self, generation, key, result, error):
+        self._preflight_workers = {w for w in self._preflight_workers if w.generation != generation}
+        if generation != self._preflight_generation:
+            return
+        if error is not None:
+            self._apply_preflight("warn", f"Preflight error: {error}", [])
+            return
+        self._store_preflight(key, result)
+        level, text, planned = result
+        self._apply_preflight(level, text, list(planned))
+
+    def _apply_preflight(self, level, text, planned):
         self.state.preflight_level = level
         self.state.preflight_text = text
         self.state.planned_drill_names = planned
@@ -206,23 +290,36 @@ class MainWindow(QMainWindow):
         for n in names:
             try:
                 b = bit_dict(self.state.bits, n)
-                if _is_reasonable_for_op(op_key, b.get("type", "")):
+                if is_reasonable_for_op(op_key, b.get("type", "")):
                     return n
             except Exception:
                 continue
         return names[0]
 
+    def _resolve_op_bit(self, op_key: str):
+        hit = self._resolved_bit_cache.get(op_key)
+        if hit is None:
+            s = self.state
+            bit_name = s.settings.get(op_key, "bit", fallback=None)
+            if bit_name and s.bits.has_section(bit_name):
+                hit = (bit_name, False)
+            else:
+                hit = (self._resolve_fallback_bit_name(op_key), True)
+            self._resolved_bit_cache[op_key] = hit
+        return hit
+
     def _get_bit_safe(self, op_key: str, allow_update_settings: bool = True):
         s = self.state
-        bit_name = s.settings.get(op_key, "bit", fallback=None)
+        bit_name, is_fallback = self._resolve_op_bit(op_key)
 
-        if bit_name and s.bits.has_section(bit_name):
+        if not is_fallback:
             try:
                 return bit_dict(s.bits, bit_name)
             except Exception:
                 pass
-
-        fallback = self._resolve_fallback_bit_name(op_key)
+            fallback = self._resolve_fallback_bit_name(op_key)
+        else:
+            fallback = bit_name
         if not fallback:
             return None
 
@@ -237,10 +334,15 @@ class MainWindow(QMainWindow):
             return None
 
     def _heal_missing_bits_in_settings(self, save: bool = False):
+        if self._bits_healthy:
+            return
+
+        sections = set(self.state.bits.sections())
         changed = False
+        healthy = True
         for op_key, _func in OPS:
             desired = self.state.settings.get(op_key, "bit", fallback=None)
-            if desired and self.state.bits.has_section(desired):
+            if desired and desired in sections:
                 continue
             fb = self._resolve_fallback_bit_name(op_key)
             if fb:
@@ -248,16 +350,24 @@ class MainWindow(QMainWindow):
                     self.state.settings.add_section(op_key)
                 self.state.settings.set(op_key, "bit", fb)
                 changed = True
+            else:
+                healthy = False
+        self._bits_healthy = healthy
 
         if changed and save:
             save_settings(self.state.settings)
 
     def _available_drill_bits(self):
+        if self._drill_bits_cache is None:
+            self._drill_bits_cache = self._scan_drill_bits()
+        return list(self._drill_bits_cache)
+
+    def _scan_drill_bits(self):
         out = []
         for name in self.state.bits.sections():
             try:
                 b = bit_dict(self.state.bits, name)
-                if _type_tag(b.get("type", "")) == "drill":
+                if type_tag(b.get("type", "")) == "drill":
                     d = float(b.get("diameter", 0.0))
                     if d > 0:
                         out.append(b)
@@ -299,21 +409,14 @@ class MainWindow(QMainWindow):
         drills = sorted(candidate_bits, key=lambda b: float(b["diameter"]))
         ds = [float(b["diameter"]) for b in drills]
 
-        def best_drill_index_for(hd, allowed_idx=None):
-            limit = float(hd) + tol
-            best = -1
-            for i, d in enumerate(ds):
-                if allowed_idx is not None and i not in allowed_idx:
-                    continue
-                if d <= limit + 1e-9:
-                    best = i
-                else:
-                    break
-            return best
+        # Drills 0..fit[k]-1 are no larger than hole k (+tol). Sets of drill indices are int
+        # bitmasks, so the best allowed drill for a hole is the highest set bit below fit[k].
+        fit = [bisect.bisect_right(ds, float(hd) + tol + 1e-9) for hd in hole_ds]
 
-        assign_idx = []
-        for hd in hole_ds:
-            assign_idx.append(best_drill_index_for(hd))
+        def best_drill_index_for(k, allowed_mask=-1):
+            return (allowed_mask & ((1 << fit[k]) - 1)).bit_length() - 1
+
+        assign_idx = [n - 1 for n in fit]
 
         if any(i < 0 for i in assign_idx):
             bad = [hole_ds[k] for k, i in enumerate(assign_idx) if i < 0]
@@ -321,24 +424,27 @@ class MainWindow(QMainWindow):
                 f"Impossible: smallest drill is larger than some holes (+tol). Missing holes: min {min(bad):.3f}mm."
             ]
 
-        used = sorted(set(i for i in assign_idx if i >= 0))
+        used = sorted(set(assign_idx))
 
         while len(used) > max_bits:
-            holes_by = {i: [] for i in used}
-            for hd, i in zip(hole_ds, assign_idx):
-                holes_by[i].append(hd)
+            # A drill can go if every hole on it still fits some other used drill, i.e. one
+            # below the tightest of those holes.
+            holes_cnt = Counter(assign_idx)
+            min_fit = {}
+            min_fit_get = min_fit.get
+            no_fit = len(ds) + 1
+            for f, i in zip(fit, assign_idx):
+                if f < min_fit_get(i, no_fit):
+                    min_fit[i] = f
+
+            used_mask = 0
+            for i in used:
+                used_mask |= 1 << i
 
             droppable = []
-            used_set = set(used)
             for di in used:
-                other = used_set - {di}
-                ok = True
-                for hd in holes_by.get(di, []):
-                    best2 = best_drill_index_for(hd, allowed_idx=other)
-                    if best2 < 0:
-                        ok = False
-                        break
-                if ok:
+                other = used_mask & ~(1 << di)
+                if di not in min_fit or other & ((1 << min_fit[di]) - 1):
                     droppable.append(di)
 
             if not droppable:
@@ -346,18 +452,14 @@ class MainWindow(QMainWindow):
                     f"Impossible to stay within max drills={max_bits} while covering all holes (+tol)."
                 ]
 
-            holes_cnt = {i: 0 for i in used}
-            for i in assign_idx:
-                holes_cnt[i] = holes_cnt.get(i, 0) + 1
-
             droppable.sort(key=lambda i: (holes_cnt.get(i, 0), ds[i]))
             drop = droppable[0]
             used.remove(drop)
 
-            used_set = set(used)
-            for k, hd in enumerate(hole_ds):
+            used_mask &= ~(1 << drop)
+            for k in range(len(assign_idx)):
                 if assign_idx[k] == drop:
-                    assign_idx[k] = best_drill_index_for(hd, allowed_idx=used_set)
+                    assign_idx[k] = best_drill_index_for(k, used_mask)
 
         planned = [drills[i] for i in used]
         planned.sort(key=lambda b: float(b["diameter"]), reverse=True)
@@ -374,25 +476,61 @@ class MainWindow(QMainWindow):
         ]
         return "ok", planned, counts, msg
 
-    def _preflight_compute(self):
-        s = self.state
+    def _board_path(self, suffix: str = "") -> str:
+        # Board files are opened by full path, so preflight and preview never chdir.
+        return os.path.join(self.state.gerber_dir, self.state.prefix + suffix)
 
-        holes_raw, slots_raw = load_drills_and_slots(
-            s.prefix, tol_xy=float(getattr(s, "hole_dedupe_tol", 0.10))
+    def _preflight_key(self):
+        # Everything _preflight_compute reads, except bit definitions (see _on_bits_file_changed).
+        # Drill files are keyed by (mtime_ns, size) so an edited or replaced file misses.
+        s = self.state
+        stamps = []
+        for suffix in ("-PTH.drl", "-NPTH.drl"):
+            try:
+                st = os.stat(self._board_path(suffix))
+                stamps.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                stamps.append(None)
+        return (
+            s.gerber_dir,
+            s.prefix,
+            tuple(stamps),
+            float(getattr(s, "hole_dedupe_tol", 0.10)),
+            float(getattr(s, "mill_holes_over", DEFAULT_MILL_HOLES_OVER)),
+            float(getattr(s, "hole_match_tol", 0.05)),
+            int(getattr(s, "max_drills", 3)),
+            getattr(s, "drill_control", "auto"),
+            bool(getattr(s, "show_all_bits", False)),
+            s.settings.get("board_outline", "bit", fallback=None),
+            s.settings.get("drilling", "bits", fallback=None),
+            tuple(s.bits.sections()),
         )
 
-        mill_over = float(getattr(s, "mill_holes_over", DEFAULT_MILL_HOLES_OVER))
-        tol = float(getattr(s, "hole_match_tol", 0.05))
+    def _preflight_compute(self):
+        key = self._preflight_key()
+        hit = self._preflight_cache.get(key)
+        if hit is None:
+            hit = self._store_preflight(key, self._preflight_compute_uncached())
+        level, text, planned_names = hit
+        return level, text, list(planned_names)
+
+    def _store_preflight(self, key, result):
+        if len(self._preflight_cache) >= 32:
+            self._preflight_cache.clear()
+        self._preflight_cache[key] = result
+        return result
+
+    def _preflight_compute_uncached(self):
+        return self._preflight_run(self._preflight_inputs())
+
+    def _preflight_inputs(self):
+        # Everything _preflight_run needs from state, settings and bits; read on the UI thread.
+        s = self.state
+
         max_drills = int(getattr(s, "max_drills", 3))
         control = getattr(s, "drill_control", "auto")
 
         outline_bit = self._get_bit_safe("board_outline", allow_update_settings=False) or {}
-        router_d = float(outline_bit.get("diameter", 0.0))
-
-        hole_ds = [float(d) for (_, _, d) in holes_raw]
-        small_ds = [d for d in hole_ds if d < mill_over]
-        big_ds = [d for d in hole_ds if d >= mill_over]
-        slot_ws = [float(w) for (_, _, w) in slots_raw]
 
         if control == "manual":
             candidate = self._manual_selected_drills()
@@ -400,6 +538,40 @@ class MainWindow(QMainWindow):
         else:
             candidate = self._available_drill_bits()
 
+        return {
+            "drill_prefix": self._board_path(),
+            "dedupe_tol": float(getattr(s, "hole_dedupe_tol", 0.10)),
+            "mill_over": float(getattr(s, "mill_holes_over", DEFAULT_MILL_HOLES_OVER)),
+            "tol": float(getattr(s, "hole_match_tol", 0.05)),
+            "max_drills": max_drills,
+            "control": control,
+            "router_d": float(outline_bit.get("diameter", 0.0)),
+            "candidate": candidate,
+        }
+
+    def _preflight_run(self, inputs):
+        # Reads only the drill files and inputs, so it can run on a worker thread.
+        dedupe_tol = inputs["dedupe_tol"]
+        mill_over = inputs["mill_over"]
+        tol = inputs["tol"]
+        max_drills = inputs["max_drills"]
+        control = inputs["control"]
+        router_d = inputs["router_d"]
+        candidate = inputs["candidate"]
+
+        holes_raw, slots_raw = load_drills_and_slots(inputs["drill_prefix"], tol_xy=dedupe_tol)
+
+        # One pass splits drilled (small) from milled (big) holes.
+        small_ds = []
+        big_ds = []
+        for (_, _, d) in holes_raw:
+            d = float(d)
+            if d < mill_over:
+                small_ds.append(d)
+            elif d >= mill_over:
+                big_ds.append(d)
+        slot_ws = [float(w) for (_, _, w) in slots_raw]
+
         level, planned_bits, _counts, plan_lines = self._plan_drills_for_holes(
             small_ds, candidate, tol, max_drills
         )
@@ -409,7 +581,7 @@ class MainWindow(QMainWindow):
         lines = []
         if holes_raw:
             lines.append(
-                f"Holes: {len(holes_raw)} total (dedupe XY={float(getattr(s,'hole_dedupe_tol',0.10)):.3f}mm)"
+                f"Holes: {len(holes_raw)} total (dedupe XY={dedupe_tol:.3f}mm)"
             )
             if small_ds:
                 lines.append(f"Small holes (<{mill_over:.3f}): {len(small_ds)}")
@@ -436,7 +608,7 @@ class MainWindow(QMainWindow):
             lines.append(f"Most common small hole: {most_common:.3f}mm")
 
         if slot_ws or big_ds:
-            min_feat = min(slot_ws + big_ds) if (slot_ws + big_ds) else None
+            min_feat = min(itertools.chain(slot_ws, big_ds), default=None)
             if min_feat is not None:
                 lines.append(f"Recommended router: <= {min_feat * 0.80:.3f}mm")
 
@@ -470,20 +642,26 @@ class MainWindow(QMainWindow):
         os.makedirs(out_dir, exist_ok=True)
 
         produced = []
-        for fn in glob.glob(os.path.join(src_dir, "*.nc")):
+        # One directory scan; entry.stat() is served from the scan where the OS allows.
+        # Hidden names are skipped, as glob("*.nc") did.
+        with os.scandir(src_dir) as it:
+            entries = [e for e in it if e.name.endswith(".nc") and not e.name.startswith(".")]
+
+        for entry in entries:
             try:
-                st = os.stat(fn)
-                if st.st_mtime < start_time - 0.25:
+                if entry.stat().st_mtime < start_time - 0.25:
                     continue
             except Exception:
                 continue
 
-            base = os.path.basename(fn)
+            fn = entry.path
+            base = entry.name
             dst = os.path.join(out_dir, base)
 
             try:
-                if os.path.exists(dst):
-                    os.remove(dst)
+                os.remove(dst)
+            except FileNotFoundError:
+                pass
             except Exception:
                 root, ext = os.path.splitext(base)
                 dst = os.path.join(out_dir, f"{root}_copy{ext}")
@@ -493,8 +671,11 @@ class MainWindow(QMainWindow):
 
         return produced
 
+    @Slot()
     def run_job(self):
         s = self.state
+        self.bit_editor_tab.flush_pending_write()
+        self.job_options_tab.flush_pending()
 
         if not s.prefix or not s.gerber_dir:
             QMessageBox.warning(self, "No board", "Select a Gerber/ZIP first")
@@ -502,8 +683,8 @@ class MainWindow(QMainWindow):
 
         self._update_selected_ops()
 
-        runnable = {k for (k, _) in OPS}
-        ops_to_run = [k for k in s.selected_ops if k in runnable]
+        # A set for the per-op membership test; ops still run in OPS order below.
+        ops_to_run = OPS_DICT.keys() & set(s.selected_ops)
 
         if not ops_to_run:
             QMessageBox.warning(self, "Nothing selected", "Select at least one runnable operation")
@@ -513,61 +694,19 @@ class MainWindow(QMainWindow):
             return
 
         # Persist settings
-        if not s.settings.has_section("copper_isolation"):
-            s.settings.add_section("copper_isolation")
-        s.settings.set("copper_isolation", "passes", str(s.iso_passes))
-
-        if not s.settings.has_section("job"):
-            s.settings.add_section("job")
-
-        s.settings.set("job", "pcb_thickness", str(s.pcb_thickness))
-        s.settings.set("job", "copper_thickness", str(s.copper_thickness))
-        s.settings.set("job", "outline_tabs_enabled", str(s.outline_tabs_enabled))
-        s.settings.set("job", "file_prefix", getattr(s, "file_prefix", "") or "")
-
-        s.settings.set("job", "drill_control", getattr(s, "drill_control", "auto"))
-        s.settings.set("job", "max_drills", str(int(getattr(s, "max_drills", 3))))
-        s.settings.set("job", "hole_match_tol", str(float(getattr(s, "hole_match_tol", 0.05))))
-        s.settings.set("job", "hole_dedupe_tol", str(float(getattr(s, "hole_dedupe_tol", 0.10))))
-        s.settings.set("job", "mill_holes_over", str(float(getattr(s, "mill_holes_over", DEFAULT_MILL_HOLES_OVER))))
-        s.settings.set("job", "show_all_bits", "true" if bool(getattr(s, "show_all_bits", False)) else "false")
-
-        # Advanced knobs
-        s.settings.set("job", "path_ordering", "true" if bool(getattr(s, "path_ordering", True)) else "false")
-        s.settings.set("job", "geom_simplify_tol", str(float(getattr(s, "geom_simplify_tol", 0.0005))))
-        s.settings.set("job", "geom_min_area", str(float(getattr(s, "geom_min_area", 1e-8))))
-        s.settings.set("job", "geom_min_length", str(float(getattr(s, "geom_min_length", 1e-5))))
-        s.settings.set("job", "ramp_len", str(float(getattr(s, "ramp_len", 0.0))))
-
-        s.settings.set("job", "safe_z", str(float(getattr(s, "safe_z", 5.0))))
-        s.settings.set("job", "travel_z", str(float(getattr(s, "travel_z", 10.0))))
-        s.settings.set("job", "toolchange_z", str(float(getattr(s, "toolchange_z", 30.0))))
-        s.settings.set("job", "park_x", str(float(getattr(s, "park_x", 0.0))))
-        s.settings.set("job", "park_y", str(float(getattr(s, "park_y", 0.0))))
-        s.settings.set("job", "spindle_warmup_s", str(float(getattr(s, "spindle_warmup_s", 0.0))))
-
-        s.settings.set("job", "probe_on_start", "true" if bool(getattr(s, "probe_on_start", False)) else "false")
-        s.settings.set("job", "probe_gcode", (getattr(s, "probe_gcode", "") or "").rstrip())
+        s.settings.read_dict(s.persisted_settings())
 
         self._heal_missing_bits_in_settings(save=False)
         save_settings(s.settings)
 
+        # _preflight_dialog() just ran the preflight synchronously and stored its plan on the state.
         planned_drill_bits = []
-        try:
-            cwd = os.getcwd()
-            os.chdir(s.gerber_dir)
+        for n in s.planned_drill_names or []:
             try:
-                _level, _text, planned_names = self._preflight_compute()
-                for n in planned_names or []:
-                    try:
-                        if s.bits.has_section(n):
-                            planned_drill_bits.append(bit_dict(s.bits, n))
-                    except Exception:
-                        continue
-            finally:
-                os.chdir(cwd)
-        except Exception:
-            planned_drill_bits = []
+                if s.bits.has_section(n):
+                    planned_drill_bits.append(bit_dict(s.bits, n))
+            except Exception:
+                continue
 
         start_time = time.time()
         cwd = os.getcwd()
@@ -582,6 +721,9 @@ class MainWindow(QMainWindow):
                 with open(combined_name, "w") as f:
                     write_header(f, job_name="combined")
 
+            # Shared across ops so copper/outline/drills are loaded once per job.
+            ctx = JobContext(s.prefix)
+
             for op_key, func in OPS:
                 if op_key not in ops_to_run:
                     continue
@@ -596,9 +738,9 @@ class MainWindow(QMainWindow):
                     return
 
                 if op_key == "copper_isolation":
-                    func(bit, s.combined, s.prefix, passes=s.iso_passes)
+                    func(bit, s.combined, s.prefix, passes=s.iso_passes, ctx=ctx)
                 elif op_key == "board_outline":
-                    func(bit, s.combined, s.prefix, tabs_enabled=s.outline_tabs_enabled)
+                    func(bit, s.combined, s.prefix, tabs_enabled=s.outline_tabs_enabled, ctx=ctx)
                 elif op_key == "drilling":
                     func(
                         bit,
@@ -606,9 +748,10 @@ class MainWindow(QMainWindow):
                         s.prefix,
                         drill_bits=planned_drill_bits,
                         tol=float(getattr(s, "hole_match_tol", 0.05)),
+                        ctx=ctx,
                     )
                 else:
-                    func(bit, s.combined, s.prefix)
+                    func(bit, s.combined, s.prefix, ctx=ctx)
 
             if s.combined:
                 combined_name = out_nc("all.nc")
@@ -631,7 +774,9 @@ class MainWindow(QMainWindow):
 
             QMessageBox.information(self, "Done", msg)
             save_settings(s.settings)
-            self.bits_tab.refresh_bits_list()
+            self._refresh_bits_list()
+            # refresh_bits_list() may rewrite [op] bit settings.
+            self._invalidate_bit_caches()
 
         except Exception as e:
             tb = traceback.format_exc()
@@ -648,19 +793,27 @@ class MainWindow(QMainWindow):
             except Exception:
                 pass
 
+    def _preview_cached(self, key, build):
+        if key in self._preview_cache:
+            return self._preview_cache[key]
+        if len(self._preview_cache) >= 64:
+            self._preview_cache.clear()
+        value = self._preview_cache[key] = build()
+        return value
+
+    @staticmethod
+    def _file_key(path: str):
+        st = os.stat(path)
+        return (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+
     def _load_silkscreen_centerlines_preview(self, silk_fn: str, *, ref_minx: float, ref_miny: float):
-        gf = parse_gerber_full(silk_fn, strict=False, logger=None)
-        segs = []
-        for _ap, p1, p2 in gf.tracks:
-            try:
-                ls = LineString([p1, p2])
-                if ls.length > 1e-6:
-                    segs.append(ls)
-            except Exception:
-                continue
-        if not segs:
+        gf = load_gerber_full(silk_fn, strict=False, logger=None)
+        # Every draw as a two-point LineString in one call; zero-length ones are dropped.
+        segs = shapely.linestrings(np.stack([gf.track_p1, gf.track_p2], axis=1).reshape(-1, 2, 2))
+        segs = segs[shapely.length(segs) > 1e-6]
+        if not len(segs):
             return None
-        ml = MultiLineString(segs)
+        ml = shapely.multilinestrings(segs)
         return translate(ml, xoff=-ref_minx, yoff=-ref_miny)
 
     def update_preview(self):
@@ -671,30 +824,37 @@ class MainWindow(QMainWindow):
 
         self._update_selected_ops()
 
-        cwd = os.getcwd()
-        os.chdir(s.gerber_dir)
+        self.preview.clear()
 
-        try:
-            self.preview.clear()
+        top_fn = self._board_path("-TopLayer.gbr")
+        top_key = self._file_key(top_fn)
+        copper_raw = load_copper(top_fn)
+        copper_ref = self._preview_cached(("copper_ref", top_key), lambda: normalize_to_ref(copper_raw, copper_raw))
+        minx, miny, _, _ = copper_raw.bounds
 
-            copper_raw = load_copper(s.prefix + "-TopLayer.gbr")
-            copper_ref = normalize_to_ref(copper_raw, copper_raw)
-            minx, miny, _, _ = copper_raw.bounds
+        # The copper bounds give the zoom this board will be fitted at.
+        self.preview.begin_bulk_draw(copper_ref.bounds)
 
+        try:
             if "copper_isolation" in s.selected_ops:
                 bit = self._get_bit_safe("copper_isolation", allow_update_settings=False)
                 if bit:
                     tool_r = float(bit["diameter"]) / 2.0
                     passes = int(getattr(s, "iso_passes", 1) or 1)
-                    for i in range(1, passes + 1):
-                        off = tool_r * i
-                        p = copper_ref.buffer(off).boundary
+                    # All pass offsets in one vectorised buffer call (quad_segs=16 as in .buffer()).
+                    rings = self._preview_cached(
+                        ("iso", top_key, tool_r, passes),
+                        lambda: shapely.boundary(
+                            shapely.buffer(copper_ref, [tool_r * i for i in range(1, passes + 1)], quad_segs=16)
+                        ).tolist(),
+                    )
+                    for p in rings:
                         if p is not None and not p.is_empty:
                             self.preview.draw_copper_isolation(p)
 
             if "soldermask_clear" in s.selected_ops:
                 try:
-                    pads = load_pads(s.prefix + "-TopLayer.gbr")
+                    pads = load_pads(self._board_path("-TopLayer.gbr"))
                     pads = normalize_to_ref(pads, copper_raw)
                     if pads is not None and not pads.is_empty:
                         self.preview.draw_soldermask_clear(pads)
@@ -703,9 +863,10 @@ class MainWindow(QMainWindow):
 
             if "silkscreen" in s.selected_ops:
                 try:
-                    silk_fn = s.prefix + "-TopSilkLayer.gbr"
-                    silk_lines = self._load_silkscreen_centerlines_preview(
-                        silk_fn, ref_minx=minx, ref_miny=miny
+                    silk_fn = self._board_path("-TopSilkLayer.gbr")
+                    silk_lines = self._preview_cached(
+                        ("silk", self._file_key(silk_fn), minx, miny),
+                        lambda: self._load_silkscreen_centerlines_preview(silk_fn, ref_minx=minx, ref_miny=miny),
                     )
                     if silk_lines is not None and not silk_lines.is_empty:
                         self.preview.draw_silkscreen(silk_lines)
@@ -714,7 +875,7 @@ class MainWindow(QMainWindow):
 
             if "board_outline" in s.selected_ops:
                 try:
-                    outline = load_tracks(s.prefix + "-BoardOutLine.gbr")
+                    outline = load_tracks(self._board_path("-BoardOutLine.gbr"))
                     outline = normalize_to_ref(outline, copper_raw)
                     if outline is not None and not outline.is_empty:
                         self.preview.draw_through_outline(outline)
@@ -724,28 +885,29 @@ class MainWindow(QMainWindow):
             if "drilling" in s.selected_ops:
                 try:
                     holes_raw, slots_raw = load_drills_and_slots(
-                        s.prefix,
+                        self._board_path(),
                         tol_xy=float(getattr(s, "hole_dedupe_tol", 0.10)),
                     )
-                    drills = [(x - minx, y - miny, d) for (x, y, d) in holes_raw]
-                    slots = [
-                        ((x1 - minx, y1 - miny), (x2 - minx, y2 - miny), w)
-                        for ((x1, y1), (x2, y2), w) in slots_raw
-                    ]
-                    if drills:
-                        self.preview.draw_through_holes(drills)
-                    if slots:
+                    if holes_raw:
+                        drills = np.array(holes_raw, dtype=np.float64).reshape(-1, 3)
+                        drills[:, :2] -= (minx, miny)
+                        self.preview.draw_through_holes(drills.tolist())
+                    if slots_raw:
+                        # Rows of x1, y1, x2, y2, width.
+                        slots = np.array(
+                            [(x1, y1, x2, y2, w) for ((x1, y1), (x2, y2), w) in slots_raw], dtype=np.float64
+                        ).reshape(-1, 5)
+                        slots[:, :4] -= (minx, miny, minx, miny)
                         self.preview.draw_through_slots(slots)
                 except Exception:
                     pass
 
             self.preview.draw_origin()
             self.preview.draw_grid()
-
-            if hasattr(self.preview, "fit_to_view"):
-                self.preview.fit_to_view()
-            else:
-                self.preview.fit()
-
         finally:
-            os.chdir(cwd)
+            self.preview.end_bulk_draw()
+
+        if hasattr(self.preview, "fit_to_view"):
+            self.preview.fit_to_view()
+        else:
+            self.preview.fit()
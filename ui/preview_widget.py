@@ -8,15 +8,19 @@
 
 from PySide6.QtWidgets import (
     QWidget,
+    QGraphicsItem,
     QGraphicsView,
     QGraphicsScene,
     QVBoxLayout,
     QHBoxLayout,
     QLabel,
 )
-from PySide6.QtGui import QPen, QPainter, QColor, QBrush, QPainterPath, QPolygonF
-from PySide6.QtCore import Qt, QEvent, QPointF
+from PySide6.QtGui import QPen, QPainter, QColor, QBrush, QPainterPath, QPolygonF, QPalette
+from PySide6.QtCore import Qt, QEvent, QPointF, QRectF
 
+import numpy as np
+import shapely
+import shiboken6
 from shapely.geometry import (
     Polygon,
     MultiPolygon,
@@ -37,8 +41,14 @@ COLOR_THROUGH = QColor(255, 0, 0)
 COLOR_GRID = QColor(50, 50, 50)
 COLOR_ORIGIN = QColor(255, 0, 0)
 
+# One item group per layer, stacked bottom to top in this order
+# (holes stay above the grid, as they did with their z value of 1000).
+LAYERS = ("copper_iso", "mask", "silk", "through", "origin", "grid", "holes")
+
 
 class PreviewWidget(QWidget):
+    _SLOT_CACHE_MAX = 4096
+
     def __init__(self):
         super().__init__()
 
@@ -58,13 +68,16 @@ class PreviewWidget(QWidget):
         # ---- SIDE PANEL ----
         self.side_panel = QWidget()
         self.side_panel.setFixedWidth(220)
-        self.side_panel.setStyleSheet("background-color: black;")
+        # Palette instead of style sheets: black panel, white text; the labels inherit it.
+        pal = self.side_panel.palette()
+        pal.setColor(QPalette.Window, Qt.black)
+        pal.setColor(QPalette.WindowText, Qt.white)
+        self.side_panel.setPalette(pal)
+        self.side_panel.setAutoFillBackground(True)
 
         self.coord_label = QLabel("X=0.000  Y=0.000")
-        self.coord_label.setStyleSheet("color: white;")
 
         self.grid_label = QLabel("Grid: -- mm")
-        self.grid_label.setStyleSheet("color: white;")
 
         legend_layout = QVBoxLayout()
         legend_layout.setSpacing(6)
@@ -89,9 +102,28 @@ class PreviewWidget(QWidget):
         main_layout.addWidget(self.view, 1)
         main_layout.addWidget(self.side_panel)
 
-        self.grid_items = []
+        self.layers = {}
+        for name in LAYERS:
+            self._new_layer(name)
+
+        # Union of every drawn item's bounds except the grid, kept as items are added
+        # so draw_grid/fit don't have to walk the scene.
+        self._scene_rect = QRectF()
+        self._grid_item = None
+        # Last grid path and its (rounded rect, step) key; survives clear() so an
+        # unchanged board re-adds the same path instead of rebuilding it.
+        self._grid_key = None
+        self._grid_path = None
         self.origin_items = []
 
+        # Pixels per mm the board being drawn will be shown at, estimated in
+        # begin_bulk_draw(); 0 (no sub-pixel culling) outside a bulk draw.
+        self._draw_px_per_mm = 0.0
+
+        # Buffered slot polygons keyed on (x1, y1, x2, y2, width) content, so they
+        # stay valid across clear() and redraws; bounded by _SLOT_CACHE_MAX.
+        self._slot_cache = {}
+
     # --------------------------------------------------
     # EVENTS
     # --------------------------------------------------
@@ -106,11 +138,11 @@ class PreviewWidget(QWidget):
         row = QHBoxLayout()
         swatch = QLabel()
         swatch.setFixedSize(12, 12)
-        swatch.setStyleSheet(
-            f"background-color: rgb({color.red()}, {color.green()}, {color.blue()});"
-        )
+        swatch.setAutoFillBackground(True)
+        pal = swatch.palette()
+        pal.setColor(QPalette.Window, color)
+        swatch.setPalette(pal)
         label = QLabel(name)
-        label.setStyleSheet("color: white;")
         row.addWidget(swatch)
         row.addWidget(label)
         row.addStretch()
@@ -120,15 +152,63 @@ class PreviewWidget(QWidget):
     # CLEAR
     # --------------------------------------------------
 
+    def _new_layer(self, name):
+        group = self.scene.createItemGroup([])
+        group.setFlag(QGraphicsItem.ItemHasNoContents, True)
+        group.setZValue(LAYERS.index(name))
+        self.layers[name] = group
+
+    def clear_layer(self, name):
+        # Dropping the group deletes all of its items in one go.
+        group = self.layers[name]
+        self.scene.removeItem(group)
+        shiboken6.delete(group)
+        self._new_layer(name)
+
     def clear(self):
-        self.scene.clear()
-        self.grid_items.clear()
+        for name in LAYERS:
+            self.clear_layer(name)
+        self._scene_rect = QRectF()
+        self._grid_item = None
         self.origin_items.clear()
 
+    # While a full board is being drawn the scene skips its BSP index, which would
+    # otherwise be updated on every insertion; the index is rebuilt once at the end.
+
+    # bounds (minx, miny, maxx, maxy) of the board about to be drawn, if known, let the
+    # draw helpers drop sub-pixel detail at the zoom the following fit() will show.
+
+    def begin_bulk_draw(self, bounds=None):
+        self.scene.setItemIndexMethod(QGraphicsScene.NoIndex)
+        self._draw_px_per_mm = self._fit_scale(bounds)
+
+    def end_bulk_draw(self):
+        self._draw_px_per_mm = 0.0
+        self.scene.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
+        self.scene.setBspTreeDepth(0)  # 0 = let Qt pick the depth
+
+    def _fit_scale(self, bounds):
+        # fit() frames at least these bounds (plus grid and margin) in the viewport, so
+        # this never underestimates the zoom. Before the window is shown the viewport
+        # has no real size yet, so no estimate is made.
+        if bounds is None or not self.window().isVisible():
+            return 0.0
+        w = bounds[2] - bounds[0]
+        h = bounds[3] - bounds[1]
+        if not (w > 0 or h > 0):
+            return 0.0
+        vp = self.view.viewport().size()
+        return min(vp.width() / w if w > 0 else np.inf, vp.height() / h if h > 0 else np.inf)
+
     # --------------------------------------------------
     # SHAPELY DRAW HELPERS
     # --------------------------------------------------
 
+    def _track(self, item, layer):
+        item.setParentItem(self.layers[layer])
+        self._scene_rect = self._scene_rect.united(item.sceneBoundingRect())
+        return item
+
     def _iter_geom(self, geom):
         if geom is None or geom.is_empty:
             return
@@ -139,41 +219,79 @@ class PreviewWidget(QWidget):
             for g in geom.geoms:
                 yield from self._iter_geom(g)
 
-    def _draw_linestring(self, pts, pen):
-        if not pts or len(pts) < 2:
+    @staticmethod
+    def _coords(geom):
+        # (N, 2) float64 array of a line/ring's coordinates (Z dropped), no per-point tuples.
+        return shapely.get_coordinates(geom)
+
+    @staticmethod
+    def _qpolygonf(pts):
+        # QPolygonF stores its points as contiguous (x, y) doubles, so fill that storage
+        # from the numpy array in one copy instead of creating a QPointF per vertex.
+        n = len(pts)
+        poly = QPolygonF()
+        try:
+            poly.resize(n)
+            buf = shiboken6.VoidPtr(poly.data(), n * 16, True)
+            np.frombuffer(buf, dtype=np.float64).reshape(n, 2)[:] = pts
+        except Exception:
+            poly = QPolygonF([QPointF(x, y) for x, y in pts.tolist()])
+        return poly
+
+    # Outlines go into one QPainterPath per draw call (one scene item) rather than one
+    # QGraphicsLineItem per segment; each line or ring is added as an unclosed subpath.
+
+    def _px_per_mm(self):
+        # Zoom the current bulk draw will be shown at, or 0 when it is not known.
+        return self._draw_px_per_mm
+
+    @staticmethod
+    def _cull_subpixel(pts, m):
+        # Drop vertices that land on the same pixel as the previous one (first/last always kept).
+        if m <= 0 or len(pts) < 3:
+            return pts
+        px = np.floor(pts * m)
+        keep = np.empty(len(pts), dtype=bool)
+        keep[0] = keep[-1] = True
+        keep[1:-1] = np.any(px[1:-1] != px[:-2], axis=1)
+        return pts[keep]
+
+    def _simplify_subpixel(self, poly, m):
+        if m <= 0:
+            return poly
+        return shapely.simplify(poly, 0.5 / m)
+
+    def _path_add_linestring(self, path, pts, m=0.0):
+        pts = self._cull_subpixel(pts, m)
+        if len(pts) < 2:
             return
-        for i in range(len(pts) - 1):
-            self.scene.addLine(
-                pts[i][0], pts[i][1],
-                pts[i + 1][0], pts[i + 1][1],
-                pen
-            )
-
-    def _draw_polygon_outline(self, poly, pen):
-        pts = list(poly.exterior.coords)
-        self._draw_linestring(pts, pen)
-
-    def draw_geom_outline(self, geom, color):
+        path.addPolygon(self._qpolygonf(pts))
+
+    def _path_add_polygon_outline(self, path, poly, m=0.0):
+        poly = self._simplify_subpixel(poly, m)
+        if poly.is_empty:
+            return
+        self._path_add_linestring(path, self._coords(poly.exterior), m)
+        for ring in poly.interiors:
+            self._path_add_linestring(path, self._coords(ring), m)
+
+    def draw_geom_outline(self, geom, color, layer="through"):
         if geom is None or geom.is_empty:
             return
         pen = QPen(color)
         pen.setWidthF(0)
         pen.setCosmetic(True)
+        m = self._px_per_mm()
+        path = QPainterPath()
         for g in self._iter_geom(geom):
             if isinstance(g, Polygon):
-                self._draw_polygon_outline(g, pen)
+                self._path_add_polygon_outline(path, g, m)
             elif isinstance(g, LineString):
-                self._draw_linestring(list(g.coords), pen)
+                self._path_add_linestring(path, self._coords(g), m)
+        if not path.isEmpty():
+            self._track(self.scene.addPath(path, pen), layer)
 
-    def _line_to_path(self, pts):
-        if not pts or len(pts) < 2:
-            return QPainterPath()
-        p = QPainterPath(QPointF(pts[0][0], pts[0][1]))
-        for x, y in pts[1:]:
-            p.lineTo(QPointF(x, y))
-        return p
-
-    def draw_geom_filled(self, geom, outline_color, fill_color, fill_alpha=80, z=0):
+    def draw_geom_filled(self, geom, outline_color, fill_color, fill_alpha=80, z=0, layer="through"):
         if geom is None or geom.is_empty:
             return
 
@@ -184,34 +302,45 @@ class PreviewWidget(QWidget):
         fill = QColor(fill_color)
         fill.setAlpha(fill_alpha)
         brush = QBrush(fill)
+        m = self._px_per_mm()
+
+        # All polygons go into one filled path (rings as closed subpaths, OddEvenFill
+        # leaves interiors open) and all lines into one stroked path: two items at most.
+        fill_path = QPainterPath()
+        fill_path.setFillRule(Qt.OddEvenFill)
+        line_path = QPainterPath()
 
         for g in self._iter_geom(geom):
             if isinstance(g, Polygon):
-                pts = list(g.exterior.coords)
-                if len(pts) < 3:
+                g = self._simplify_subpixel(g, m)
+                if g.is_empty:
                     continue
-                qpoly = QPolygonF([QPointF(float(x), float(y)) for x, y in pts])
-                item = self.scene.addPolygon(qpoly, pen, brush)
-                item.setZValue(z)
+                for ring in (g.exterior, *g.interiors):
+                    pts = self._cull_subpixel(self._coords(ring), m)
+                    if len(pts) < 3:
+                        continue
+                    fill_path.addPolygon(self._qpolygonf(pts))
+                    fill_path.closeSubpath()
             elif isinstance(g, LineString):
-                pts = list(g.coords)
-                if len(pts) < 2:
-                    continue
-                item = self.scene.addPath(self._line_to_path(pts), pen)
-                item.setZValue(z)
+                self._path_add_linestring(line_path, self._coords(g), m)
+
+        if not fill_path.isEmpty():
+            self._track(self.scene.addPath(fill_path, pen, brush), layer).setZValue(z)
+        if not line_path.isEmpty():
+            self._track(self.scene.addPath(line_path, pen), layer).setZValue(z)
 
     # --------------------------------------------------
     # SEMANTIC LAYERS
     # --------------------------------------------------
 
     def draw_copper_isolation(self, geom):
-        self.draw_geom_outline(geom, COLOR_COPPER_ISO)
+        self.draw_geom_outline(geom, COLOR_COPPER_ISO, "copper_iso")
 
     def draw_soldermask_clear(self, geom):
-        self.draw_geom_outline(geom, COLOR_MASK_CLEAR)
+        self.draw_geom_outline(geom, COLOR_MASK_CLEAR, "mask")
 
     def draw_silkscreen(self, geom):
-        self.draw_geom_outline(geom, COLOR_SILK)
+        self.draw_geom_outline(geom, COLOR_SILK, "silk")
 
     def draw_through_outline(self, geom):
         self.draw_geom_outline(geom, COLOR_THROUGH)
@@ -223,24 +352,53 @@ class PreviewWidget(QWidget):
 
         fill = QBrush(QColor(COLOR_THROUGH.red(), COLOR_THROUGH.green(), COLOR_THROUGH.blue(), 80))
 
-        for x, y, d in drills:
-            r = max(float(d) / 2.0, 0.15)
-            item = self.scene.addEllipse(
-                x - r, y - r, r * 2, r * 2,
-                pen, fill
-            )
-            item.setZValue(1000)
+        drills = np.asarray(drills, dtype=np.float64).reshape(-1, 3)
+        if not len(drills):
+            return
+
+        # All holes as circles in one path item rather than one ellipse item per drill.
+        # WindingFill so overlapping holes stay filled where they intersect.
+        path = QPainterPath()
+        path.setFillRule(Qt.WindingFill)
+        r = np.maximum(drills[:, 2] / 2.0, 0.15)
+        for x, y, rr in zip((drills[:, 0] - r).tolist(), (drills[:, 1] - r).tolist(), r.tolist()):
+            path.addEllipse(QRectF(x, y, rr * 2, rr * 2))
+        item = self._track(self.scene.addPath(path, pen, fill), "holes")
+        item.setZValue(1000)
 
     def draw_through_slots(self, slots):
-        # slots: [((x1,y1),(x2,y2), width_mm)]
-        from shapely.geometry import LineString as ShLine
-        for (p1, p2, w) in slots:
-            try:
-                seg = ShLine([p1, p2])
-                poly = seg.buffer(float(w) / 2.0, cap_style=1, join_style=1)
-                self.draw_geom_outline(poly, COLOR_THROUGH)
-            except Exception:
-                continue
+        # slots: (N, 5) array of x1, y1, x2, y2, width_mm rows
+        slots = np.asarray(slots, dtype=np.float64).reshape(-1, 5)
+        keys = [(x1, y1, x2, y2, round(w, 6)) for x1, y1, x2, y2, w in slots.tolist()]
+        missing = [i for i, k in enumerate(keys) if k not in self._slot_cache]
+        if missing:
+            if len(self._slot_cache) + len(missing) > self._SLOT_CACHE_MAX:
+                self._slot_cache.clear()
+            for i, poly in zip(missing, self._buffer_slots(slots[missing])):
+                self._slot_cache[keys[i]] = poly
+        polys = [self._slot_cache[k] for k in keys]
+        self.draw_geom_outline(GeometryCollection([p for p in polys if p is not None]), COLOR_THROUGH)
+
+    @staticmethod
+    def _buffer_slots(slots):
+        # One polygon (or None on failure) per slot row, in order.
+        try:
+            # Same shapes as LineString([p1, p2]).buffer(w / 2, cap_style=1, join_style=1), in one call.
+            polys = shapely.buffer(
+                shapely.linestrings(slots[:, :4].reshape(-1, 2, 2)),
+                slots[:, 4] / 2.0,
+                quad_segs=16,
+                cap_style="round",
+                join_style="round",
+            ).tolist()
+        except Exception:
+            polys = []
+            for x1, y1, x2, y2, w in slots.tolist():
+                try:
+                    polys.append(LineString([(x1, y1), (x2, y2)]).buffer(w / 2.0, cap_style=1, join_style=1))
+                except Exception:
+                    polys.append(None)
+        return polys
 
     # --------------------------------------------------
     # ORIGIN
@@ -251,25 +409,19 @@ class PreviewWidget(QWidget):
         pen.setCosmetic(True)
         pen.setWidthF(0)
 
-        self.origin_items.append(self.scene.addLine(-size, 0, size, 0, pen))
-        self.origin_items.append(self.scene.addLine(0, -size, 0, size, pen))
+        self.origin_items.append(self._track(self.scene.addLine(-size, 0, size, 0, pen), "origin"))
+        self.origin_items.append(self._track(self.scene.addLine(0, -size, 0, size, pen), "origin"))
 
     # --------------------------------------------------
     # GRID
     # --------------------------------------------------
 
     def draw_grid(self):
-        rect = self.scene.itemsBoundingRect()
+        # Tracked content bounds exclude the grid itself, so a redraw doesn't grow the grid.
+        rect = QRectF(self._scene_rect)
         if rect.isNull():
             return
 
-        for item in self.grid_items:
-            try:
-                self.scene.removeItem(item)
-            except Exception:
-                pass
-        self.grid_items.clear()
-
         w = max(rect.width(), rect.height())
 
         if w < 20:
@@ -283,33 +435,62 @@ class PreviewWidget(QWidget):
         else:
             step = 50
 
+        key = (round(rect.left(), 3), round(rect.right(), 3), round(rect.top(), 3), round(rect.bottom(), 3), step)
+        if self._grid_item is not None and key == self._grid_key:
+            return
+
+        if self._grid_item is not None:
+            try:
+                self.scene.removeItem(self._grid_item)
+            except Exception:
+                pass
+            self._grid_item = None
+
         self.grid_label.setText(f"Grid: {step} mm")
 
         pen = QPen(COLOR_GRID)
         pen.setWidthF(0)
         pen.setCosmetic(True)
 
+        if key == self._grid_key:
+            self._grid_item = self.scene.addPath(self._grid_path, pen)
+            self._grid_item.setParentItem(self.layers["grid"])
+            return
+
         left = rect.left() - step
         right = rect.right() + step
         top = rect.top() - step
         bottom = rect.bottom() + step
 
+        # One path item for the whole grid, so replacing it is a single removeItem.
+        path = QPainterPath()
+
         x = int(left // step) * step
         while x <= right:
-            self.grid_items.append(self.scene.addLine(x, top, x, bottom, pen))
+            path.moveTo(x, top)
+            path.lineTo(x, bottom)
             x += step
 
         y = int(top // step) * step
         while y <= bottom:
-            self.grid_items.append(self.scene.addLine(left, y, right, y, pen))
+            path.moveTo(left, y)
+            path.lineTo(right, y)
             y += step
 
+        self._grid_key = key
+        self._grid_path = path
+        self._grid_item = self.scene.addPath(path, pen)
+        self._grid_item.setParentItem(self.layers["grid"])
+
     # --------------------------------------------------
     # FIT
     # --------------------------------------------------
 
     def fit(self):
-        rect = self.scene.itemsBoundingRect()
+        # Same rect as scene.itemsBoundingRect(): tracked content plus the grid.
+        rect = QRectF(self._scene_rect)
+        if self._grid_item is not None:
+            rect = rect.united(self._grid_item.sceneBoundingRect())
         if rect.isNull():
             return
 
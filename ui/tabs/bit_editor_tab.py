@@ -1,5 +1,8 @@
 # ui/tabs/bit_editor_tab.py
 
+import bisect
+import io
+
 from PySide6.QtWidgets import (
     QWidget,
     QListWidget,
@@ -9,7 +12,36 @@ from PySide6.QtWidgets import (
     QHBoxLayout,
     QMessageBox,
 )
-from PySide6.QtCore import Signal, Qt
+from PySide6.QtCore import Signal, Slot, Qt, QObject, QRunnable, QThreadPool, QTimer, QCoreApplication
+
+from bitlib import _bits_path, forget_cached_bits, invalidate_bit_dicts
+
+WRITE_DEBOUNCE_MS = 150
+
+
+class _BitsWriteSignals(QObject):
+    # (generation, exception or None)
+    finished = Signal(int, object)
+
+
+class _BitsWriteWorker(QRunnable):
+    """Writes an already-serialised bits.ini off the UI thread."""
+
+    def __init__(self, path, text, generation):
+        super().__init__()
+        self.path = path
+        self.text = text
+        self.generation = generation
+        self.signals = _BitsWriteSignals()
+
+    def run(self):
+        try:
+            with open(self.path, "w") as f:
+                f.write(self.text)
+            error = None
+        except Exception as e:
+            error = e
+        self.signals.finished.emit(self.generation, error)
 
 
 class BitEditorTab(QWidget):
@@ -32,6 +64,24 @@ class BitEditorTab(QWidget):
         super().__init__()
         self.state = state
 
+        # Edits land in state.bits immediately; the file write is debounced and runs on a
+        # single-thread pool so writes hit the disk in order. Only the newest write
+        # reloads bits and emits bitsFileChanged.
+        self._write_generation = 0
+        # Absolute bits.ini path of the latest write, resolved on the UI thread (run_job
+        # chdirs into the board folder while it runs).
+        self._write_path = None
+        self._write_workers = set()
+        self._write_pool = QThreadPool(self)
+        self._write_pool.setMaxThreadCount(1)
+        self._write_timer = QTimer(self)
+        self._write_timer.setSingleShot(True)
+        self._write_timer.setInterval(WRITE_DEBOUNCE_MS)
+        self._write_timer.timeout.connect(self._start_write)
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.flush_pending_write)
+
         layout = QHBoxLayout()
 
         self.list = QListWidget()
@@ -104,6 +154,41 @@ class BitEditorTab(QWidget):
         if self.list.count() > 0:
             self.list.setCurrentRow(0)
 
+    def _sorted_row(self, name: str) -> int:
+        # Row where `name` belongs in the case-insensitively sorted list.
+        keys = [self.list.item(i).text().lower() for i in range(self.list.count())]
+        return bisect.bisect_right(keys, name.lower())
+
+    def _select(self, name: str = None):
+        items = self.list.findItems(name, Qt.MatchExactly) if name else []
+        self.list.blockSignals(True)
+        if items:
+            self.list.setCurrentItem(items[0])
+        elif self.list.count() > 0:
+            self.list.setCurrentRow(0)
+        self.list.blockSignals(False)
+        self.load_bit(self.list.currentItem())
+
+    def refresh_one(self, kind: str, name: str, old_name: str = None):
+        # Incremental counterpart of refresh() for a single edited bit:
+        # kind is "add", "remove", "rename" (old_name -> name) or "update".
+        self.list.blockSignals(True)
+        try:
+            if kind == "add":
+                self.list.insertItem(self._sorted_row(name), name)
+            elif kind == "remove":
+                for item in self.list.findItems(name, Qt.MatchExactly):
+                    self.list.takeItem(self.list.row(item))
+            elif kind == "rename":
+                items = self.list.findItems(old_name, Qt.MatchExactly)
+                if items:
+                    self.list.takeItem(self.list.row(items[0]))
+                self.list.insertItem(self._sorted_row(name), name)
+        finally:
+            self.list.blockSignals(False)
+
+        self._select(None if kind == "remove" else name)
+
     def load_bit(self, item):
         if not item:
             self.name_edit.setText("")
@@ -117,11 +202,60 @@ class BitEditorTab(QWidget):
             field.setText(self.state.bits.get(name, k, fallback=""))
 
     def _write_bits_ini(self):
-        with open("bits.ini", "w") as f:
-            self.state.bits.write(f)
+        # Schedule (or re-schedule) a write; a burst of edits costs one write + reload.
+        # state.bits was just edited in memory, so its memoized bit dicts are stale.
+        invalidate_bit_dicts(self.state.bits)
+        self._write_generation += 1
+        self._write_timer.start()
+
+    def _serialised_bits(self):
+        buf = io.StringIO()
+        self.state.bits.write(buf)
+        return buf.getvalue()
+
+    @Slot()
+    def _start_write(self):
+        # Serialise on the UI thread so the worker never touches the live parser.
+        self._write_path = _bits_path()
+        worker = _BitsWriteWorker(self._write_path, self._serialised_bits(), self._write_generation)
+        worker.signals.finished.connect(self._on_write_finished)
+        self._write_workers.add(worker)
+        self._write_pool.start(worker)
+
+    @Slot(int, object)
+    def _on_write_finished(self, generation, error):
+        self._write_workers = {w for w in self._write_workers if w.generation > generation}
+        if error is not None:
+            # The edited parser is still cached under the old file stamp; don't serve it
+            # as if it matched the file.
+            forget_cached_bits(self._write_path)
+            QMessageBox.warning(self, "bits.ini", f"Could not write bits.ini:\n{error}")
+            return
+        if generation != self._write_generation:
+            # A newer edit is pending; its write will reload and notify.
+            return
         self.state.reload_bits()
         self.bitsFileChanged.emit()
 
+    @Slot()
+    def flush_pending_write(self):
+        """Write any pending edits synchronously (before a job runs, on quit)."""
+        if not self._write_timer.isActive():
+            self._write_pool.waitForDone()
+            return
+        self._write_timer.stop()
+        self._write_pool.waitForDone()
+        # Supersede results of earlier writes still queued for this thread.
+        self._write_generation += 1
+        self._write_path = _bits_path()
+        try:
+            with open(self._write_path, "w") as f:
+                f.write(self._serialised_bits())
+            error = None
+        except Exception as e:
+            error = e
+        self._on_write_finished(self._write_generation, error)
+
     def save_bit(self):
         item = self.list.currentItem()
         if not item:
@@ -150,7 +284,10 @@ class BitEditorTab(QWidget):
             self.state.bits.set(new_name, k, field.text())
 
         self._write_bits_ini()
-        self.refresh(select_name=new_name)
+        if new_name != old_name:
+            self.refresh_one("rename", new_name, old_name)
+        else:
+            self.refresh_one("update", new_name)
 
     def add_bit(self):
         # Copy currently selected bit (if any)
@@ -168,7 +305,7 @@ class BitEditorTab(QWidget):
                 self.state.bits.set(new_name, k, "")
 
         self._write_bits_ini()
-        self.refresh(select_name=new_name)
+        self.refresh_one("add", new_name)
 
     def delete_bit(self):
         item = self.list.currentItem()
@@ -181,4 +318,4 @@ class BitEditorTab(QWidget):
 
         self.state.bits.remove_section(name)
         self._write_bits_ini()
-        self.refresh()
+        self.refresh_one("remove", name)
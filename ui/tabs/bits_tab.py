@@ -12,7 +12,7 @@ from PySide6.QtWidgets import (
     QListWidgetItem,
 )
 from PySide6.QtCore import Signal, Qt
-from bitlib import save_settings, bit_dict
+from bitlib import save_settings, bit_dict, is_reasonable_for_op
 
 
 OPS = [
@@ -24,28 +24,6 @@ OPS = [
 ]
 
 
-def _type_tag(bit_type: str) -> str:
-    t = (bit_type or "").strip().lower()
-    if "drill" in t:
-        return "drill"
-    if "v" in t or "engrave" in t or "conic" in t:
-        return "vbit"
-    if "flat" in t or "end" in t or "mill" in t or "router" in t:
-        return "mill"
-    return "unknown"
-
-
-def _is_reasonable_for_op(op: str, btype: str) -> bool:
-    tag = _type_tag(btype)
-    if op == "drilling":
-        return tag == "drill"
-    if op in ("board_outline", "soldermask_clear"):
-        return tag == "mill"
-    if op in ("copper_isolation", "silkscreen"):
-        return tag in ("vbit", "mill")  # allow small endmills for silk if user wants
-    return True
-
-
 class BitsTab(QWidget):
     bitsChanged = Signal()
 
@@ -56,6 +34,7 @@ class BitsTab(QWidget):
         self.boxes = {}          # op -> QComboBox
         self.drill_list = None   # QListWidget
         self.drill_info = None   # QLabel
+        self._check_order = []   # checked drill names, oldest first
 
         layout = QVBoxLayout()
 
@@ -102,25 +81,30 @@ class BitsTab(QWidget):
         save_settings(self.state.settings)
         self.bitsChanged.emit()
 
-    def _filtered_names_for_op(self, op: str):
-        names = list(self.state.bits.sections())
-        if self.show_all.isChecked():
-            return names
-
-        out = []
-        for n in names:
+    def _bit_types(self):
+        # name -> type for every readable bit, parsed once per refresh rather than once per op.
+        types = {}
+        for n in self.state.bits.sections():
             try:
-                b = bit_dict(self.state.bits, n)
-                if _is_reasonable_for_op(op, b.get("type", "")):
-                    out.append(n)
+                types[n] = bit_dict(self.state.bits, n).get("type", "")
             except Exception:
                 continue
-        return out
+        return types
+
+    def _filtered_names_for_op(self, op: str, types=None):
+        if self.show_all.isChecked():
+            return list(self.state.bits.sections())
+
+        if types is None:
+            types = self._bit_types()
+        return [n for n, t in types.items() if is_reasonable_for_op(op, t)]
 
     def refresh_bits_list(self):
+        types = None if self.show_all.isChecked() else self._bit_types()
+
         # Non-drill ops: combo boxes
         for op, box in self.boxes.items():
-            names = self._filtered_names_for_op(op)
+            names = self._filtered_names_for_op(op, types)
 
             current = box.currentText().strip()
             box.blockSignals(True)
@@ -140,7 +124,7 @@ class BitsTab(QWidget):
 
         # Drilling: multi-select list
         if self.drill_list is not None:
-            names = self._filtered_names_for_op("drilling")
+            names = self._filtered_names_for_op("drilling", types)
 
             # Load selected drill names from settings: [drilling] bits = a,b,c
             sel = self.state.settings.get("drilling", "bits", fallback="").strip()
@@ -157,6 +141,9 @@ class BitsTab(QWidget):
 
             self.drill_list.blockSignals(False)
 
+            listed = set(names)
+            self._check_order = [n for n in dict.fromkeys(selected) if n in listed]
+
         self._apply_drill_mode_ui()
 
     def _apply_drill_mode_ui(self):
@@ -184,34 +171,31 @@ class BitsTab(QWidget):
         else:
             self.drill_info.setText("AUTO SELECTED (no drills available / no drills needed)")
 
-    def _drill_item_changed(self, _item):
+    def _drill_item_changed(self, item):
         if getattr(self.state, "drill_control", "auto") == "auto":
             return
 
         max_n = int(getattr(self.state, "max_drills", 3))
 
-        selected = []
-        for i in range(self.drill_list.count()):
-            it = self.drill_list.item(i)
-            if it.checkState() == Qt.Checked:
-                selected.append(it.text())
+        # Track checks in the order they happen so only the oldest excess one is unchecked.
+        name = item.text()
+        if item.checkState() == Qt.Checked:
+            if name not in self._check_order:
+                self._check_order.append(name)
+        elif name in self._check_order:
+            self._check_order.remove(name)
 
         # Enforce max selection
-        if len(selected) > max_n:
-            # Uncheck the last toggled item by trimming extras from the end
-            # (Qt doesn't tell us reliably which one is last across signals)
-            # So we uncheck from bottom until within limit.
+        if len(self._check_order) > max_n:
             self.drill_list.blockSignals(True)
-            for i in range(self.drill_list.count() - 1, -1, -1):
-                it = self.drill_list.item(i)
-                if it.checkState() == Qt.Checked and len(selected) > max_n:
+            while len(self._check_order) > max_n:
+                for it in self.drill_list.findItems(self._check_order.pop(0), Qt.MatchExactly):
                     it.setCheckState(Qt.Unchecked)
-                    selected.remove(it.text())
             self.drill_list.blockSignals(False)
 
         if not self.state.settings.has_section("drilling"):
             self.state.settings.add_section("drilling")
-        self.state.settings.set("drilling", "bits", ",".join(selected))
+        self.state.settings.set("drilling", "bits", ",".join(self._check_order))
 
         self.bitsChanged.emit()
 
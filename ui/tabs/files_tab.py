@@ -4,9 +4,16 @@
 #   (prevents "no output" confusion when output_dir was some other working directory)
 
 import os
+import re
 import glob
 import zipfile
 import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import fcntl
+except ImportError:  # not on Windows; reflink copies are Linux-only anyway
+    fcntl = None
 
 from PySide6.QtWidgets import (
     QWidget,
@@ -21,23 +28,74 @@ from PySide6.QtWidgets import (
     QMessageBox,
     QLineEdit,
 )
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, Signal, Slot, QObject, QRunnable, QThreadPool, QFileSystemWatcher
+
+from job_config import _normalize_file_prefix
+
+
+# ioctl(dst_fd, FICLONE, src_fd): copy-on-write clone on btrfs/XFS.
+_FICLONE = 0x40049409
+
+# Folder name prefix of the app-owned directories ZIPs are extracted into.
+_UNZIP_DIR_PREFIX = "_gerber_unzip_"
+
+# Canonical "<prefix><suffix>" layer files and the EasyEDA extensions they are copied from
+# (first match in folder order). Drill files are handled separately.
+_CANONICAL_MAP = (
+    ("-TopLayer.gbr", (".gtl",)),
+    ("-BottomLayer.gbr", (".gbl",)),
+    ("-TopSilkLayer.gbr", (".gto",)),
+    ("-BottomSilkLayer.gbr", (".gbo",)),
+    ("-TopSolderMaskLayer.gbr", (".gts",)),
+    ("-BottomSolderMaskLayer.gbr", (".gbs",)),
+    ("-TopPasteLayer.gbr", (".gtp",)),
+    ("-BottomPasteLayer.gbr", (".gbp",)),
+    ("-BoardOutLine.gbr", (".gko", ".gml")),
+    ("-DocLayer.gbr", (".gdl",)),
+)
+
+# Extensions offered by the file dialog; only these are pulled out of a ZIP.
+GERBER_EXTS = (
+    ".gbr", ".gtl", ".gbl", ".gko", ".gml", ".gts", ".gbs",
+    ".gto", ".gbo", ".gtp", ".gbp", ".gdl", ".drl", ".txt",
+)
+
+# "<prefix><suffix>" for the layer names detect_prefix recognises. None of these suffixes
+# ends another one, so at most one alternative can match.
+_LAYER_SUFFIXES = (
+    "-TopLayer.gbr",
+    "-BottomLayer.gbr",
+    "-TopSolderMaskLayer.gbr",
+    "-BottomSolderMaskLayer.gbr",
+    "-TopSilkLayer.gbr",
+    "-BottomSilkLayer.gbr",
+    "-TopPasteLayer.gbr",
+    "-BottomPasteLayer.gbr",
+    "-BoardOutLine.gbr",
+    "-PTH.drl",
+    "-NPTH.drl",
+    "-DocLayer.gbr",
+)
+_LAYER_SUFFIX_RE = re.compile(r"(.*)(?:" + "|".join(map(re.escape, _LAYER_SUFFIXES)) + r")", re.S)
 
 
-def _normalize_file_prefix(p: str) -> str:
-    p = (p or "").strip()
-    if not p:
-        return ""
-    safe = []
-    for ch in p:
-        if ch.isalnum() or ch in ("-", "_"):
-            safe.append(ch)
-    p = "".join(safe)
-    if not p:
-        return ""
-    if not (p.endswith("_") or p.endswith("-")):
-        p += "_"
-    return p
+class _GerberLoadSignals(QObject):
+    # (generation, result dict from FilesTab._load_gerber)
+    finished = Signal(int, object)
+
+
+class _GerberLoadWorker(QRunnable):
+    """Extracts / scans / canonicalises a picked Gerber or ZIP off the UI thread."""
+
+    def __init__(self, tab, fn, generation):
+        super().__init__()
+        self.tab = tab
+        self.fn = fn
+        self.generation = generation
+        self.signals = _GerberLoadSignals()
+
+    def run(self):
+        self.signals.finished.emit(self.generation, self.tab._load_gerber(self.fn))
 
 
 class FilesTab(QWidget):
@@ -47,6 +105,23 @@ class FilesTab(QWidget):
         super().__init__()
         self.state = state
 
+        # Picked files are loaded on a single-thread pool (so loads never overlap and the
+        # folder cache is only touched by one worker); only the newest pick is applied.
+        self._load_generation = 0
+        self._load_workers = set()
+        self._load_pool = QThreadPool(self)
+        self._load_pool.setMaxThreadCount(1)
+
+        # Layer key -> QListWidgetItem, reused across rebuilds of layer_list.
+        self._layer_items = {}
+
+        # gerber_dir -> (st_mtime_ns, snapshot); see _dir_snapshot.
+        self._dir_cache = {}
+        # The mtime check misses changes on coarse-mtime filesystems (FAT, some SMB
+        # shares); the watcher drops the current folder's entry whenever it changes.
+        self._fs_watcher = QFileSystemWatcher(self)
+        self._fs_watcher.directoryChanged.connect(self._invalidate_dir_cache)
+
         # Tracks whether user explicitly set output dir
         if not hasattr(self.state, "output_dir_user_set"):
             self.state.output_dir_user_set = False
@@ -128,177 +203,274 @@ class FilesTab(QWidget):
     def _extract_zip_to_workdir(self, zip_path: str) -> str:
         base_dir = os.path.dirname(zip_path)
         base_name = os.path.splitext(os.path.basename(zip_path))[0]
-        work_dir = os.path.join(base_dir, f"_gerber_unzip_{base_name}")
+        work_dir = os.path.join(base_dir, f"{_UNZIP_DIR_PREFIX}{base_name}")
         self._safe_mkdir(work_dir)
 
         with zipfile.ZipFile(zip_path, "r") as z:
-            z.extractall(work_dir)
-
-        # If ZIP contains a single top-level folder, use it
-        entries = [os.path.join(work_dir, p) for p in os.listdir(work_dir)]
-        folders = [p for p in entries if os.path.isdir(p)]
-        files = [p for p in entries if os.path.isfile(p)]
-        if len(folders) == 1 and len(files) == 0:
-            return folders[0]
+            # Only Gerber/drill members; 3D models, PDFs, BOMs etc. are skipped. The central
+            # directory alone tells us whether they all share one top-level folder.
+            members = []
+            for info in z.infolist():
+                if info.is_dir() or os.path.splitext(info.filename)[1].lower() not in GERBER_EXTS:
+                    continue
+                parts = self._zip_member_parts(info.filename)
+                if parts:
+                    members.append((info, parts))
+
+            # Strip that shared folder so files land directly in work_dir.
+            tops = {parts[0] if len(parts) > 1 else None for _, parts in members}
+            strip = 1 if len(tops) == 1 and None not in tops else 0
+
+            for info, parts in members:
+                target = os.path.join(work_dir, *parts[strip:])
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with z.open(info) as src, open(target, "wb") as dst:
+                    shutil.copyfileobj(src, dst, 1 << 20)
+
         return work_dir
 
-    def _copy_if_exists(self, src, dst):
-        if src and os.path.exists(src):
-            shutil.copyfile(src, dst)
-            return True
-        return False
-
-    def _find_best_easyeda_file(self, gerber_dir: str, wanted_exts):
-        for fn in os.listdir(gerber_dir):
-            low = fn.lower()
-            for ext in wanted_exts:
-                if low.endswith(ext.lower()):
-                    return os.path.join(gerber_dir, fn)
-        return None
-
-    def _ensure_canonical_easyeda(self, gerber_dir: str, prefix: str):
-        targets = {
-            "top_copper": os.path.join(gerber_dir, f"{prefix}-TopLayer.gbr"),
-            "bot_copper": os.path.join(gerber_dir, f"{prefix}-BottomLayer.gbr"),
-            "top_silk": os.path.join(gerber_dir, f"{prefix}-TopSilkLayer.gbr"),
-            "bot_silk": os.path.join(gerber_dir, f"{prefix}-BottomSilkLayer.gbr"),
-            "top_mask": os.path.join(gerber_dir, f"{prefix}-TopSolderMaskLayer.gbr"),
-            "bot_mask": os.path.join(gerber_dir, f"{prefix}-BottomSolderMaskLayer.gbr"),
-            "outline": os.path.join(gerber_dir, f"{prefix}-BoardOutLine.gbr"),
-            "pth": os.path.join(gerber_dir, f"{prefix}-PTH.drl"),
-            "npth": os.path.join(gerber_dir, f"{prefix}-NPTH.drl"),
-            "top_paste": os.path.join(gerber_dir, f"{prefix}-TopPasteLayer.gbr"),
-            "bot_paste": os.path.join(gerber_dir, f"{prefix}-BottomPasteLayer.gbr"),
-            "doc": os.path.join(gerber_dir, f"{prefix}-DocLayer.gbr"),
-        }
-
-        def need(path):
-            return not os.path.exists(path)
-
-        src_top_copper = self._find_best_easyeda_file(gerber_dir, [".gtl"])
-        src_bot_copper = self._find_best_easyeda_file(gerber_dir, [".gbl"])
-        src_top_silk = self._find_best_easyeda_file(gerber_dir, [".gto"])
-        src_bot_silk = self._find_best_easyeda_file(gerber_dir, [".gbo"])
-        src_top_mask = self._find_best_easyeda_file(gerber_dir, [".gts"])
-        src_bot_mask = self._find_best_easyeda_file(gerber_dir, [".gbs"])
-        src_top_paste = self._find_best_easyeda_file(gerber_dir, [".gtp"])
-        src_bot_paste = self._find_best_easyeda_file(gerber_dir, [".gbp"])
-        src_outline = self._find_best_easyeda_file(gerber_dir, [".gko", ".gml"])
-        src_doc = self._find_best_easyeda_file(gerber_dir, [".gdl"])
-
-        if need(targets["top_copper"]):
-            self._copy_if_exists(src_top_copper, targets["top_copper"])
-        if need(targets["bot_copper"]):
-            self._copy_if_exists(src_bot_copper, targets["bot_copper"])
-        if need(targets["top_silk"]):
-            self._copy_if_exists(src_top_silk, targets["top_silk"])
-        if need(targets["bot_silk"]):
-            self._copy_if_exists(src_bot_silk, targets["bot_silk"])
-        if need(targets["top_mask"]):
-            self._copy_if_exists(src_top_mask, targets["top_mask"])
-        if need(targets["bot_mask"]):
-            self._copy_if_exists(src_bot_mask, targets["bot_mask"])
-        if need(targets["top_paste"]):
-            self._copy_if_exists(src_top_paste, targets["top_paste"])
-        if need(targets["bot_paste"]):
-            self._copy_if_exists(src_bot_paste, targets["bot_paste"])
-        if need(targets["outline"]):
-            self._copy_if_exists(src_outline, targets["outline"])
-        if need(targets["doc"]):
-            self._copy_if_exists(src_doc, targets["doc"])
-
-        drill_candidates = []
-        for fn in os.listdir(gerber_dir):
-            low = fn.lower()
-            if low.endswith(".drl") or low.endswith(".txt"):
-                drill_candidates.append(os.path.join(gerber_dir, fn))
-        drill_candidates.sort()
+    @staticmethod
+    def _zip_member_parts(name: str):
+        # Same sanitising as ZipFile.extract(): no drive, no root, no "." / ".." components.
+        name = name.replace("/", os.sep)
+        if os.altsep:
+            name = name.replace(os.altsep, os.sep)
+        name = os.path.splitdrive(name)[1]
+        return [p for p in name.split(os.sep) if p not in ("", os.curdir, os.pardir)]
+
+    def _dir_snapshot(self, gerber_dir: str):
+        """One os.scandir pass over gerber_dir, reused for every presence/extension probe.
+
+        Returns (names, present, ext_index): entry names in listing order, their
+        os.path.normcase forms (so lookups follow the platform's case rules), and
+        lower-case extension -> indices into names.
+
+        Cached per folder on its st_mtime_ns, so re-picking an unchanged folder costs one stat.
+        """
+        mtime = os.stat(gerber_dir).st_mtime_ns
+        cached = self._dir_cache.get(gerber_dir)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        with os.scandir(gerber_dir) as it:
+            names = [e.name for e in it]
+        present = {os.path.normcase(n) for n in names}
+        ext_index = {}
+        for i, n in enumerate(names):
+            ext_index.setdefault(os.path.splitext(n)[1].lower(), []).append(i)
+        snap = (names, present, ext_index)
+
+        if len(self._dir_cache) >= 16:
+            self._dir_cache.clear()
+        self._dir_cache[gerber_dir] = (mtime, snap)
+        return snap
+
+    def _invalidate_dir_cache(self, path: str):
+        self._dir_cache.pop(path, None)
+
+    def _watch_gerber_dir(self, gerber_dir: str):
+        watched = self._fs_watcher.directories()
+        if watched == [gerber_dir]:
+            return
+        if watched:
+            self._fs_watcher.removePaths(watched)
+        self._fs_watcher.addPath(gerber_dir)
+
+    def _snapshot_has(self, snap, fn: str) -> bool:
+        return os.path.normcase(os.path.basename(fn)) in snap[1]
+
+    def _snapshot_add(self, snap, fn: str):
+        name = os.path.basename(fn)
+        if not self._snapshot_has(snap, name):
+            snap[0].append(name)
+            snap[1].add(os.path.normcase(name))
+            snap[2].setdefault(os.path.splitext(name)[1].lower(), []).append(len(snap[0]) - 1)
+
+    def _fast_copy(self, src, dst, link=False):
+        # link=True only for our own ZIP extraction folder, whose files nothing else owns: a
+        # hard link there moves no data. In user folders a link would make the canonical name
+        # a second name for the user's export, so those get a CoW clone or a real copy.
+        if link:
+            try:
+                os.link(src, dst)
+                return
+            except OSError:
+                pass
+        try:
+            if os.path.samefile(src, dst):
+                # Already a link to src (stale snapshot); opening dst for writing would
+                # truncate src through the shared inode.
+                return
+        except OSError:
+            pass
+        if fcntl is not None:
+            try:
+                with open(src, "rb") as fs, open(dst, "wb") as fd:
+                    fcntl.ioctl(fd.fileno(), _FICLONE, fs.fileno())
+                return
+            except OSError:
+                pass
+        if hasattr(os, "copy_file_range"):
+            # In-kernel copy (server-side on NFS/SMB); no bytes pass through user space.
+            try:
+                with open(src, "rb") as fs, open(dst, "wb") as fd:
+                    left = os.fstat(fs.fileno()).st_size
+                    while left > 0:
+                        n = os.copy_file_range(fs.fileno(), fd.fileno(), left)
+                        if n == 0:
+                            # Early EOF or no progress; let copyfile() redo dst from scratch.
+                            raise OSError("copy_file_range stopped short")
+                        left -= n
+                return
+            except OSError:
+                pass
+        shutil.copyfile(src, dst)
+
+    def _copy_into_snapshot(self, snap, pairs, link=False):
+        # Run the (src, dst) copies concurrently (they are independent and IO-bound) and
+        # record the new files. Sources come from the snapshot, so they are known to exist.
+        if len(pairs) > 1:
+            with ThreadPoolExecutor(max_workers=min(8, len(pairs))) as ex:
+                list(ex.map(lambda pair: self._fast_copy(*pair, link=link), pairs))
+        elif pairs:
+            self._fast_copy(*pairs[0], link=link)
+        for _, dst in pairs:
+            self._snapshot_add(snap, dst)
+
+    def _find_best_easyeda_file(self, gerber_dir: str, wanted_exts, snap=None):
+        # First entry in listing order with any of the wanted extensions.
+        names, _, ext_index = snap if snap is not None else self._dir_snapshot(gerber_dir)
+        hits = [ext_index[e.lower()][0] for e in wanted_exts if e.lower() in ext_index]
+        if not hits:
+            return None
+        return os.path.join(gerber_dir, names[min(hits)])
+
+    def _ensure_canonical_easyeda(self, gerber_dir: str, prefix: str, snap=None):
+        if snap is None:
+            snap = self._dir_snapshot(gerber_dir)
+
+        # Presence is checked on bare names; paths are only joined for files actually copied.
+        def need(name):
+            return not self._snapshot_has(snap, name)
+
+        pairs = []
+        for suffix, exts in _CANONICAL_MAP:
+            name = f"{prefix}{suffix}"
+            if need(name):
+                src = self._find_best_easyeda_file(gerber_dir, exts, snap)
+                if src:
+                    pairs.append((src, os.path.join(gerber_dir, name)))
+
+        names, _, ext_index = snap
+        # Straight from the extension buckets; same folder, so sorting names sorts the paths,
+        # and only the first two (PTH, NPTH) are ever joined.
+        drill_candidates = [
+            os.path.join(gerber_dir, n)
+            for n in sorted(names[i] for e in (".drl", ".txt") for i in ext_index.get(e, ()))[:2]
+        ]
 
+        pth = f"{prefix}-PTH.drl"
+        npth = f"{prefix}-NPTH.drl"
         if drill_candidates:
-            if need(targets["pth"]):
-                self._copy_if_exists(drill_candidates[0], targets["pth"])
-            if len(drill_candidates) > 1 and need(targets["npth"]):
-                self._copy_if_exists(drill_candidates[1], targets["npth"])
+            if need(pth):
+                pairs.append((drill_candidates[0], os.path.join(gerber_dir, pth)))
+            if len(drill_candidates) > 1 and need(npth):
+                pairs.append((drill_candidates[1], os.path.join(gerber_dir, npth)))
+
+        link = os.path.basename(os.path.normpath(gerber_dir)).startswith(_UNZIP_DIR_PREFIX)
+        self._copy_into_snapshot(snap, pairs, link=link)
 
     def detect_prefix(self, filename):
-        suffixes = [
-            "-TopLayer.gbr",
-            "-BottomLayer.gbr",
-            "-TopSolderMaskLayer.gbr",
-            "-BottomSolderMaskLayer.gbr",
-            "-TopSilkLayer.gbr",
-            "-BottomSilkLayer.gbr",
-            "-TopPasteLayer.gbr",
-            "-BottomPasteLayer.gbr",
-            "-BoardOutLine.gbr",
-            "-PTH.drl",
-            "-NPTH.drl",
-            "-DocLayer.gbr",
-        ]
-        for suf in suffixes:
-            if filename.endswith(suf):
-                return filename[: -len(suf)]
-        return os.path.splitext(filename)[0]
+        m = _LAYER_SUFFIX_RE.fullmatch(filename)
+        return m.group(1) if m else os.path.splitext(filename)[0]
 
-    def _refresh_layer_list(self):
-        s = self.state
+    def _refresh_layer_list(self, snap=None):
+        # Rebuild with signals and repaints off: one repaint for the whole list, not one per row.
         self.layer_list.blockSignals(True)
-        self.layer_list.clear()
+        self.layer_list.setUpdatesEnabled(False)
+        try:
+            self._fill_layer_list(snap)
+        finally:
+            self.layer_list.setUpdatesEnabled(True)
+            self.layer_list.blockSignals(False)
+        self.previewRequested.emit()
+
+    def _fill_layer_list(self, snap):
+        s = self.state
+        rows = []
 
         def add_item(key, label, checked):
-            item = QListWidgetItem(label)
-            item.setCheckState(Qt.Checked if checked else Qt.Unchecked)
-            item.setData(Qt.UserRole, key)
-            self.layer_list.addItem(item)
+            rows.append((key, label, checked))
 
         gd = s.gerber_dir
         p = s.prefix
 
-        top_copper_fn = os.path.join(gd, f"{p}-TopLayer.gbr")
-        bot_copper_fn = os.path.join(gd, f"{p}-BottomLayer.gbr")
-        top_silk_fn = os.path.join(gd, f"{p}-TopSilkLayer.gbr")
-        bot_silk_fn = os.path.join(gd, f"{p}-BottomSilkLayer.gbr")
-        outline_fn = os.path.join(gd, f"{p}-BoardOutLine.gbr")
-        top_mask_fn = os.path.join(gd, f"{p}-TopSolderMaskLayer.gbr")
-        bot_mask_fn = os.path.join(gd, f"{p}-BottomSolderMaskLayer.gbr")
-        top_paste_fn = os.path.join(gd, f"{p}-TopPasteLayer.gbr")
-        bot_paste_fn = os.path.join(gd, f"{p}-BottomPasteLayer.gbr")
-        doc_fn = os.path.join(gd, f"{p}-DocLayer.gbr")
+        # Bare names: the snapshot lookup only ever needs the name, never the joined path.
+        top_copper_fn = f"{p}-TopLayer.gbr"
+        bot_copper_fn = f"{p}-BottomLayer.gbr"
+        top_silk_fn = f"{p}-TopSilkLayer.gbr"
+        bot_silk_fn = f"{p}-BottomSilkLayer.gbr"
+        outline_fn = f"{p}-BoardOutLine.gbr"
+        top_mask_fn = f"{p}-TopSolderMaskLayer.gbr"
+        bot_mask_fn = f"{p}-BottomSolderMaskLayer.gbr"
+        top_paste_fn = f"{p}-TopPasteLayer.gbr"
+        bot_paste_fn = f"{p}-BottomPasteLayer.gbr"
+        doc_fn = f"{p}-DocLayer.gbr"
+
+        if snap is None:
+            snap = self._dir_snapshot(gd)
+        names, _, ext_index = snap
+        exists = lambda fn: self._snapshot_has(snap, fn)
 
         drill_exists = any(
-            fn.lower().endswith((".drl", ".txt"))
-            and (p in fn or fn.lower().endswith(("-pth.drl", "-npth.drl")))
-            for fn in os.listdir(gd)
+            p in fn or fn.lower().endswith(("-pth.drl", "-npth.drl"))
+            for fn in (names[i] for e in (".drl", ".txt") for i in ext_index.get(e, ()))
         )
 
-        if os.path.exists(top_copper_fn):
+        if exists(top_copper_fn):
             add_item("copper_isolation", "Copper isolation (Top)", True)
         if drill_exists:
             add_item("drilling", "Drilling", True)
-        if os.path.exists(outline_fn):
+        if exists(outline_fn):
             add_item("board_outline", "Board outline", True)
-        if os.path.exists(top_silk_fn):
+        if exists(top_silk_fn):
             add_item("silkscreen", "Silkscreen engraving (Top)", True)
-        if os.path.exists(top_mask_fn) or os.path.exists(top_copper_fn):
+        if exists(top_mask_fn) or exists(top_copper_fn):
             add_item("soldermask_clear", "Soldermask clear (Pads, Top)", False)
 
-        if os.path.exists(bot_copper_fn):
+        if exists(bot_copper_fn):
             add_item("bottom_copper_preview", "Bottom copper (Preview)", False)
-        if os.path.exists(bot_silk_fn):
+        if exists(bot_silk_fn):
             add_item("bottom_silkscreen_preview", "Bottom silkscreen (Preview)", False)
-        if os.path.exists(top_mask_fn):
+        if exists(top_mask_fn):
             add_item("top_mask_preview", "Top soldermask (Preview)", False)
-        if os.path.exists(bot_mask_fn):
+        if exists(bot_mask_fn):
             add_item("bottom_mask_preview", "Bottom soldermask (Preview)", False)
-        if os.path.exists(top_paste_fn):
+        if exists(top_paste_fn):
             add_item("top_paste_preview", "Top paste (Preview)", False)
-        if os.path.exists(bot_paste_fn):
+        if exists(bot_paste_fn):
             add_item("bottom_paste_preview", "Bottom paste (Preview)", False)
-        if os.path.exists(doc_fn):
+        if exists(doc_fn):
             add_item("doc_preview", "Documentation (GDL) (Preview)", False)
 
-        self.layer_list.blockSignals(False)
-        self.previewRequested.emit()
+        self._set_layer_rows(rows)
+
+    def _set_layer_rows(self, rows):
+        # Items are pooled per key: an unchanged row set only has its check states reset,
+        # otherwise rows are taken out (not deleted, unlike clear()) and reinserted in order.
+        lst = self.layer_list
+        keys = [key for key, _, _ in rows]
+        if keys != [lst.item(i).data(Qt.UserRole) for i in range(lst.count())]:
+            while lst.count():
+                lst.takeItem(lst.count() - 1)
+            for key, label, _ in rows:
+                item = self._layer_items.get(key)
+                if item is None:
+                    item = self._layer_items[key] = QListWidgetItem(label)
+                    item.setData(Qt.UserRole, key)
+                lst.addItem(item)
+        for i, (_, _, checked) in enumerate(rows):
+            lst.item(i).setCheckState(Qt.Checked if checked else Qt.Unchecked)
 
     def pick_gerber_or_zip(self):
         fn, _ = QFileDialog.getOpenFileName(
@@ -310,30 +482,59 @@ class FilesTab(QWidget):
         if not fn:
             return
 
+        self._load_generation += 1
+        worker = _GerberLoadWorker(self, fn, self._load_generation)
+        worker.signals.finished.connect(self._on_gerber_loaded)
+        self._load_workers.add(worker)
+        self._load_pool.start(worker)
+
+    def _load_gerber(self, fn: str) -> dict:
+        # Runs on the load pool: file IO only, no widgets.
+        res = {"gerber_dir": None, "prefix": None, "snap": None, "zip_error": None, "copy_error": None}
         if fn.lower().endswith(".zip"):
             try:
-                gerber_dir = self._extract_zip_to_workdir(fn)
+                res["gerber_dir"] = self._extract_zip_to_workdir(fn)
             except Exception as e:
-                QMessageBox.critical(self, "ZIP error", f"Could not extract ZIP:\n{e}")
-                return
-            prefix = os.path.splitext(os.path.basename(fn))[0]
+                res["zip_error"] = e
+                return res
+            res["prefix"] = os.path.splitext(os.path.basename(fn))[0]
         else:
-            gerber_dir = os.path.dirname(fn)
-            prefix = self.detect_prefix(os.path.basename(fn))
+            res["gerber_dir"] = os.path.dirname(fn)
+            res["prefix"] = self.detect_prefix(os.path.basename(fn))
+
+        # One directory scan shared by the canonical copy pass and the layer list;
+        # the copy pass adds the files it creates to it.
+        try:
+            snap = self._dir_snapshot(res["gerber_dir"])
+            self._ensure_canonical_easyeda(res["gerber_dir"], res["prefix"], snap)
+            res["snap"] = snap
+        except Exception as e:
+            res["copy_error"] = e
+        return res
+
+    @Slot(int, object)
+    def _on_gerber_loaded(self, generation, res):
+        self._load_workers = {w for w in self._load_workers if w.generation > generation}
+        if generation != self._load_generation:
+            # The user picked another file meanwhile; its load will update the UI.
+            return
+        if res["zip_error"] is not None:
+            QMessageBox.critical(self, "ZIP error", f"Could not extract ZIP:\n{res['zip_error']}")
+            return
 
+        gerber_dir = res["gerber_dir"]
         self.state.gerber_dir = gerber_dir
-        self.state.prefix = prefix
+        self.state.prefix = res["prefix"]
+        self._watch_gerber_dir(gerber_dir)
 
         # Default output dir to the gerber directory unless the user explicitly picked a different one
         if not getattr(self.state, "output_dir_user_set", False):
             self.state.output_dir = gerber_dir
             self.out_label.setText(f"Output: {gerber_dir}")
 
-        try:
-            self._ensure_canonical_easyeda(self.state.gerber_dir, self.state.prefix)
-        except Exception as e:
-            QMessageBox.warning(self, "Gerber rename/copy warning", f"Could not normalize filenames:\n{e}")
+        if res["copy_error"] is not None:
+            QMessageBox.warning(self, "Gerber rename/copy warning", f"Could not normalize filenames:\n{res['copy_error']}")
 
         # Update UI
         self.label.setText(f"Gerber folder: {self.state.gerber_dir}\nPrefix: {self.state.prefix}")
-        self._refresh_layer_list()
+        self._refresh_layer_list(res["snap"])
@@ -1,104 +1,189 @@
 # ui/ui_state.py
 
 import os
+import configparser
 from bitlib import load_bits, load_settings
-
-
-def _normalize_file_prefix(p: str) -> str:
-    p = (p or "").strip()
-    if not p:
-        return ""
-    safe = []
-    for ch in p:
-        if ch.isalnum() or ch in ("-", "_"):
-            safe.append(ch)
-    p = "".join(safe)
-    if not p:
-        return ""
-    if not (p.endswith("_") or p.endswith("-")):
-        p += "_"
-    return p
+from job_config import _normalize_file_prefix
+
+
+# Launch directory, the default output_dir. Taken once at import: run_job chdirs into
+# the board folder while it runs, so a lazy os.getcwd() could pick that up instead.
+_START_DIR = os.getcwd()
+
+def _section_snapshot(cfg, section: str) -> dict:
+    """{option: value} of one section, read in a single pass instead of one lookup per get*().
+
+    Values containing "%" still go through cfg.get() so interpolation matches what the
+    per-key getters returned.
+    """
+    if not cfg.has_section(section):
+        return {}
+    return {
+        k: (cfg.get(section, k) if "%" in v else v)
+        for k, v in cfg.items(section, raw=True)
+    }
+
+
+# Same conversions (and errors on malformed values) as ConfigParser.getint/getfloat/getboolean;
+# the fallback is only used when the option is missing.
+def _get_int(d: dict, key: str, fallback: int) -> int:
+    v = d.get(key)
+    return fallback if v is None else int(v)
+
+
+def _get_float(d: dict, key: str, fallback: float) -> float:
+    v = d.get(key)
+    return fallback if v is None else float(v)
+
+
+def _get_bool(d: dict, key: str, fallback: bool) -> bool:
+    v = d.get(key)
+    if v is None:
+        return fallback
+    try:
+        return configparser.ConfigParser.BOOLEAN_STATES[v.lower()]
+    except KeyError:
+        raise ValueError(f"Not a boolean: {v}") from None
+
+
+def _get_str(d: dict, key: str, fallback: str) -> str:
+    return d.get(key, fallback)
+
+
+# (attribute, section, option, reader, default) for every UIState field seeded from
+# job_settings.ini. drill_control and file_prefix are normalised after reading.
+_SETTING_FIELDS = (
+    # Job options (basic)
+    ("iso_passes", "copper_isolation", "passes", _get_int, 1),
+    ("pcb_thickness", "job", "pcb_thickness", _get_float, 1.6),
+    ("copper_thickness", "job", "copper_thickness", _get_float, 0.035),
+    ("outline_tabs_enabled", "job", "outline_tabs_enabled", _get_bool, False),
+    # Drill planning
+    ("drill_control", "job", "drill_control", _get_str, "auto"),
+    ("max_drills", "job", "max_drills", _get_int, 3),
+    ("hole_match_tol", "job", "hole_match_tol", _get_float, 0.05),
+    ("hole_dedupe_tol", "job", "hole_dedupe_tol", _get_float, 0.10),
+    ("mill_holes_over", "job", "mill_holes_over", _get_float, 1.2),
+    # Bits tab filtering
+    ("show_all_bits", "job", "show_all_bits", _get_bool, False),
+    # Step 8: Advanced CAM knobs
+    ("path_ordering", "job", "path_ordering", _get_bool, True),
+    ("geom_simplify_tol", "job", "geom_simplify_tol", _get_float, 0.0005),
+    ("geom_min_area", "job", "geom_min_area", _get_float, 1e-8),
+    ("geom_min_length", "job", "geom_min_length", _get_float, 1e-5),
+    ("ramp_len", "job", "ramp_len", _get_float, 0.0),
+    # Machine / safety defaults (Step 7, now UI-exposed)
+    ("safe_z", "job", "safe_z", _get_float, 5.0),
+    ("travel_z", "job", "travel_z", _get_float, 10.0),
+    ("toolchange_z", "job", "toolchange_z", _get_float, 30.0),
+    ("park_x", "job", "park_x", _get_float, 0.0),
+    ("park_y", "job", "park_y", _get_float, 0.0),
+    ("spindle_warmup_s", "job", "spindle_warmup_s", _get_float, 0.0),
+    ("probe_on_start", "job", "probe_on_start", _get_bool, False),
+    ("probe_gcode", "job", "probe_gcode", _get_str, ""),
+    # Output naming
+    ("file_prefix", "job", "file_prefix", _get_str, ""),
+)
+
+
+# Accepted drill_control spellings -> canonical value; anything else means "auto".
+_DRILL_CONTROL = {"auto": "auto", "automatic": "auto", "manual": "manual", "man": "manual"}
 
 
 def _normalize_drill_control(m: str) -> str:
-    m = (m or "").strip().lower()
-    if m in ("auto", "automatic"):
-        return "auto"
-    if m in ("manual", "man"):
-        return "manual"
-    return "auto"
+    return _DRILL_CONTROL.get((m or "").strip().lower(), "auto")
 
 
 class UIState:
+    # Every field the app keeps on the state; anything else is a typo and raises.
+    # output_dir_user_set is left unset until FilesTab initialises it (it checks hasattr).
+    __slots__ = (
+        "_bits", "settings",
+        "prefix", "gerber_dir", "output_dir", "output_dir_user_set",
+        "selected_ops", "combined",
+        "iso_passes", "pcb_thickness", "copper_thickness", "outline_tabs_enabled",
+        "drill_control", "max_drills", "hole_match_tol", "hole_dedupe_tol", "mill_holes_over",
+        "show_all_bits",
+        "path_ordering", "geom_simplify_tol", "geom_min_area", "geom_min_length", "ramp_len",
+        "safe_z", "travel_z", "toolchange_z", "park_x", "park_y", "spindle_warmup_s",
+        "probe_on_start", "probe_gcode",
+        "preflight_text", "preflight_level", "planned_drill_names",
+        "file_prefix",
+    )
+
     def __init__(self):
-        self.bits = load_bits()
+        # bits.ini is parsed on first use (see the bits property); settings feed the
+        # defaults below, so they are read up front.
+        self._bits = None
         self.settings = load_settings()
 
         self.prefix = None
         self.gerber_dir = None
-        self.output_dir = os.getcwd()
+        self.output_dir = _START_DIR
 
         self.selected_ops = []
         self.combined = True
 
-        # ----------------------------
-        # Job options (basic)
-        # ----------------------------
-        self.iso_passes = self.settings.getint("copper_isolation", "passes", fallback=1)
-        self.pcb_thickness = self.settings.getfloat("job", "pcb_thickness", fallback=1.6)
-        self.copper_thickness = self.settings.getfloat("job", "copper_thickness", fallback=0.035)
-        self.outline_tabs_enabled = self.settings.getboolean("job", "outline_tabs_enabled", fallback=False)
-
-        # ----------------------------
-        # Drill planning
-        # ----------------------------
-        self.drill_control = _normalize_drill_control(
-            self.settings.get("job", "drill_control", fallback="auto")
-        )
-        self.max_drills = self.settings.getint("job", "max_drills", fallback=3)
-        self.hole_match_tol = self.settings.getfloat("job", "hole_match_tol", fallback=0.05)
-        self.hole_dedupe_tol = self.settings.getfloat("job", "hole_dedupe_tol", fallback=0.10)
-        self.mill_holes_over = self.settings.getfloat("job", "mill_holes_over", fallback=1.2)
-
-        # Bits tab filtering
-        self.show_all_bits = self.settings.getboolean("job", "show_all_bits", fallback=False)
-
-        # ----------------------------
-        # Step 8: Advanced CAM knobs
-        # ----------------------------
-        self.path_ordering = self.settings.getboolean("job", "path_ordering", fallback=True)
-        self.geom_simplify_tol = self.settings.getfloat("job", "geom_simplify_tol", fallback=0.0005)
-        self.geom_min_area = self.settings.getfloat("job", "geom_min_area", fallback=1e-8)
-        self.geom_min_length = self.settings.getfloat("job", "geom_min_length", fallback=1e-5)
-        self.ramp_len = self.settings.getfloat("job", "ramp_len", fallback=0.0)
-
-        # Machine / safety defaults (Step 7, now UI-exposed)
-        self.safe_z = self.settings.getfloat("job", "safe_z", fallback=5.0)
-        self.travel_z = self.settings.getfloat("job", "travel_z", fallback=10.0)
-        self.toolchange_z = self.settings.getfloat("job", "toolchange_z", fallback=30.0)
-        self.park_x = self.settings.getfloat("job", "park_x", fallback=0.0)
-        self.park_y = self.settings.getfloat("job", "park_y", fallback=0.0)
-        self.spindle_warmup_s = self.settings.getfloat("job", "spindle_warmup_s", fallback=0.0)
-
-        self.probe_on_start = self.settings.getboolean("job", "probe_on_start", fallback=False)
-        self.probe_gcode = self.settings.get("job", "probe_gcode", fallback="") or ""
+        # Each section is read once; the fields are then plain dict lookups.
+        sections = {
+            sec: _section_snapshot(self.settings, sec) for sec in ("copper_isolation", "job")
+        }
+        for attr, sec, key, read, default in _SETTING_FIELDS:
+            setattr(self, attr, read(sections[sec], key, default))
+        self.drill_control = _normalize_drill_control(self.drill_control)
+        self.file_prefix = _normalize_file_prefix(self.file_prefix)
 
         # Preflight / UI display
         self.preflight_text = ""
         self.preflight_level = "info"  # ok / warn / error / info
         self.planned_drill_names = []
 
-        # Output naming
-        self.file_prefix = _normalize_file_prefix(
-            self.settings.get("job", "file_prefix", fallback="")
-        )
-
     # ----------------------------
     # Bits + settings reload helpers
     # ----------------------------
 
+    @property
+    def bits(self):
+        if self._bits is None:
+            self._bits = load_bits()
+        return self._bits
+
     def reload_bits(self):
-        self.bits = load_bits()
+        self._bits = load_bits()
+
+    def persisted_settings(self):
+        """{section: {key: value}} of every option run_job saves, read off the state in one go."""
+        return {
+            "copper_isolation": {
+                "passes": str(self.iso_passes),
+            },
+            "job": {
+                "pcb_thickness": str(self.pcb_thickness),
+                "copper_thickness": str(self.copper_thickness),
+                "outline_tabs_enabled": str(self.outline_tabs_enabled),
+                "file_prefix": self.file_prefix or "",
+                "drill_control": self.drill_control,
+                "max_drills": str(int(self.max_drills)),
+                "hole_match_tol": str(float(self.hole_match_tol)),
+                "hole_dedupe_tol": str(float(self.hole_dedupe_tol)),
+                "mill_holes_over": str(float(self.mill_holes_over)),
+                "show_all_bits": "true" if self.show_all_bits else "false",
+                # Advanced knobs
+                "path_ordering": "true" if self.path_ordering else "false",
+                "geom_simplify_tol": str(float(self.geom_simplify_tol)),
+                "geom_min_area": str(float(self.geom_min_area)),
+                "geom_min_length": str(float(self.geom_min_length)),
+                "ramp_len": str(float(self.ramp_len)),
+                "safe_z": str(float(self.safe_z)),
+                "travel_z": str(float(self.travel_z)),
+                "toolchange_z": str(float(self.toolchange_z)),
+                "park_x": str(float(self.park_x)),
+                "park_y": str(float(self.park_y)),
+                "spindle_warmup_s": str(float(self.spindle_warmup_s)),
+                "probe_on_start": "true" if self.probe_on_start else "false",
+                "probe_gcode": (self.probe_gcode or "").rstrip(),
+            },
+        }
 
     # ----------------------------
     # Small setters used by tabs
@@ -110,100 +195,59 @@ class UIState:
     def set_drill_control(self, m: str):
         self.drill_control = _normalize_drill_control(m)
 
-    def set_max_drills(self, v: int):
-        try:
-            self.max_drills = max(1, int(v))
-        except Exception:
-            self.max_drills = 3
-
-    def set_hole_match_tol(self, v: float):
-        try:
-            self.hole_match_tol = max(0.0, float(v))
-        except Exception:
-            self.hole_match_tol = 0.05
-
-    def set_hole_dedupe_tol(self, v: float):
-        try:
-            self.hole_dedupe_tol = max(0.0, float(v))
-        except Exception:
-            self.hole_dedupe_tol = 0.10
-
-    def set_mill_holes_over(self, v: float):
-        try:
-            self.mill_holes_over = max(0.1, float(v))
-        except Exception:
-            self.mill_holes_over = 1.2
-
     def set_show_all_bits(self, v: bool):
         self.show_all_bits = bool(v)
 
+    # Numeric set_* methods (set_max_drills, set_safe_z, ...) are generated from
+    # _NUMERIC_FIELDS below the class.
+
     # ---- Step 8 setters ----
 
     def set_path_ordering(self, v: bool):
         self.path_ordering = bool(v)
 
-    def set_geom_simplify_tol(self, v: float):
-        try:
-            self.geom_simplify_tol = max(0.0, float(v))
-        except Exception:
-            self.geom_simplify_tol = 0.0005
-
-    def set_geom_min_area(self, v: float):
-        try:
-            self.geom_min_area = max(0.0, float(v))
-        except Exception:
-            self.geom_min_area = 1e-8
-
-    def set_geom_min_length(self, v: float):
-        try:
-            self.geom_min_length = max(0.0, float(v))
-        except Exception:
-            self.geom_min_length = 1e-5
-
-    def set_ramp_len(self, v: float):
-        try:
-            self.ramp_len = max(0.0, float(v))
-        except Exception:
-            self.ramp_len = 0.0
-
-    def set_safe_z(self, v: float):
-        try:
-            self.safe_z = max(0.0, float(v))
-        except Exception:
-            self.safe_z = 5.0
-
-    def set_travel_z(self, v: float):
-        try:
-            self.travel_z = max(0.0, float(v))
-        except Exception:
-            self.travel_z = 10.0
-
-    def set_toolchange_z(self, v: float):
-        try:
-            self.toolchange_z = max(0.0, float(v))
-        except Exception:
-            self.toolchange_z = 30.0
-
-    def set_park_x(self, v: float):
-        try:
-            self.park_x = float(v)
-        except Exception:
-            self.park_x = 0.0
-
-    def set_park_y(self, v: float):
-        try:
-            self.park_y = float(v)
-        except Exception:
-            self.park_y = 0.0
-
-    def set_spindle_warmup_s(self, v: float):
-        try:
-            self.spindle_warmup_s = max(0.0, float(v))
-        except Exception:
-            self.spindle_warmup_s = 0.0
-
     def set_probe_on_start(self, v: bool):
         self.probe_on_start = bool(v)
 
     def set_probe_gcode(self, s: str):
         self.probe_gcode = s or ""
+
+
+# Numeric setters: (field, cast, lower bound or None, value used when v does not convert).
+# Each becomes UIState.set_<field>, clamping to the bound like the hand-written ones did.
+_NUMERIC_FIELDS = (
+    ("max_drills", int, 1, 3),
+    ("hole_match_tol", float, 0.0, 0.05),
+    ("hole_dedupe_tol", float, 0.0, 0.10),
+    ("mill_holes_over", float, 0.1, 1.2),
+    ("geom_simplify_tol", float, 0.0, 0.0005),
+    ("geom_min_area", float, 0.0, 1e-8),
+    ("geom_min_length", float, 0.0, 1e-5),
+    ("ramp_len", float, 0.0, 0.0),
+    ("safe_z", float, 0.0, 5.0),
+    ("travel_z", float, 0.0, 10.0),
+    ("toolchange_z", float, 0.0, 30.0),
+    ("park_x", float, None, 0.0),
+    ("park_y", float, None, 0.0),
+    ("spindle_warmup_s", float, 0.0, 0.0),
+)
+
+
+def _numeric_setter(name, cast, lo, default):
+    def setter(self, v):
+        # Spinboxes already hand over the right type; only convert anything else.
+        if type(v) is not cast:
+            try:
+                v = cast(v)
+            except (TypeError, ValueError, OverflowError):
+                setattr(self, name, default)
+                return
+        setattr(self, name, v if lo is None else max(lo, v))
+
+    setter.__name__ = setter.__qualname__ = f"set_{name}"
+    return setter
+
+
+for _name, _cast, _lo, _default in _NUMERIC_FIELDS:
+    setattr(UIState, f"set_{_name}", _numeric_setter(_name, _cast, _lo, _default))
+del _name, _cast, _lo, _default